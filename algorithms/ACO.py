@@ -5,12 +5,13 @@ import sys
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
 sys.path.append(parent_dir)
-from lca.util import get_config, get_cost_config, sort_vms, get_solution, export_results
+from lca.util import get_config, get_cost_config, get_seed, make_rng, sort_vms, get_solution, export_results
 
 
 # ACO scheduler
 class Ant:
-    def __init__(self, lengths, eff_mips, pheromone, alpha=1.0, beta=1.0, Q=100):
+    def __init__(self, lengths, eff_mips, pheromone, alpha=1.0, beta=1.0, Q=100, rng=None):
+        self.rng = rng if rng is not None else make_rng()
         self.lengths = lengths                # array of task lengths, shape (N,)
         self.eff_mips = eff_mips              # array of effective MIPS, shape (V,)
         self.pheromone = pheromone            # array shape (V,N)
@@ -23,8 +24,8 @@ class Ant:
         # cumulative load per VM
         self.TL = np.zeros(self.V)
         # select random start
-        first_vm = np.random.randint(self.V)
-        first_task = np.random.randint(self.N)
+        first_vm = self.rng.integers(self.V)
+        first_task = self.rng.integers(self.N)
         self.tour.append((first_vm, first_task))
         self.tabu[first_task] = True
         self.TL[first_vm] += self.lengths[first_task]
@@ -56,7 +57,7 @@ class Ant:
         prob /= total
         # flatten and choose
         flat = prob.flatten()
-        idx = np.searchsorted(flat.cumsum(), np.random.rand())
+        idx = np.searchsorted(flat.cumsum(), self.rng.random())
         vm, t = divmod(idx, self.N)
         self.tour.append((vm, t))
         self.tabu[t] = True
@@ -76,7 +77,8 @@ class Ant:
         return delta
 
 class ACO:
-    def __init__(self, num_ants=10, max_gen=50, alpha=1.0, beta=1.0, rho=0.5, Q=100):
+    def __init__(self, num_ants=10, max_gen=50, alpha=1.0, beta=1.0, rho=0.5, Q=100, rng=None):
+        self.rng = rng if rng is not None else make_rng()
         self.num_ants = num_ants
         self.max_gen = max_gen
         self.alpha = alpha
@@ -93,7 +95,7 @@ class ACO:
         for gen in range(self.max_gen):
             deltas = np.zeros_like(pheromone)
             for _ in range(self.num_ants):
-                ant = Ant(lengths, eff_mips, pheromone, self.alpha, self.beta, self.Q)
+                ant = Ant(lengths, eff_mips, pheromone, self.alpha, self.beta, self.Q, self.rng)
                 for _ in range(1, N):
                     ant.select_next()
                 length = ant.calc_length()
@@ -120,7 +122,7 @@ def run():
     eff_mips = np.array([v['vm_mips'] * v['vm_pes'] for v in vms_conf])
 
     start = time.time()
-    aco = ACO(num_ants=n, max_gen=10)
+    aco = ACO(num_ants=n, max_gen=10, rng=make_rng(get_seed()))
     best_tour, best_length = aco.run(lengths, eff_mips)
     tour_array = np.zeros(n, dtype=int)
     for vm, t in best_tour:
@@ -0,0 +1,14 @@
+"""
+LPT list scheduling: the longest cloudlet first, each on the VM with the
+smallest makespan so far.
+see greedy.py for the makespan model.
+"""
+from greedy import run_greedy
+
+
+def run():
+    run_greedy("LPT")
+
+
+if __name__ == "__main__":
+    run()
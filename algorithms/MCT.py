@@ -0,0 +1,14 @@
+"""
+minimum completion time: every cloudlet, in its given order, goes to the
+VM that finishes it first.
+see greedy.py for the makespan model.
+"""
+from greedy import run_greedy
+
+
+def run():
+    run_greedy("MCT")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,14 @@
+"""
+Max-Min: the cloudlet with the largest best completion time is placed
+first, on the VM that finishes it first.
+see greedy.py for the makespan model.
+"""
+from greedy import run_greedy
+
+
+def run():
+    run_greedy("Max_Min")
+
+
+if __name__ == "__main__":
+    run()
@@ -5,11 +5,13 @@ import sys
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
 sys.path.append(parent_dir)
-from lca.util import get_config, get_cost_config, sort_vms, get_solution, export_results
+from lca.util import get_seed, make_rng, export_results
+from lca.problem import ProblemInstance
 
 # PSO scheduler
 class PSO:
-    def __init__(self, num_particles=30, max_iter=500, w=0.9, c1=2.0, c2=2.0, alpha=0.3):
+    def __init__(self, num_particles=30, max_iter=500, w=0.9, c1=2.0, c2=2.0, alpha=0.3, rng=None):
+        self.rng = rng if rng is not None else make_rng()
         self.num_particles = num_particles
         self.max_iter = max_iter
         self.w = w
@@ -20,8 +22,8 @@ class PSO:
         self.best_fitness = np.inf
 
     def _initialize(self, N, V):
-        positions = np.random.randint(0, V, size=(self.num_particles, N))
-        velocities = np.random.uniform(-1, 1, size=(self.num_particles, N))
+        positions = self.rng.integers(0, V, size=(self.num_particles, N))
+        velocities = self.rng.uniform(-1, 1, size=(self.num_particles, N))
         pbest_pos = positions.copy()
         pbest_fit = np.full(self.num_particles, np.inf)
         return positions, velocities, pbest_pos, pbest_fit
@@ -55,8 +57,7 @@ class PSO:
                     gbest_fit = fit
                     gbest_pos = assignment.copy()
             # update velocity and position
-            r1 = np.random.rand(self.num_particles, N)
-            r2 = np.random.rand(self.num_particles, N)
+            r1, r2 = self.rng.random(size=(2, self.num_particles, N))
             vel = (self.w * vel
                    + self.c1 * r1 * (pbest_pos - pos)
                    + self.c2 * r2 * (gbest_pos - pos))
@@ -76,19 +77,15 @@ class PSO:
 
 
 def run():
-    # load configurations
-    _, vms_conf, cloudlets_conf, _ = get_config()
-    # cost_config available but not used for time-based schedule
-    _ = get_cost_config()
-    vms_conf, original_indices = sort_vms(vms_conf)
-
-    # build time matrix: time = cloudlet.length / (vm_mips * vm_pes)
-    lengths = np.array([c['length'] for c in cloudlets_conf])
-    eff_mips = np.array([v['vm_mips'] * v['vm_pes'] for v in vms_conf])
-    time_matrix = lengths[:, None] / eff_mips[None, :]
+    # time matrix: time = cloudlet.length / (vm_mips * vm_pes), of the VMs
+    # in sorted order, cached by the problem instance
+    problem = ProblemInstance.load()
+    time_matrix = problem.parallel_exec_times
+    original_indices = problem.original_indices.tolist()
 
     start = time.time()
-    pso = PSO(num_particles=len(cloudlets_conf), max_iter=500)
+    pso = PSO(num_particles=problem.n, max_iter=500,
+              rng=make_rng(get_seed()))
     best_pos, best_fit = pso.run(time_matrix)
     # pso.report()
 
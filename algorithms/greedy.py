@@ -0,0 +1,234 @@
+"""
+greedy constructive schedulers, shared by MCT.py, Min_Min.py, Max_Min.py
+and LPT.py and used by lca/warm_start.py to seed the LCA leagues.
+
+every scheduler places one cloudlet at a time and keeps, for every VM, the
+makespan MO_LCA would compute for the cloudlets placed on it so far:
+    time shared   the longest cloudlet / mips while the VM has no more
+                  cloudlets than PEs, else total length / (mips * degree)
+    space shared  each cloudlet runs on the PE of its VM that is free first
+the makespan of a VM only grows with the length of an added cloudlet, so
+Min-Min (the cloudlet with the smallest best completion time first) is MCT
+over the cloudlets shortest first, and Max-Min is MCT longest first.
+
+space shared VMs run their cloudlets in the order they are placed here,
+while MO_LCA and CloudSim run them in cloudlet order. MCT places the
+cloudlets in cloudlet order and matches MO_LCA.makespan, Min-Min, Max-Min
+and LPT do not: their makespans are the ones of the placement order, and
+MO_LCA.makespan of their schedules may be longer or shorter.
+
+MCT keeps the VMs of every (mips, PEs) class in heaps keyed on their ready
+time and a cloudlet only looks at the heap tops, O(n (K + log V)) for V VMs
+of K classes instead of O(n V). LPT keeps all VMs in one heap.
+"""
+import heapq
+import time
+import os
+import sys
+
+import numpy as np
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+from lca.util import get_config_arrays, get_column, get_host_array, host_mips_share, sort_vms, export_results  # nopep8
+
+
+class GreedyScheduler(object):
+    """
+    Per-VM makespan state of a schedule under construction.
+
+    Args:
+        vms: VM dicts with vm_mips and vm_pes, or their structured array
+        cloudlets: cloudlet dicts with length, or their structured array
+        mode (str): "time" or "space" shared VMs
+        hosts: the hosts of the VMs, slowing down VMs on overcommitted
+            hosts like MO_LCA, or None
+    """
+
+    def __init__(self, vms, cloudlets, mode="time", hosts=None):
+        self.mode = mode
+        self.vm_mips = np.array(get_column(vms, "vm_mips"), dtype=float) * \
+            host_mips_share(vms, hosts)
+        self.vm_pes = np.array(get_column(vms, "vm_pes"))
+        self.vm_degree = self.vm_pes * (0.985 ** self.vm_pes)
+        self.lengths = np.asarray(get_column(cloudlets, "length"), dtype=float)
+
+        num_vms = len(vms)
+        self.makespans = np.zeros(num_vms)
+        self.sums = np.zeros(num_vms)
+        self.counts = np.zeros(num_vms, dtype=int)
+        self.max_lengths = np.zeros(num_vms)
+        # space shared: finish time of every PE, and of the first free one
+        self.pe_times = [[0.0] * pes for pes in self.vm_pes]
+        self.first_free = np.zeros(num_vms)
+        self.team = np.zeros(len(cloudlets), dtype=int)
+
+    def completion_times(self, length):
+        """Makespan of every VM if a cloudlet of the given length joined it."""
+        if self.mode == "space":
+            return np.maximum(self.makespans,
+                              self.first_free + length / self.vm_mips)
+        return np.where(
+            self.counts + 1 <= self.vm_pes,
+            np.maximum(self.max_lengths, length) / self.vm_mips,
+            (self.sums + length) / (self.vm_mips * self.vm_degree))
+
+    def assign(self, cloudlet, vm):
+        length = self.lengths[cloudlet]
+        self.team[cloudlet] = vm
+        self.sums[vm] += length
+        self.counts[vm] += 1
+        self.max_lengths[vm] = max(self.max_lengths[vm], length)
+        if self.mode == "space":
+            pe_times = self.pe_times[vm]
+            finish = heapq.heappop(pe_times) + length / self.vm_mips[vm]
+            heapq.heappush(pe_times, finish)
+            self.first_free[vm] = pe_times[0]
+            self.makespans[vm] = max(self.makespans[vm], finish)
+        elif self.counts[vm] <= self.vm_pes[vm]:
+            self.makespans[vm] = self.max_lengths[vm] / self.vm_mips[vm]
+        else:
+            self.makespans[vm] = self.sums[vm] / \
+                (self.vm_mips[vm] * self.vm_degree[vm])
+
+    def vm_classes(self):
+        """Indices of the VMs of every (mips, PEs) class."""
+        _, classes = np.unique(np.stack([self.vm_mips, self.vm_pes], axis=1),
+                               axis=0, return_inverse=True)
+        classes = classes.ravel()
+        return [np.flatnonzero(classes == c).tolist()
+                for c in range(classes.max() + 1)]
+
+    def minimum_completion_time(self, order):
+        """
+        Places the cloudlets in the given order, each on the VM that finishes
+        first. Every class of vm_classes keeps two heaps: the VMs with an
+        idle PE keyed on their makespan, and the others on their ready time,
+        the total length (time shared) or first free PE (space shared).
+        """
+        heaps = [([(0.0, vm) for vm in vms], []) for vms in self.vm_classes()]
+        for cloudlet in order:
+            length = self.lengths[cloudlet]
+            best = min(self._heap_tops(c, idle, busy, length)
+                       for c, (idle, busy) in enumerate(heaps))
+            popped = []
+            if self.mode == "space":
+                for c, (_, busy) in enumerate(heaps):
+                    best = self._earliest_free(c, busy, length, best, popped)
+            _, vm, c = best
+            # the popped VMs go back, the chosen one with its new key
+            chosen_popped = False
+            for heap_class, entry in popped:
+                if entry[1] == vm:
+                    chosen_popped = True
+                else:
+                    heapq.heappush(self._heap(heaps[heap_class], entry[1]), entry)
+            if not chosen_popped:
+                heapq.heappop(self._heap(heaps[c], vm))
+            self.assign(cloudlet, vm)
+            heapq.heappush(self._heap(heaps[c], vm), (self._key(vm), vm))
+        return self.team
+
+    def _heap(self, heaps, vm):
+        """The heap of its class vm belongs in."""
+        idle, busy = heaps
+        return idle if self.counts[vm] < self.vm_pes[vm] else busy
+
+    def _key(self, vm):
+        if self.counts[vm] < self.vm_pes[vm]:
+            return self.makespans[vm]
+        if self.mode == "space":
+            return self.first_free[vm]
+        return self.sums[vm]
+
+    def _heap_tops(self, c, idle, busy, length):
+        """
+        (completion time, vm, class) of the heap tops of class c that
+        finishes first.
+        """
+        best = (np.inf, -1, c)
+        if idle:
+            # the cloudlet starts right away on an idle PE
+            makespan, vm = idle[0]
+            best = min(best, (max(makespan, length / self.vm_mips[vm]), vm, c))
+        if busy and self.mode == "space":
+            first_free, vm = busy[0]
+            best = min(best, (max(self.makespans[vm],
+                                  first_free + length / self.vm_mips[vm]), vm, c))
+        elif busy:
+            total, vm = busy[0]
+            best = min(best, ((total + length) /
+                              (self.vm_mips[vm] * self.vm_degree[vm]), vm, c))
+        return best
+
+    def _earliest_free(self, c, busy, length, best, popped):
+        """
+        The (completion time, vm, class) that finishes first, of best and
+        the busy space shared VMs of class c, whose makespan may be later
+        than the first free PE of the top. The entries taken off busy are
+        added to popped.
+        """
+        if not busy:
+            return best
+        execution_time = length / self.vm_mips[busy[0][1]]
+        # a VM finishes no earlier than its first free PE plus the cloudlet
+        while busy and busy[0][0] + execution_time <= best[0]:
+            first_free, vm = heapq.heappop(busy)
+            popped.append((c, (first_free, vm)))
+            best = min(best, (max(self.makespans[vm],
+                                  first_free + execution_time), vm, c))
+        return best
+
+    def longest_processing_time(self):
+        """
+        LPT list scheduling: the longest cloudlet first, each on the VM with
+        the smallest makespan so far, kept in a heap.
+        """
+        heap = [(0.0, vm) for vm in range(len(self.vm_mips))]
+        for cloudlet in np.argsort(-self.lengths, kind="stable"):
+            _, vm = heapq.heappop(heap)
+            self.assign(cloudlet, vm)
+            heapq.heappush(heap, (self.makespans[vm], vm))
+        return self.team
+
+
+def mct_schedule(vms, cloudlets, mode="time", hosts=None):
+    """Minimum completion time, cloudlets in their given order."""
+    scheduler = GreedyScheduler(vms, cloudlets, mode, hosts)
+    return scheduler.minimum_completion_time(range(len(cloudlets)))
+
+
+def min_min_schedule(vms, cloudlets, mode="time", hosts=None):
+    scheduler = GreedyScheduler(vms, cloudlets, mode, hosts)
+    return scheduler.minimum_completion_time(
+        np.argsort(scheduler.lengths, kind="stable"))
+
+
+def max_min_schedule(vms, cloudlets, mode="time", hosts=None):
+    scheduler = GreedyScheduler(vms, cloudlets, mode, hosts)
+    return scheduler.minimum_completion_time(
+        np.argsort(-scheduler.lengths, kind="stable"))
+
+
+def lpt_schedule(vms, cloudlets, mode="time", hosts=None):
+    return GreedyScheduler(vms, cloudlets, mode, hosts).longest_processing_time()
+
+
+SCHEDULERS = {
+    "MCT": mct_schedule,
+    "Min_Min": min_min_schedule,
+    "Max_Min": max_min_schedule,
+    "LPT": lpt_schedule,
+}
+
+
+def run_greedy(name):
+    """Schedules the configured problem with SCHEDULERS[name] and exports it as name."""
+    n, vms, cloudlets, mode = get_config_arrays()
+    vms, original_indices = sort_vms(vms)
+    start_time = time.time()
+    best = [SCHEDULERS[name](vms, cloudlets, mode, get_host_array())]
+    running_tme = time.time() - start_time
+    print(f"Time taken: {running_tme:.4f} sec")
+    export_results(name, best, lambda x: None,
+                   original_indices, running_tme)
@@ -1,3 +1,4 @@
+const os = require('os');
 const path = require('path');
 
 const WEB_DIR = process.env.WEB_DIR || path.resolve(__dirname, '..');
@@ -11,4 +12,8 @@ module.exports = {
     RESULTS_DIR,
     PORT: process.env.PORT || 3000,
     CONFIGS_DIR,
+    // set SCHEDULER_DAEMON=false to spawn `python3 run.py` for every job
+    SCHEDULER_DAEMON: process.env.SCHEDULER_DAEMON !== 'false',
+    // grid points of an LCA parameter sweep that run at the same time
+    SWEEP_WORKERS: Number(process.env.SWEEP_WORKERS) || os.cpus().length,
 };
\ No newline at end of file
@@ -3,13 +3,14 @@ const path = require("path");
 const { RESULTS_DIR } = require("../config/config");
 const { readJsonFile } = require("./fileHandlers");
 
-const getResults = (str = '') => {
+// resultsDir defaults to the shared results folder, sweeps pass the folder of a grid point
+const getResults = (str = '', resultsDir = RESULTS_DIR) => {
     try {
         const fileTypes = ["result", "sim_results"];
         const results = {};
 
         // Auto-discover algorithms
-        const files = fs.readdirSync(RESULTS_DIR);
+        const files = fs.readdirSync(resultsDir);
         const algorithms = new Set();
 
         files.forEach((file) => {
@@ -25,7 +26,7 @@ const getResults = (str = '') => {
             algorithms.forEach((algo) => {
                 const fileName = `${algo}_${type}.json`;
                 results[type === "result" ? "result" : "simResult"][`${algo}_${type}`] = readJsonFile(
-                    path.join(RESULTS_DIR, fileName)
+                    path.join(resultsDir, fileName)
                 );
             });
         });
@@ -5,6 +5,7 @@ const config = require("../config/config");
 const { readJsonFile, writeJsonFile, deleteFilesInDir } = require("./fileHandlers");
 const { executeOrchestrator } = require("./runOrchestrator");
 const { getResults } = require("./resultProcessor");
+const { runSweep } = require("./sweepExecutor");
 const { log } = require("console");
 
 const LCA_PARAMS_PATH = path.join(config.CONFIGS_DIR, "LCA_parameters.json");
@@ -35,6 +36,15 @@ function parseRangeOrSingle(type, value) {
     }
 }
 
+// runs the successive halving search over the grid saved in run_config.json
+// and returns the best parameters, with the S and max_evaluations it was ranked at
+async function tuneLcaParameters() {
+    await executeOrchestrator({ job: 5 });
+    const tuningResult = readJsonFile(path.join(resultsDir, "tuning_result.json"));
+    console.log(`🎯 Successive halving evaluated ${tuningResult.evaluations} of ${tuningResult.grid_evaluations} grid teams`);
+    return tuningResult.best;
+}
+
 async function runExperiments() {
     console.log(`\n--- Deleting old results files ---`);
     // Delete .txt files in lca
@@ -163,40 +173,43 @@ async function runExperimentsForGroupedConfig(currentConfig) {
             const PSI2_values = parseRangeOrSingle(lcaConfig.PSI2_type, lcaConfig.PSI2);
             const q0_values = parseRangeOrSingle(lcaConfig.q0_type, lcaConfig.q0);
 
+            const gridPoints = [];
             for (const L of L_values) {
                 for (const S of S_values) {
                     for (const p_c of p_c_values) {
                         for (const PSI1 of PSI1_values) {
                             for (const PSI2 of PSI2_values) {
                                 for (const q0 of q0_values) {
-                                    console.log(`\n--- Running experiment for L=${L}, S=${S}, p_c=${p_c}, PSI1=${PSI1}, PSI2=${PSI2}, q0=${q0}, config_type=${configType} ---`);
-                                    const lcaParameters = {
-                                        L,
-                                        S,
-                                        p_c,
-                                        PSI1,
-                                        PSI2,
-                                        q0
-                                    };
-
-                                    try {
-                                        writeJsonFile(LCA_PARAMS_PATH, lcaParameters);
-                                        await executeOrchestrator({
-                                            run: "lca",
-                                        });
-                                        const results = getResults("lca");
-                                        allExperimentResults.push({
-                                            L, S, p_c, PSI1, PSI2, q0, config_type: configType, results
-                                        });
-                                    } catch (err) {
-                                        console.error(`Experiment failed for L=${L}, S=${S}, p_c=${p_c}, PSI1=${PSI1}, PSI2=${PSI2}, q0=${q0}: ${err.message}`);
-                                    }
+                                    gridPoints.push({
+                                        lcaParameters: { L, S, p_c, PSI1, PSI2, q0 },
+                                        label: `L=${L}, S=${S}, p_c=${p_c}, PSI1=${PSI1}, PSI2=${PSI2}, q0=${q0}, config_type=${configType}`
+                                    });
                                 }
                             }
                         }
                     }
                 }
             }
+
+            // successive halving ranks the grid on short leagues and only the best
+            // point is run in full, instead of every point of the grid
+            if (lcaConfig.search === "successive_halving") {
+                const best = await tuneLcaParameters();
+                gridPoints.splice(0, gridPoints.length, {
+                    lcaParameters: best,
+                    label: `${Object.entries(best).map(([key, value]) => `${key}=${value}`).join(", ")}, config_type=${configType} (successive halving)`
+                });
+            }
+
+            // grid points run concurrently, each with its own parameters and output folder
+            const sweepResults = await runSweep(gridPoints);
+            gridPoints.forEach(({ lcaParameters }, index) => {
+                if (sweepResults[index]) {
+                    allExperimentResults.push({
+                        ...lcaParameters, config_type: configType, results: sweepResults[index]
+                    });
+                }
+            });
         }
     }
 
@@ -1,23 +1,32 @@
-const { exec } = require("child_process");
+const { execFile } = require("child_process");
 const path = require("path");
-const { MAIN_DIR } = require("../config/config");
+const { MAIN_DIR, SCHEDULER_DAEMON } = require("../config/config");
 const { appLogger } = require("../middleware/logging");
+const { submitJob } = require("./schedulerDaemon");
 
 const executeOrchestrator = (args = {}) => {
+    // the daemon keeps python, numpy and the parsed configs warm between jobs
+    if (SCHEDULER_DAEMON) {
+        return submitJob(args);
+    }
+    return spawnOrchestrator(args);
+};
+
+const spawnOrchestrator = (args = {}) => {
     return new Promise((resolve, reject) => {
-        // Build CLI args string
+        // Build CLI args, passed without a shell so values such as JSON stay intact
         const cliArgs = Object.entries(args)
             .filter(([_, value]) => value !== undefined && value !== null) // skip empty values
-            .map(([key, value]) => `--${key} ${value}`)
-            .join(" ");
+            .flatMap(([key, value]) => [`--${key}`, String(value)]);
 
-        const command = `python3 ${path.join(MAIN_DIR, "run.py")} ${cliArgs}`;
+        const runScript = path.join(MAIN_DIR, "run.py");
 
-        appLogger.info(`Running: ${command}`);
+        appLogger.info(`Running: python3 ${runScript} ${cliArgs.join(" ")}`);
 
-        exec(
-            command,
-            { cwd: MAIN_DIR },
+        execFile(
+            "python3",
+            [runScript, ...cliArgs],
+            { cwd: MAIN_DIR, maxBuffer: 64 * 1024 * 1024 },
             (error, stdout, stderr) => {
                 if (stdout) {
                     appLogger.info(`Python stdout: ${stdout.trim()}`);
@@ -37,4 +46,5 @@ const executeOrchestrator = (args = {}) => {
 
 module.exports = {
     executeOrchestrator,
+    spawnOrchestrator,
 };
\ No newline at end of file
@@ -0,0 +1,99 @@
+const { spawn } = require("child_process");
+const path = require("path");
+const readline = require("readline");
+const { MAIN_DIR } = require("../config/config");
+const { appLogger } = require("../middleware/logging");
+
+// a long-lived `python3 run.py --job 4` process, jobs are JSON lines on its
+// stdin and every job gets one JSON line with the same id back on stdout
+class SchedulerDaemon {
+    constructor() {
+        this.child = null;
+        this.nextJobId = 1;
+        this.pendingJobs = new Map();
+    }
+
+    start() {
+        const child = spawn("python3", [path.join(MAIN_DIR, "run.py"), "--job", "4"], {
+            cwd: MAIN_DIR,
+            stdio: ["pipe", "pipe", "pipe"],
+        });
+        appLogger.info(`Started scheduler daemon (pid ${child.pid})`);
+
+        readline.createInterface({ input: child.stdout }).on("line", (line) => {
+            let response;
+            try {
+                response = JSON.parse(line);
+            } catch (error) {
+                appLogger.info(`Scheduler daemon: ${line}`);
+                return;
+            }
+
+            const job = this.pendingJobs.get(response.id);
+            if (!job) {
+                appLogger.warn(`Scheduler daemon answered unknown job ${response.id}`);
+                return;
+            }
+            this.pendingJobs.delete(response.id);
+
+            if (response.output) {
+                appLogger.info(`Python stdout: ${response.output.trim()}`);
+            }
+            if (response.ok) {
+                job.resolve({ output: response.output });
+            } else {
+                appLogger.error(`Python error: ${response.error}`);
+                job.reject(new Error(`Error: ${response.error}`));
+            }
+        });
+
+        child.stderr.on("data", (data) => {
+            appLogger.warn(`Scheduler daemon stderr: ${data.toString().trim()}`);
+        });
+
+        child.on("exit", (code) => {
+            appLogger.warn(`Scheduler daemon exited with code ${code}`);
+            if (this.child === child) {
+                this.child = null;
+            }
+            for (const job of this.pendingJobs.values()) {
+                job.reject(new Error(`Scheduler daemon exited with code ${code}`));
+            }
+            this.pendingJobs.clear();
+        });
+
+        return child;
+    }
+
+    // takes the same args as executeOrchestrator, e.g. { job: 1, 'config-type': 3 }
+    submitJob(args = {}) {
+        if (!this.child) {
+            this.child = this.start();
+        }
+        const id = this.nextJobId++;
+        return new Promise((resolve, reject) => {
+            this.pendingJobs.set(id, { resolve, reject });
+            appLogger.info(`Submitting job ${id} to scheduler daemon: ${JSON.stringify(args)}`);
+            this.child.stdin.write(JSON.stringify({ id, ...args }) + "\n");
+        });
+    }
+
+    stop() {
+        if (this.child) {
+            this.child.stdin.end();
+            this.child = null;
+        }
+    }
+}
+
+const defaultDaemon = new SchedulerDaemon();
+
+const submitJob = (args = {}) => defaultDaemon.submitJob(args);
+
+const stopDaemon = () => defaultDaemon.stop();
+
+module.exports = {
+    SchedulerDaemon,
+    submitJob,
+    stopDaemon,
+};
@@ -0,0 +1,58 @@
+const fs = require("fs");
+const path = require("path");
+
+const { RESULTS_DIR, SCHEDULER_DAEMON, SWEEP_WORKERS } = require("../config/config");
+const { SchedulerDaemon } = require("./schedulerDaemon");
+const { spawnOrchestrator } = require("./runOrchestrator");
+const { getResults } = require("./resultProcessor");
+
+const SWEEP_DIR = path.join(RESULTS_DIR, "sweep");
+
+// runs the LCA algorithms for every grid point on a bounded pool of workers.
+// each point passes its parameters explicitly and writes its schedules,
+// results and logs to its own folder, so points never share files.
+async function runSweep(gridPoints, workers = SWEEP_WORKERS) {
+    const poolSize = Math.max(1, Math.min(workers, gridPoints.length));
+    const daemons = SCHEDULER_DAEMON
+        ? Array.from({ length: poolSize }, () => new SchedulerDaemon())
+        : [];
+    const sweepResults = new Array(gridPoints.length).fill(null);
+    let nextPoint = 0;
+
+    const runWorker = async (worker) => {
+        while (nextPoint < gridPoints.length) {
+            const index = nextPoint++;
+            const { lcaParameters, label } = gridPoints[index];
+            const outputDir = path.join(SWEEP_DIR, `point_${index}`);
+            fs.rmSync(outputDir, { recursive: true, force: true });
+
+            console.log(`\n--- Running experiment for ${label} (worker ${worker + 1}/${poolSize}) ---`);
+            const args = {
+                run: "lca",
+                "lca-parameters": JSON.stringify(lcaParameters),
+                "output-dir": outputDir,
+            };
+            try {
+                if (daemons.length) {
+                    await daemons[worker].submitJob(args);
+                } else {
+                    await spawnOrchestrator(args);
+                }
+                sweepResults[index] = getResults("lca", path.join(outputDir, "results"));
+            } catch (err) {
+                console.error(`Experiment failed for ${label}: ${err.message}`);
+            }
+        }
+    };
+
+    try {
+        await Promise.all(Array.from({ length: poolSize }, (_, worker) => runWorker(worker)));
+    } finally {
+        daemons.forEach((daemon) => daemon.stop());
+    }
+    return sweepResults;
+}
+
+module.exports = {
+    runSweep,
+};
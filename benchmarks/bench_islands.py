@@ -0,0 +1,76 @@
+"""
+Benchmarks the convergence per second of the island model against a single
+MO_LCA league with as many teams as all islands together.
+
+every island has the L of configs/LCA_parameters.json, the single league has
+islands * L teams and plays the same number of seasons, so its seasons are
+islands times longer.
+
+uses the current configs/sim_config.json and configs/sim_cost_config.json.
+
+usage: python3 benchmarks/bench_islands.py [islands] [migration_interval] [topology]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+sys.path.append(os.path.join(parent_dir, "lca"))
+
+import MO_LCA as mo_lca  # nopep8
+import island_LCA  # nopep8
+from util import make_rng, read_lca_parameters  # nopep8
+
+SEED = 1
+
+
+def single_league(islands):
+    """Runs one league with islands * L teams, returns its trace and times."""
+    lca = mo_lca.MO_LCA(L=islands * read_lca_parameters()["L"], n=mo_lca.n,
+                        max_xi=len(mo_lca.vms) - 1, path_w=None,
+                        mode=mo_lca.mode, rng=make_rng(SEED))
+    start_time = time.time()
+    lca.start_league()
+    times = [time.time() - start_time]
+    while not lca.finished():
+        lca.step()
+        times.append(time.time() - start_time)
+    lca.finish_league()
+    return np.array(lca.f_bList), np.array(times)
+
+
+def time_to_reach(trace, times, target):
+    reached = np.nonzero(trace <= target)[0]
+    return times[reached[0]] if len(reached) else float("nan")
+
+
+def main():
+    islands = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    migration_interval = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    topology = sys.argv[3] if len(sys.argv) > 3 else "ring"
+    mo_lca.load()
+
+    single_trace, single_times = single_league(islands)
+
+    results = island_LCA.run_islands(
+        "MO_LCA", islands=islands, migration_interval=migration_interval,
+        topology=topology, seed=SEED)
+    # weeks are in lockstep between migrations, the slowest island counts
+    island_trace = np.min([result["f_bList"] for result in results], axis=0)
+    island_times = np.max([result["times"] for result in results], axis=0)
+
+    target = max(single_trace[-1], island_trace[-1])
+    for name, trace, times in (("single", single_trace, single_times),
+                               ("islands", island_trace, island_times)):
+        print(f"{name:>8}: f_best={trace[-1]:.4f} after {times[-1]:.3f} sec, "
+              f"{len(trace)} weeks, {(trace[0] - trace[-1]) / times[-1]:.3f} "
+              f"f_best/sec, reaches {target:.4f} after "
+              f"{time_to_reach(trace, times, target):.3f} sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmarks the time-shared makespan kernel of MO_LCA with the scatter-max
+("segment") and the dense assignment mask ("mask") max-length paths.
+
+uses the current configs/sim_config.json and configs/sim_cost_config.json,
+the teams are drawn from --seed so runs are reproducible.
+
+usage: python3 benchmarks/bench_time_shared.py [L] [repeats] [--seed SEED]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+sys.path.append(os.path.join(parent_dir, "lca"))
+
+import lca.MO_LCA as mo_lca  # nopep8
+from lca.util import get_config, get_cost_config, make_rng, sort_vms  # nopep8
+
+
+def bench(lca, X, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        lca.makespan_time_shared(X)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("L", type=int, nargs="?", default=50)
+    parser.add_argument("repeats", type=int, nargs="?", default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    L, repeats = args.L, args.repeats
+
+    n, vms, cloudlets, _ = get_config()
+    mo_lca.vms, _ = sort_vms(vms)
+    mo_lca.cloudlets = cloudlets
+    mo_lca.cost_config = get_cost_config()
+
+    X = make_rng(args.seed).integers(0, len(vms), size=(L, n))
+    results = {}
+    for method in mo_lca.MO_LCA.MAX_LENGTH_METHODS:
+        lca = mo_lca.MO_LCA(n=n, max_xi=len(vms) - 1, mode="time",
+                            max_length_method=method,
+                            rng=make_rng(args.seed))
+        results[method] = lca.makespan_time_shared(X)
+        print(f"{method:>8}: {bench(lca, X, repeats) * 1e3:.3f} ms per call "
+              f"(L={L}, n={n}, vms={len(vms)}, seed={args.seed})")
+
+    assert np.allclose(results["segment"][1], results["mask"][1])
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ export default function SimulationConfiguration({ formData, handleChange, errors
       {/* Configuration Type */}
       <div className="form-section">
         <h3 className="form-section-title grid-title">⚙️ Configuration Type</h3>
-        <p className="form-description">Values: 1–6, 0 for custom, -1 for range</p>
+        <p className="form-description">Values: 1–8 (7 and 8 multi-host), 0 for custom, -1 for range 1–6</p>
 
         <div className="form-group">
           <input
@@ -14,7 +14,7 @@ export default function SimulationConfiguration({ formData, handleChange, errors
             value={formData.config_type}
             onChange={handleChange}
             min="-1"
-            max="6"
+            max="8"
               className="form-input form-input-small"
           />
           {errors.config_type && <div className="error-message">⚠️ {errors.config_type}</div>}
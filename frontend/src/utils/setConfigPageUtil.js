@@ -148,8 +148,8 @@ const validateLcaConfig = (formData, paramTypes) => {
 const validateForm = (formData, customConfig) => {
     let newErrors = {};
 
-    if (formData.config_type < -1 || formData.config_type > 6) {
-        newErrors.config_type = "Configuration type must be between -1 and 6";
+    if (formData.config_type < -1 || formData.config_type > 8) {
+        newErrors.config_type = "Configuration type must be between -1 and 8";
     }
 
     if (![1, 2].includes(Number(formData.cost_config_type))) {
@@ -15,98 +15,213 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
 sys.path.append(parent_dir)
 
-from lca.util import get_config, get_cost_config, sort_vms, get_solution, export_results  # nopep8
+from lca.util import get_config_arrays, get_cost_config, get_host_array, get_seed, make_rng, read_lca_parameters, sort_vms, get_solution, export_results  # nopep8
+from lca.problem import ProblemInstance  # nopep8
 from lca.vectorized_dev import LeagueChampionshipAlgorithm  # nopep8
+from lca.warm_start import warm_start_teams  # nopep8
+from lca import jit_kernels  # nopep8
 
 
 vms = list()
 cloudlets = list()
 cost_config = {}
+hosts = None
+problem = None
 
 
 class MO_LCA(LeagueChampionshipAlgorithm):
     """
     Vectorized Multi-Objective League Championship Algorithm for cost and makespan optimization.
+
+    Args:
+        max_length_method (str): how the time-shared kernel finds the longest
+            cloudlet per VM, "segment" (scatter-max, default) or "mask"
+            (dense VMs x cloudlets mask)
+        incremental (bool): keep per-team state between fitness calls and only
+            re-evaluate the VMs whose cloudlets changed (default True)
+        backend (str): "numpy" (default) or "jit" for the numba compiled
+            kernels, falls back to "numpy" when numba is missing
+        vms, cloudlets, cost_config, hosts: problem data, defaults to the
+            module level values loaded by run(). With hosts, VMs on an
+            overcommitted host run at their share of its MIPS, see
+            util.host_mips_share
+        problem: ProblemInstance of the problem data, used instead of vms,
+            cloudlets, cost_config and hosts when given, derived from them
+            when None
     """
 
-    def configure(self):
-        self.vms = np.array(vms)
-        self.cloudlets = np.array(cloudlets)
+    MAX_LENGTH_METHODS = ("segment", "mask")
+
+    # above this fraction of changed genes the state is rebuilt from scratch
+    incremental_threshold = 0.25
+
+    def __init__(self, *args, max_length_method="segment", incremental=True, backend="numpy",
+                 vms=None, cloudlets=None, cost_config=None, hosts=None, problem=None,
+                 **kwargs):
+        if max_length_method not in self.MAX_LENGTH_METHODS:
+            raise ValueError(
+                f"max_length_method must be one of {self.MAX_LENGTH_METHODS}, got {max_length_method!r}")
+        self.max_length_method = max_length_method
+        self.incremental = incremental
+        self.backend = jit_kernels.resolve_backend(backend)
+        self.state_x = None
+        self.vms = vms
+        self.cloudlets = cloudlets
         self.cost_config = cost_config
+        self.hosts = hosts
+        self.problem = problem
+        super().__init__(*args, **kwargs)
 
-        self.vm_mips = np.array([vm["vm_mips"] for vm in self.vms])
-        self.vm_pes = np.array([vm["vm_pes"] for vm in self.vms])
-        self.cloudlet_lengths = np.array([c["length"] for c in self.cloudlets])
+    def configure(self):
+        if self.problem is None:
+            # config dicts, or the structured arrays of get_config_arrays
+            if self.vms is None:
+                self.vms = vms
+                if self.hosts is None:
+                    self.hosts = hosts
+                self.problem = problem
+            if self.cloudlets is None:
+                self.cloudlets = cloudlets
+            if self.cost_config is None:
+                self.cost_config = cost_config
+        if self.problem is None:
+            self.problem = ProblemInstance.from_config(
+                self.vms, self.cloudlets, self.cost_config, self.mode, self.hosts)
+        self.cost_config = self.problem.cost_config
+
+        self.vm_mips = self.problem.vm_mips
+        self.vm_pes = self.problem.vm_pes
+        self.vm_degree = self.problem.vm_degree
+        self.vm_cost_coef = self.problem.vm_cost_coef
+        self.cloudlet_lengths = self.problem.cloudlet_lengths
+        self.num_vms = self.problem.num_vms
 
         self.makespan = self.makespan_time_shared
         if self.mode == "space":
             self.makespan = self.makespan_space_shared
+        if self.backend == "jit":
+            self.makespan = self.makespan_time_shared_jit
+            if self.mode == "space":
+                self.makespan = self.makespan_space_shared_jit
 
         self.calc_fitness = self.Z
-        self.makespan_scale , _= self.makespan(np.array(self.round_robin()))
-        self.cost_scale = self.cost(np.array(self.round_robin()))
+        self.calc_fitness_batch = self.Z
+        if self.incremental:
+            self.calc_fitness_batch = self.Z_incremental
+        self.makespan_scale, _, self.cost_scale = self.objectives(
+            np.array(self.round_robin()))
+
+    def team_vm_index(self, x):
+        """
+        Maps every (team, cloudlet) gene to a flattened team x VM segment index.
+
+        Args:
+            x : one team of shape (n,) or a population of shape (L, n)
+
+        Returns:
+            tuple: (x_int, segments) both of shape (L, n), where segment
+            l * num_vms + v identifies VM v of team l
+        """
+        x_int = np.atleast_2d(x).astype(int)
+        offsets = np.arange(x_int.shape[0])[:, np.newaxis] * self.num_vms
+        return x_int, x_int + offsets
 
     def makespan_space_shared(self, x):
         vm_mips = self.vm_mips
         vm_pes = self.vm_pes
         cloudlet_lengths = self.cloudlet_lengths
+        num_vms = self.num_vms
 
-        x_int = x.astype(int)
-        num_vms = len(vm_mips)
+        x_int, segments = self.team_vm_index(x)
+        num_teams = x_int.shape[0]
 
         # Calculate execution times for all cloudlets
         ext_times = cloudlet_lengths / vm_mips[x_int]
 
-        # Initialize makespans
-        vm_makespans = np.zeros(num_vms)
-
-        for vm_idx in range(num_vms):
-            # Get all cloudlets assigned to this VM
-            assigned_mask = (x_int == vm_idx)
-            assigned_ext = ext_times[assigned_mask]
-
-            if len(assigned_ext) == 0:
-                continue
-
-            pes = vm_pes[vm_idx]
-
-            # Initialize PE finish times
-            pe_times = np.zeros(pes)
-
-            # Distribute tasks to the PE that will finish earliest
-            for ext in assigned_ext:
-                pe_idx = np.argmin(pe_times)
-                pe_times[pe_idx] += ext
-
-            vm_makespans[vm_idx] = np.max(pe_times)
-
-        return np.max(vm_makespans), vm_makespans
+        vm_makespans = self._space_shared_segments(
+            segments.ravel(), ext_times.ravel(),
+            np.tile(vm_pes, num_teams), num_teams * num_vms)
+
+        vm_makespans = vm_makespans.reshape(num_teams, num_vms)
+        return self._reduce_makespans(x, vm_makespans)
+
+    def _space_shared_segments(self, segments, ext_times, segment_pes, size):
+        """
+        Space-shared list scheduling for all team x VM segments at once.
+
+        Every cloudlet, in cloudlet order, runs on the PE of its VM that
+        becomes free first. The first `pes` cloudlets of a segment start
+        right away on idle PEs; the rest are dispatched in rounds, where
+        round k places the k-th waiting cloudlet of every segment together.
+
+        Args:
+            segments (ndarray): segment index of every cloudlet, shape (m,)
+            ext_times (ndarray): execution time of every cloudlet, shape (m,)
+            segment_pes (ndarray): PE count of every segment, shape (size,)
+            size (int): number of segments
+
+        Returns:
+            ndarray: finish time of the last PE of every segment, shape (size,)
+        """
+        # Group the cloudlets of each segment, keeping cloudlet order
+        order = np.argsort(segments, kind="stable")
+        seg_sorted = segments[order]
+        ext_sorted = ext_times[order]
+        counts = np.bincount(segments, minlength=size)
+        starts = np.cumsum(counts) - counts
+        rank = np.arange(seg_sorted.size) - starts[seg_sorted]
+
+        # Initialize PE finish times, missing PEs never win the argmin
+        max_pes = np.max(segment_pes) if size else 0
+        pe_times = np.where(
+            np.arange(max_pes) < segment_pes[:, np.newaxis], 0.0, np.inf)
+
+        # Cloudlets that find an idle PE start immediately on PE number `rank`
+        cloudlet_pes = segment_pes[seg_sorted]
+        direct = rank < cloudlet_pes
+        pe_times[seg_sorted[direct], rank[direct]] = ext_sorted[direct]
+
+        # The others wait for the earliest available PE
+        queued = np.flatnonzero(~direct)
+        if queued.size:
+            rounds = rank[queued] - cloudlet_pes[queued]
+            queued = queued[np.argsort(rounds, kind="stable")]
+            bounds = np.cumsum(np.bincount(rounds))
+            for begin, end in zip(np.concatenate(([0], bounds[:-1])), bounds):
+                batch = queued[begin:end]
+                batch_segs = seg_sorted[batch]
+                pe_idx = np.argmin(pe_times[batch_segs], axis=1)
+                pe_times[batch_segs, pe_idx] += ext_sorted[batch]
+
+        pe_times[np.isinf(pe_times)] = 0.0
+        return np.max(pe_times, axis=1)
 
     def makespan_time_shared(self, x, context_switch_overhead=0.0):
         vm_mips = self.vm_mips
         vm_pes = self.vm_pes
         cloudlet_lengths = self.cloudlet_lengths
+        num_vms = self.num_vms
 
-        x_int = x.astype(int)
-        num_vms = len(vm_mips)
+        x_int, segments = self.team_vm_index(x)
+        num_teams = x_int.shape[0]
+        size = num_teams * num_vms
 
-        # Calculate total lengths and counts per VM
+        # Calculate total lengths and counts per team x VM in one pass
+        team_lengths = np.broadcast_to(cloudlet_lengths, x_int.shape).ravel()
         vm_task_sums = np.bincount(
-            x_int, weights=cloudlet_lengths, minlength=num_vms)
-        vm_task_counts = np.bincount(x_int, minlength=num_vms)
-
-        # Create mask for all VM-cloudlet assignments
-        vm_indices = np.arange(num_vms)[:, np.newaxis]
-        assignment_mask = (x_int == vm_indices)
+            segments.ravel(), weights=team_lengths, minlength=size).reshape(num_teams, num_vms)
+        vm_task_counts = np.bincount(
+            segments.ravel(), minlength=size).reshape(num_teams, num_vms)
 
         # For underutilized VMs: find max cloudlet length
-        # Set lengths to -inf where not assigned to handle empty VMs
-        masked_lengths = np.where(assignment_mask, cloudlet_lengths, -np.inf)
-        max_lengths = np.max(masked_lengths, axis=1)
-        max_lengths[max_lengths == -np.inf] = 0  # Handle unassigned VMs
+        if self.max_length_method == "mask":
+            max_lengths = self._max_lengths_mask(x_int)
+        else:
+            max_lengths = self._max_lengths_segment(segments, team_lengths, size)
+            max_lengths = max_lengths.reshape(num_teams, num_vms)
 
         # Calculate degree of degradation for overloaded VMs
-        degree = vm_pes * (0.985 ** vm_pes)
+        degree = self.vm_degree
 
         # Compute makespans
         underutilized = vm_task_counts <= vm_pes
@@ -116,53 +231,270 @@ class MO_LCA(LeagueChampionshipAlgorithm):
             (vm_task_sums / (vm_mips * degree)) + context_switch_overhead
         )
 
-        return np.max(vm_makespans), vm_makespans
+        return self._reduce_makespans(x, vm_makespans)
+
+    def _max_lengths_segment(self, segments, lengths, size):
+        """
+        Per-segment max cloudlet length with a scatter-max, O(n) time and memory.
+        Lengths are positive, so unassigned VMs keep their initial 0.
+        """
+        max_lengths = np.zeros(size)
+        np.maximum.at(max_lengths, segments.ravel(), lengths)
+        return max_lengths
+
+    def _max_lengths_mask(self, x_int):
+        """
+        Per-VM max cloudlet length through a full (L, VMs, cloudlets) assignment
+        mask. Kept as the reference path for benchmarking the segment kernel.
+        """
+        # Create mask for all team-VM-cloudlet assignments
+        vm_indices = np.arange(self.num_vms)[np.newaxis, :, np.newaxis]
+        assignment_mask = (x_int[:, np.newaxis, :] == vm_indices)
+
+        # Set lengths to -inf where not assigned to handle empty VMs
+        masked_lengths = np.where(
+            assignment_mask, self.cloudlet_lengths, -np.inf)
+        max_lengths = np.max(masked_lengths, axis=2)
+        max_lengths[max_lengths == -np.inf] = 0  # Handle unassigned VMs
+        return max_lengths
+
+    def makespan_time_shared_jit(self, x, context_switch_overhead=0.0):
+        vm_makespans = jit_kernels.time_shared_vm_makespans(
+            np.atleast_2d(x).astype(np.int64), self.cloudlet_lengths,
+            self.vm_mips, self.vm_pes, self.vm_degree, context_switch_overhead)
+        return self._reduce_makespans(x, vm_makespans)
+
+    def makespan_space_shared_jit(self, x):
+        vm_makespans = jit_kernels.space_shared_vm_makespans(
+            np.atleast_2d(x).astype(np.int64), self.cloudlet_lengths,
+            self.vm_mips, self.vm_pes)
+        return self._reduce_makespans(x, vm_makespans)
+
+    def _reduce_makespans(self, x, vm_makespans):
+        """
+        Reduces (L, num_vms) per-VM makespans to per-team makespans,
+        dropping the team axis again when x was a single team.
+        """
+        makespans = np.max(vm_makespans, axis=1)
+        if np.ndim(x) == 1:
+            return makespans[0], vm_makespans[0]
+        return makespans, vm_makespans
 
     def cost(self, x, re_ut=0.8):
+        return self.objectives(x, re_ut)[2]
+
+    def objectives(self, x, re_ut=0.8):
+        """
+        Both objectives of one team or a population from a single makespan
+        kernel run.
+
+        Args:
+            x : one team of shape (n,) or a population of shape (L, n)
+
+        Returns:
+            tuple: (makespan, vm_makespans, cost), with a leading team axis
+            when x is a population
+        """
         makespan, vm_makespans = self.makespan(x)
-        vm_mips = self.vm_mips
-        vm_pes = self.vm_pes
+        return makespan, vm_makespans, self.cost_from_makespans(
+            makespan, vm_makespans, re_ut)
 
+    def cost_from_makespans(self, makespan, vm_makespans, re_ut=0.8):
         p_active = self.cost_config["p_active"]
         p_idle = self.cost_config["p_idle"]
-        CostPerSecond = self.cost_config["CostPerSecond"]
-        power_x = 1 + self.cost_config["x"]
-        p_u = self.cost_config["p_u"]
 
-        # Vectorized energy computation
+        if self.backend == "jit":
+            total_cost = jit_kernels.vm_cost(
+                np.atleast_2d(vm_makespans), self.vm_cost_coef,
+                p_active, p_idle, re_ut)
+            return total_cost[0] if np.ndim(vm_makespans) == 1 else total_cost
+
+        # Vectorized energy computation, works for one team or a whole population
+        makespan = np.asarray(makespan)[..., np.newaxis]
         energy_active = p_active * vm_makespans
         energy_idle = p_idle * (makespan - vm_makespans)
-        energy_total = (energy_active + energy_idle) * CostPerSecond * \
-            (vm_mips ** power_x) * vm_pes / (1000 * (p_u ** power_x))
+        energy_total = (energy_active + energy_idle) * self.vm_cost_coef
 
-        act = (np.max(energy_total) - np.min(energy_total)) * \
-            re_ut + np.min(energy_total)
-        total_cost = np.sum(energy_total) + act
+        energy_max = np.max(energy_total, axis=-1)
+        energy_min = np.min(energy_total, axis=-1)
+        act = (energy_max - energy_min) * re_ut + energy_min
+        total_cost = np.sum(energy_total, axis=-1) + act
 
         return total_cost
 
     def Z(self, x):
-        cost = self.cost(x) / self.cost_scale
-        makespan, _ = self.makespan(x)
-        makespan /= self.makespan_scale
+        makespan, _, cost = self.objectives(x)
+        return self.scalarize(cost, makespan)
+
+    def Z_incremental(self, X):
+        """
+        Population fitness from the incremental per-team state, see update_team_state.
+        """
+        vm_makespans = self.update_team_state(X)
+        makespan = np.max(vm_makespans, axis=1)
+        cost = self.cost_from_makespans(makespan, vm_makespans)
+        return self.scalarize(cost, makespan)
+
+    def scalarize(self, cost, makespan):
+        """
+        Combines the cost and makespan objectives into the fitness value,
+        single-objective variants override this to select one of them.
+        """
+        cost = cost / self.cost_scale
+        makespan = makespan / self.makespan_scale
 
         z = (0.3 * cost + 0.7 * makespan) * self.fitness_scale
         return z
 
+    def init_team_state(self, X):
+        """
+        Builds the per-team evaluation state of a population from scratch:
+        per-VM length sums, task counts, max lengths and makespans, all
+        stored flat over the team x VM segments.
+        """
+        x_int, segments = self.team_vm_index(X)
+        size = x_int.shape[0] * self.num_vms
+        lengths = np.broadcast_to(self.cloudlet_lengths, x_int.shape).ravel()
+
+        self.state_x = x_int.copy()
+        self.state_sums = np.bincount(
+            segments.ravel(), weights=lengths, minlength=size)
+        self.state_counts = np.bincount(segments.ravel(), minlength=size)
+        self.state_max_lengths = self._max_lengths_segment(
+            segments, lengths, size)
+        # segments that lost their longest cloudlet and need a rebuild before use
+        self.state_max_stale = np.zeros(size, dtype=bool)
+
+        _, vm_makespans = self.makespan(x_int)
+        self.state_vm_makespans = vm_makespans.ravel().copy()
+
+    def update_team_state(self, X):
+        """
+        Brings the per-team state up to date with population X, touching only
+        the cloudlets whose VM index changed and the VMs they left or joined.
+        Falls back to a full rebuild when the shape changes or too many genes
+        moved.
+
+        Args:
+            X : population of shape (L, n)
+
+        Returns:
+            ndarray: per-VM makespans of shape (L, num_vms)
+        """
+        x_int = np.atleast_2d(X).astype(int)
+        num_teams = x_int.shape[0]
+
+        if self.state_x is None or self.state_x.shape != x_int.shape:
+            self.init_team_state(x_int)
+            return self.state_vm_makespans.reshape(num_teams, self.num_vms)
+
+        teams, cloudlet_idx = np.nonzero(x_int != self.state_x)
+        if teams.size > self.incremental_threshold * x_int.size:
+            self.init_team_state(x_int)
+        elif teams.size:
+            self._apply_team_changes(x_int, teams, cloudlet_idx)
+
+        return self.state_vm_makespans.reshape(num_teams, self.num_vms)
+
+    def _apply_team_changes(self, x_int, teams, cloudlet_idx):
+        num_vms = self.num_vms
+        lengths = self.cloudlet_lengths[cloudlet_idx]
+        old_segs = teams * num_vms + self.state_x[teams, cloudlet_idx]
+        new_segs = teams * num_vms + x_int[teams, cloudlet_idx]
+        self.state_x[teams, cloudlet_idx] = x_int[teams, cloudlet_idx]
+
+        np.subtract.at(self.state_sums, old_segs, lengths)
+        np.add.at(self.state_sums, new_segs, lengths)
+        np.subtract.at(self.state_counts, old_segs, 1)
+        np.add.at(self.state_counts, new_segs, 1)
+
+        touched = np.unique(np.concatenate((old_segs, new_segs)))
+        touched_vms = touched % num_vms
 
-def run():
-    global n, vms, cloudlets, cost_config
-    n, vms, cloudlets, mode = get_config()
+        if self.mode == "space":
+            # a space-shared VM depends on the order of all its cloudlets
+            seg_ids, members = self._segment_members(touched)
+            ext_times = self.cloudlet_lengths[members] / \
+                self.vm_mips[seg_ids % num_vms]
+            self.state_vm_makespans[touched] = self._space_shared_segments(
+                np.searchsorted(touched, seg_ids), ext_times,
+                self.vm_pes[touched_vms], touched.size)
+            return
+
+        # Gains can only raise the max, losing the longest cloudlet makes it stale
+        self.state_max_stale[old_segs[lengths >=
+                                      self.state_max_lengths[old_segs]]] = True
+        np.maximum.at(self.state_max_lengths, new_segs, lengths)
+
+        # The max only matters for underutilized VMs, rebuild those lazily
+        underutilized = self.state_counts[touched] <= self.vm_pes[touched_vms]
+        rebuild = touched[self.state_max_stale[touched] & underutilized]
+        if rebuild.size:
+            seg_ids, members = self._segment_members(rebuild)
+            self.state_max_lengths[rebuild] = 0
+            np.maximum.at(self.state_max_lengths, seg_ids,
+                          self.cloudlet_lengths[members])
+            self.state_max_stale[rebuild] = False
+
+        self.state_vm_makespans[touched] = np.where(
+            underutilized,
+            self.state_max_lengths[touched] / self.vm_mips[touched_vms],
+            self.state_sums[touched] /
+            (self.vm_mips[touched_vms] * self.vm_degree[touched_vms])
+        )
+
+    def _segment_members(self, segs):
+        """
+        Cloudlets currently assigned to the given team x VM segments.
+
+        Returns:
+            tuple: (segment ids, cloudlet indices), ordered by team then cloudlet
+        """
+        teams = np.unique(segs // self.num_vms)
+        rows = self.state_x[teams] + teams[:, np.newaxis] * self.num_vms
+        selected = np.zeros(self.state_sums.size, dtype=bool)
+        selected[segs] = True
+        mask = selected[rows]
+        return rows[mask], np.nonzero(mask)[1]
+
+
+LOG_FILE = "MO_LCA.txt"
+
+
+def load():
+    """Loads the simulation config into the module level problem data."""
+    global n, vms, cloudlets, cost_config, mode, original_indices, hosts, problem
+    n, vms, cloudlets, mode = get_config_arrays()
+    hosts = get_host_array()
     cost_config = get_cost_config()
     vms, original_indices = sort_vms(vms)
+    problem = ProblemInstance.load()
+
+
+def build(rng=None, path_w=LOG_FILE, **params):
+    """
+    Creates the MO_LCA league for the loaded problem data, params
+    (L, S, p_c, PSI1, PSI2, q0) override LCA_parameters.json. Part of the
+    league starts from the "warm_start" sources, see warm_start.py.
+    """
+    params.setdefault("seed_teams", warm_start_teams(
+        vms, cloudlets, original_indices, mode, hosts=hosts))
+    backend = read_lca_parameters().get("backend", "numpy")
+    return MO_LCA(n=n, max_xi=len(vms)-1, path_w=path_w, mode=mode,
+                  backend=backend, rng=rng, **params)
+
+
+def run():
+    load()
     start_time = time.time()
-    lca = MO_LCA(n=n, max_xi=len(vms)-1,
-                 path_w="MO_LCA.txt", mode=mode)
+    lca = build(make_rng(get_seed()))
     best = lca.league()
     running_time = time.time() - start_time
     print(f"Time taken: {running_time:.4f} sec")
     export_results("MO_LCA", best, lca.calc_fitness,
-                   original_indices, running_time)
+                   original_indices, running_time,
+                   extra={"stop_reason": lca.stop_reason,
+                          "weeks": len(lca.f_bList)})
 
 
 if __name__ == "__main__":
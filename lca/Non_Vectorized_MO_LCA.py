@@ -9,8 +9,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
 sys.path.append(parent_dir)
 
-from lca.util import get_config, get_cost_config, sort_vms, get_solution, export_results  # nopep8
+from lca.util import get_config, get_cost_config, get_seed, make_rng, sort_vms, get_solution, export_results  # nopep8
 from lca.dev import LeagueChampionshipAlgorithm  # nopep8
+from lca.warm_start import warm_start_teams  # nopep8
 
 
 vms = list()
@@ -161,19 +162,40 @@ class Non_Vectorized_MO_LCA(LeagueChampionshipAlgorithm):
         return z
 
 
-def run():
-    global n, vms, cloudlets, cost_config
+LOG_FILE = "Non_Vectorized_MO_LCA.txt"
+
+
+def load():
+    """Loads the simulation config into the module level problem data."""
+    global n, vms, cloudlets, cost_config, mode, original_indices
     n, vms, cloudlets, mode = get_config()
     cost_config = get_cost_config()
     vms, original_indices = sort_vms(vms)
+
+
+def build(rng=None, path_w=LOG_FILE, **params):
+    """
+    Creates the Non_Vectorized_MO_LCA league for the loaded problem data, params
+    (L, S, p_c, PSI1, PSI2, q0) override LCA_parameters.json. Part of the
+    league starts from the "warm_start" sources, see warm_start.py.
+    """
+    params.setdefault("seed_teams", warm_start_teams(
+        vms, cloudlets, original_indices, mode))
+    return Non_Vectorized_MO_LCA(n=n, max_xi=len(vms)-1, path_w=path_w,
+                                 mode=mode, rng=rng, **params)
+
+
+def run():
+    load()
     start_time = time.time()
-    lca = Non_Vectorized_MO_LCA(n=n, max_xi=len(
-        vms)-1, path_w="Non_Vectorized_MO_LCA.txt", mode=mode)
+    lca = build(make_rng(get_seed()))
     best = lca.league()
-    running_tme = time.time() - start_time
-    print(f"Time taken: {running_tme:.4f} sec")
+    running_time = time.time() - start_time
+    print(f"Time taken: {running_time:.4f} sec")
     export_results("Non_Vectorized_MO_LCA", best, lca.calc_fitness,
-                   original_indices, running_tme)
+                   original_indices, running_time,
+                   extra={"stop_reason": lca.stop_reason,
+                          "weeks": len(lca.f_bList)})
 
 
 if __name__ == "__main__":
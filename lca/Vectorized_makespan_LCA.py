@@ -0,0 +1,74 @@
+"""
+this is a vectorized version of makespan_LCA.py,
+check makespan_LCA.py for code documentation.
+
+it reuses the numpy kernels of MO_LCA.py and keeps
+makespan_LCA.py as the reference implementation.
+"""
+import time
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+from lca.util import get_config_arrays, get_cost_config, get_host_array, get_seed, make_rng, read_lca_parameters, sort_vms, export_results  # nopep8
+from lca.MO_LCA import MO_LCA  # nopep8
+from lca.problem import ProblemInstance  # nopep8
+from lca.warm_start import warm_start_teams  # nopep8
+
+
+class Vectorized_makespan_LCA(MO_LCA):
+    """
+    Vectorized League Championship Algorithm variant for makespan optimization.
+    """
+
+    def scalarize(self, cost, makespan):
+        return makespan
+
+
+LOG_FILE = "Vectorized_Makespan_LCA.txt"
+
+
+def load():
+    """Loads the simulation config into the module level problem data."""
+    global n, vms, cloudlets, cost_config, mode, original_indices, hosts, problem
+    n, vms, cloudlets, mode = get_config_arrays()
+    hosts = get_host_array()
+    cost_config = get_cost_config()
+    vms, original_indices = sort_vms(vms)
+    problem = ProblemInstance.load()
+
+
+def build(rng=None, path_w=LOG_FILE, **params):
+    """
+    Creates the Vectorized_makespan_LCA league for the loaded problem data, params
+    (L, S, p_c, PSI1, PSI2, q0) override LCA_parameters.json. Part of the
+    league starts from the "warm_start" sources, see warm_start.py.
+    """
+    params.setdefault("seed_teams", warm_start_teams(
+        vms, cloudlets, original_indices, mode, hosts=hosts))
+    backend = read_lca_parameters().get("backend", "numpy")
+    return Vectorized_makespan_LCA(n=n, max_xi=len(vms)-1, path_w=path_w,
+                                   mode=mode, backend=backend,
+                                   vms=vms, cloudlets=cloudlets,
+                                   cost_config=cost_config, hosts=hosts,
+                                   problem=problem, rng=rng, **params)
+
+
+def run():
+    load()
+    start_time = time.time()
+    lca = build(make_rng(get_seed()))
+    best = lca.league()
+    running_time = time.time() - start_time
+    print(f"Time taken: {running_time:.4f} sec")
+    export_results("Vectorized_makespan_LCA", best, lca.calc_fitness,
+                   original_indices, running_time,
+                   extra={"stop_reason": lca.stop_reason,
+                          "weeks": len(lca.f_bList)})
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,77 @@
+"""
+anytime scheduling with MO_LCA.
+
+schedule() takes the problem data directly instead of reading the config
+files, runs the league until deadline_ms has passed (or all seasons are
+played) and returns the best schedule found so far, e.g. for an admission
+loop that has to answer within a fixed time:
+
+    from lca.anytime import schedule
+    vm_indices, f_best, stop_reason = schedule(
+        vms, cloudlets, cost_config, deadline_ms=50,
+        callback=lambda t, vm_indices, f_best: print(t, f_best))
+"""
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+# the engines import util and stopping as top level modules
+sys.path.append(current_dir)
+
+from lca.util import sort_vms  # nopep8
+from lca.MO_LCA import MO_LCA  # nopep8
+
+
+def schedule(vms, cloudlets, cost_config, deadline_ms=None, callback=None,
+             mode="time", algorithm=MO_LCA, rng=None, warm_start=(), **params):
+    """
+    Schedules the cloudlets on the VMs within deadline_ms.
+
+    Args:
+        vms (list): VM dicts as in sim_config.json
+        cloudlets (list): cloudlet dicts as in sim_config.json
+        cost_config (dict): as in sim_cost_config.json
+        deadline_ms (float): time budget from this call on, including the
+            set up of the league. Weeks are not interrupted, so the answer
+            can come up to one week late
+        callback: called with (t, vm_indices, f_best) after every week
+        mode (str): "time" or "space" shared VMs
+        algorithm: MO_LCA or one of its single objective subclasses
+        rng: numpy Generator, defaults to fresh entropy
+        warm_start (list): earlier vm_indices, e.g. of the previous round,
+            that start part of the league, cloudlets past their end and
+            VMs that no longer exist are drawn at random
+        params: L, S, p_c, PSI1, PSI2, q0, stopping or backend, unset ones
+            are read from LCA_parameters.json, and hosts, the host dicts
+            the "host" of every VM refers to
+
+    Returns:
+        tuple: (vm_indices, f_best, stop_reason), vm_indices holds the index
+        into vms of the VM of every cloudlet
+    """
+    start_time = time.time()
+    sorted_vms, original_indices = sort_vms(vms)
+    sorted_position = {vm: position for position, vm in enumerate(original_indices)}
+    params.setdefault("seed_teams", [
+        [sorted_position.get(vm, -1) for vm in previous] for previous in warm_start])
+    lca = algorithm(n=len(cloudlets), max_xi=len(vms) - 1, path_w=None,
+                    mode=mode, rng=rng, vms=sorted_vms, cloudlets=cloudlets,
+                    cost_config=cost_config, **params)
+
+    def to_vm_indices(team):
+        return [original_indices[int(vm)] for vm in team]
+
+    week_callback = None
+    if callback is not None:
+        def week_callback(t, team, f_best):
+            callback(t, to_vm_indices(team), float(f_best))
+
+    remaining_ms = None
+    if deadline_ms is not None:
+        remaining_ms = deadline_ms - (time.time() - start_time) * 1000
+    lca.league(deadline_ms=remaining_ms, callback=week_callback)
+    team, f_best = lca.best_team()
+    return to_vm_indices(team), float(f_best), lca.stop_reason
@@ -3,11 +3,13 @@ import json
 import random
 import os
 import sys
+import numpy as np
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
 sys.path.append(parent_dir)
 
-from lca.util import get_custom_config  # nopep8
+from lca.util import (CONFIGS_DIR, get_custom_config, get_seed, make_rng,  # nopep8
+                      records_to_array, stamp_config_arrays, write_config_arrays)
 
 # Predefined configuration templates for different cloud simulation models
 param_ranges = {
@@ -136,11 +138,105 @@ param_ranges = {
         },
         'pe_mips_options': [1000, 2000, 4000, 8000],
         'num_hosts': (1, 1)
+    },
+    # multi-host templates: VMs are packed onto num_hosts hosts spread over
+    # num_datacenters datacenters, a host may run pe_overcommit times its PEs
+    7: {
+        'cloudlet': {
+            'count': (1000, 1000),
+            'length': (30000, 60000),
+            'pes': (1, 1),
+            'fileSize': (300, 300),
+            'outputSize': (300, 300)
+        },
+        'VM': {
+            'count': (60, 60),
+            'pes': [4, 8, 16],
+            'ram': [512, 1024, 2048],
+            'bw': (512, 512),
+            'size': (1024, 1024)
+        },
+        'pe_mips_options': [1000, 2000, 4000, 8000],
+        'num_hosts': (8, 8),
+        'num_datacenters': 2,
+        'pe_overcommit': 1.0
+    },
+    8: {
+        'cloudlet': {
+            'count': (10000, 10000),
+            'length': (30000, 60000),
+            'pes': (1, 1),
+            'fileSize': (300, 300),
+            'outputSize': (300, 300)
+        },
+        'VM': {
+            'count': (600, 600),
+            'pes': [2, 4, 8, 16],
+            'ram': [512, 1024, 2048, 4096],
+            'bw': [512, 1024],
+            'size': (1024, 1024)
+        },
+        'pe_mips_options': [1000, 2000, 4000, 8000],
+        'num_hosts': (200, 200),
+        'num_datacenters': 4,
+        'pe_overcommit': 2.0
     }
 
 }
 
 
+def pack_hosts(vm_pes, vm_ram, vm_bw, vm_size, num_hosts, host_mips,
+               num_datacenters=1, pe_overcommit=1.0):
+    """
+    Bin-packs VMs onto num_hosts hosts with first fit decreasing.
+
+    The hosts share the VMs' total PEs (+20%), RAM, BW and storage (+30%),
+    each big enough for the largest VM. A host takes VMs whose PEs add up to
+    pe_overcommit times its own, CloudSim then time-shares its PEs between
+    them, but no single VM has more PEs than its host. A VM that fits
+    nowhere goes to the least loaded host, which grows to fit it.
+    Hosts are split into num_datacenters consecutive groups.
+
+    Returns:
+        tuple: (hosts, vm_hosts) the host configurations and the host index
+        of every VM
+    """
+    demand = np.column_stack((vm_pes, vm_ram, vm_bw, vm_size)).astype(float)
+    overhead = np.array([1.2 / pe_overcommit, 1.3, 1.3, 1.3])
+    # overcommit applies to the sum of the VM PEs only, a VM never gets
+    # more PEs than its host, CloudSim would not create it
+    host_size = np.maximum(
+        (demand.sum(axis=0) * overhead / num_hosts).astype(int),
+        np.ceil(demand.max(axis=0, initial=0)))
+    capacity = np.tile(host_size, (num_hosts, 1))
+    limit = capacity * [pe_overcommit, 1, 1, 1]
+    used = np.zeros_like(capacity)
+    vm_hosts = np.zeros(len(demand), dtype=int)
+
+    for vm in np.argsort(-(demand / host_size).sum(axis=1), kind="stable"):
+        fits = np.all(used + demand[vm] <= limit, axis=1)
+        if fits.any():
+            host = int(np.argmax(fits))
+        else:
+            host = int(np.argmin((used / limit).max(axis=1)))
+            limit[host] = np.maximum(limit[host], used[host] + demand[vm])
+            capacity[host] = np.maximum(
+                capacity[host], np.ceil(limit[host] / [pe_overcommit, 1, 1, 1]))
+        used[host] += demand[vm]
+        vm_hosts[vm] = host
+
+    hosts = []
+    for host in range(num_hosts):
+        pes, ram, bw, storage = (int(value) for value in capacity[host])
+        host_config = {'pes': pes, 'mips': int(host_mips), 'ram': ram,
+                       'bw': bw, 'storage': storage,
+                       'datacenter': host * num_datacenters // num_hosts}
+        if pe_overcommit != 1:
+            host_config['pe_overcommit'] = pe_overcommit
+        hosts.append(host_config)
+    return hosts, vm_hosts
+
+
 class CloudSimConfigGenerator:
     """
     Generates randomized cloud simulation configurations based on parameter ranges.
@@ -154,14 +250,18 @@ class CloudSimConfigGenerator:
         param_ranges (dict): Configuration template defining parameter ranges
     """
 
-    def __init__(self, config_type: int, mode):
+    def __init__(self, config_type: int, mode, cloudlet_count=None):
         """
         Initialize the generator with a specific configuration template.
 
         Args:
             config_type (int): Index of the configuration template to use
+            cloudlet_count (int): Number of cloudlets instead of the template's count
         """
         self.param_ranges = param_ranges[config_type]
+        if cloudlet_count is not None:
+            self.param_ranges = dict(self.param_ranges, cloudlet=dict(
+                self.param_ranges['cloudlet'], count=(cloudlet_count, cloudlet_count)))
         self.mode = mode
 
     def generate_value(self, range_def):
@@ -200,7 +300,8 @@ class CloudSimConfigGenerator:
 
     def generate_host(self):
         """
-        Generate host configuration capable of running generated VMs.
+        Generate host configurations capable of running generated VMs, see
+        pack_hosts. Every VM gets the index of its host as "host".
 
         Returns:
             tuple: (hosts_config, vms_config) where:
@@ -208,32 +309,22 @@ class CloudSimConfigGenerator:
                 vms_config: List of generated VM configurations
         """
         params = self.param_ranges
+        num_hosts = self.generate_value(params['num_hosts'])
         num_vm = self.generate_value(params['VM']['count'])
 
-        total_pes = 0
-        total_ram = 0
-        total_bw = 0
-        total_size = 0
-        vm_mips = max(params['pe_mips_options'])
-
         vms = []
         for i in range(num_vm):
             vm = self.generate_vm()
             vms.append(vm)
 
-            total_pes += vm['vm_pes']
-            total_ram += vm['vm_ram']
-            total_bw += vm['vm_bw']
-            total_size += vm['vm_size']
-
-        host_config = {
-            'pes': int(total_pes * 1.2),  # 20% overhead
-            'mips': int(vm_mips * 1.5),  # Host is 50% faster than VMs
-            'ram': int(total_ram * 1.3),  # 30% overhead
-            'bw': int(total_bw * 1.3),    # 30% overhead
-            'storage': int(total_size * 1.3),  # 30% overhead
-        }
-        hosts = [host_config]
+        hosts, vm_hosts = pack_hosts(
+            [vm['vm_pes'] for vm in vms], [vm['vm_ram'] for vm in vms],
+            [vm['vm_bw'] for vm in vms], [vm['vm_size'] for vm in vms],
+            num_hosts,
+            max(params['pe_mips_options']) * 1.5,  # Host is 50% faster than VMs
+            params.get('num_datacenters', 1), params.get('pe_overcommit', 1.0))
+        for vm, host in zip(vms, vm_hosts):
+            vm['host'] = int(host)
         return hosts, vms
 
     def generate_cloudlet(self):
@@ -276,9 +367,6 @@ class CloudSimConfigGenerator:
                 - vms: Virtual machine configurations
                 - cloudlets: Tasks workload configurations
         """
-        params = self.param_ranges
-        num_hosts = self.generate_value(params['num_hosts'])
-
         host, vms = self.generate_host()
         cloudlets = self.generate_cloudlets()
         return {
@@ -289,14 +377,125 @@ class CloudSimConfigGenerator:
         }
 
 
+class StreamingConfigGenerator(CloudSimConfigGenerator):
+    """
+    Vectorized generator for very large workloads, e.g. 100k+ cloudlets.
+
+    Draws the VM and cloudlet attributes as NumPy arrays in bulk and writes
+    sim_config.json (compact, one cloudlet per line) and the .npy files of
+    util.get_config_arrays chunk by chunk, so memory stays bounded by
+    chunk_size cloudlets whatever the workload size.
+
+    Attributes:
+        chunk_size (int): Cloudlets drawn and written at a time
+        rng: numpy Generator for all draws
+    """
+
+    CLOUDLET_FIELDS = ("pes", "length", "fileSize", "outputSize")
+    VM_FIELDS = (("vm_mips", None), ("vm_pes", "pes"), ("vm_ram", "ram"),
+                 ("vm_bw", "bw"), ("vm_size", "size"))
+
+    def __init__(self, config_type: int, mode, cloudlet_count=None,
+                 chunk_size=10000, rng=None):
+        super().__init__(config_type, mode, cloudlet_count)
+        self.chunk_size = chunk_size
+        self.rng = rng if rng is not None else make_rng()
+
+    def generate_values(self, range_def, size):
+        """Vectorized generate_value, size values at once."""
+        if isinstance(range_def, dict) and "range" in range_def:
+            range_def = tuple(range_def["range"])
+        if isinstance(range_def, tuple):
+            return self.rng.integers(range_def[0], range_def[1] + 1, size=size)
+        if isinstance(range_def, list):
+            return self.rng.choice(range_def, size=size)
+        return np.full(size, range_def)
+
+    def generate_count(self, range_def):
+        """generate_value drawn from rng, for the VM and cloudlet counts."""
+        return int(self.generate_values(range_def, 1)[0])
+
+    def generate_vm_array(self):
+        """
+        Returns:
+            ndarray: structured array of all VMs, with the fields of generate_vm
+        """
+        params = self.param_ranges
+        num_vm = self.generate_count(params['VM']['count'])
+        vms = np.zeros(num_vm, dtype=[(field, np.int64) for field, _ in self.VM_FIELDS] +
+                       [("host", np.int64)])
+        for field, key in self.VM_FIELDS:
+            range_def = params['pe_mips_options'] if key is None else params['VM'][key]
+            vms[field] = self.generate_values(range_def, num_vm)
+        return vms
+
+    def generate_hosts(self, vms):
+        """Same hosts as generate_host, packs the VM array and sets its "host"."""
+        params = self.param_ranges
+        hosts, vms['host'] = pack_hosts(
+            vms['vm_pes'], vms['vm_ram'], vms['vm_bw'], vms['vm_size'],
+            self.generate_count(params['num_hosts']),
+            max(params['pe_mips_options']) * 1.5,
+            params.get('num_datacenters', 1), params.get('pe_overcommit', 1.0))
+        return hosts
+
+    def write(self, configs_dir=CONFIGS_DIR):
+        """
+        Writes sim_config.json and its hosts, vms and cloudlets .npy files.
+
+        Returns:
+            int: Number of cloudlets written
+        """
+        params = self.param_ranges
+        vms = self.generate_vm_array()
+        hosts = self.generate_hosts(vms)
+        num_cloudlet = self.generate_count(params['cloudlet']['count'])
+        vm_records = [dict(zip(vms.dtype.names, vm)) for vm in vms.tolist()]
+
+        np.save(os.path.join(configs_dir, "sim_config.hosts.npy"),
+                records_to_array(hosts))
+        np.save(os.path.join(configs_dir, "sim_config.vms.npy"), vms)
+        cloudlets = np.lib.format.open_memmap(
+            os.path.join(configs_dir, "sim_config.cloudlets.npy"), mode="w+",
+            dtype=[(field, np.int64) for field in self.CLOUDLET_FIELDS],
+            shape=(num_cloudlet,))
+
+        with open(os.path.join(configs_dir, "sim_config.json"), "w") as f:
+            f.write('{"mode": %s, "hosts": %s, "vms": %s, "cloudlets": [' % (
+                json.dumps(self.mode),
+                json.dumps(hosts),
+                json.dumps(vm_records)))
+            for start in range(0, num_cloudlet, self.chunk_size):
+                stop = min(start + self.chunk_size, num_cloudlet)
+                chunk = cloudlets[start:stop]
+                for field in self.CLOUDLET_FIELDS:
+                    chunk[field] = self.generate_values(
+                        params['cloudlet'][field], stop - start)
+                f.write(("," if start else "") + "\n" + ",\n".join(
+                    '{"pes": %d, "length": %d, "fileSize": %d, "outputSize": %d}' % row
+                    for row in chunk.tolist()))
+            f.write("\n]}\n")
+        cloudlets.flush()
+        del cloudlets
+        stamp_config_arrays(self.mode, configs_dir)
+        return num_cloudlet
+
+
 def add_custom_config():
     param_ranges[0] = get_custom_config()
 
 
-def generate_config(CONFIGURATION_CHOICE=1, MODE="time"):
+def generate_config(CONFIGURATION_CHOICE=1, MODE="time", stream=False,
+                    cloudlet_count=None):
     if (CONFIGURATION_CHOICE == 0):
         add_custom_config()
-    generator = CloudSimConfigGenerator(CONFIGURATION_CHOICE, MODE)
+    if stream:
+        StreamingConfigGenerator(CONFIGURATION_CHOICE, MODE, cloudlet_count,
+                                 rng=make_rng(get_seed())).write()
+        return
+    generator = CloudSimConfigGenerator(CONFIGURATION_CHOICE, MODE, cloudlet_count)
     current_dir = os.path.dirname(os.path.abspath(__file__))
+    config = generator.generate_config()
     with open(f"{current_dir}/../configs/sim_config.json", "w") as f:
-        json.dump(generator.generate_config(), f, indent=4)
+        json.dump(config, f, indent=4)
+    write_config_arrays(config)
@@ -3,17 +3,23 @@ import heapq
 from collections import defaultdict
 import os
 import sys
+
+import numpy as np
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
 sys.path.append(parent_dir)
 
-from lca.util import get_config, get_cost_config, sort_vms, get_solution, export_results  # nopep8
+from lca.util import get_config, get_cost_config, get_host_array, get_seed, make_rng, read_lca_parameters, sort_vms, get_solution, export_results  # nopep8
 from lca.dev import LeagueChampionshipAlgorithm  # nopep8
+from lca.problem import ProblemInstance  # nopep8
+from lca.warm_start import warm_start_teams  # nopep8
+from lca import jit_kernels  # nopep8
 
 
 vms = list()
 cloudlets = list()
 cost_config = {}
+problem = None
 
 
 class cost_LCA(LeagueChampionshipAlgorithm):
@@ -22,14 +28,63 @@ class cost_LCA(LeagueChampionshipAlgorithm):
 
     Extends the base LCA to optimize cloudlet-to-VM assignments for minimal cost
     (vms running cost).
+
+    Args:
+        problem (ProblemInstance): the problem data, see problem.py
+        backend (str): "numpy" (default) for the reference implementation or
+            "jit" for the numba compiled kernels, falls back to "numpy" when
+            numba is missing
     """
 
+    def __init__(self, *args, problem, backend="numpy", **kwargs):
+        self.problem = problem
+        self.backend = jit_kernels.resolve_backend(backend)
+        super().__init__(*args, **kwargs)
+
     def configure(self):
+        problem = self.problem
+        # plain lists of the problem arrays, indexed per cloudlet in the loops
+        self.lengths = problem.cloudlet_lengths.tolist()
+        self.vm_mips_list = problem.vm_mips.tolist()
+        self.vm_pes_list = problem.vm_pes.tolist()
+        self.vm_degree_list = problem.vm_degree.tolist()
+        self.vm_cost_coef_list = problem.vm_cost_coef.tolist()
+
         self.makespan = self.makespan_time_shared
         if self.mode == "space":
             self.makespan = self.makespan_space_shared
 
         self.calc_fitness = self.cost
+        if self.backend == "jit":
+            self.configure_jit()
+
+    def configure_jit(self):
+        """Builds the arrays used by the compiled kernels."""
+        problem = self.problem
+        self.vm_mips = problem.vm_mips
+        self.vm_pes = problem.vm_pes
+        self.vm_degree = problem.vm_degree
+        self.cloudlet_lengths = problem.cloudlet_lengths
+        self.vm_cost_coef = problem.vm_cost_coef
+
+        self.calc_fitness = self.cost_jit
+
+    def vm_makespans_jit(self, x):
+        """Compiled per-VM makespans of one team, shape (1, num_vms)."""
+        x = np.asarray(x, dtype=np.int64)[np.newaxis, :]
+        if self.mode == "space":
+            return jit_kernels.space_shared_vm_makespans(
+                x, self.cloudlet_lengths, self.vm_mips, self.vm_pes)
+        return jit_kernels.time_shared_vm_makespans(
+            x, self.cloudlet_lengths, self.vm_mips, self.vm_pes, self.vm_degree)
+
+    def cost_jit(self, x, re_ut=0.8):
+        """Compiled equivalent of cost."""
+        total_cost = jit_kernels.vm_cost(
+            self.vm_makespans_jit(x), self.vm_cost_coef,
+            self.problem.cost_config["p_active"],
+            self.problem.cost_config["p_idle"], re_ut)
+        return float(total_cost[0])
 
     def makespan_space_shared(self, x):
         """
@@ -43,17 +98,17 @@ class cost_LCA(LeagueChampionshipAlgorithm):
             int : Makespan value for the solution x
         """
 
+        lengths, vm_mips, vm_pes = self.lengths, self.vm_mips_list, self.vm_pes_list
+
         # vm_index -> min-heap of CPU end times
         vm_cpu_queues = defaultdict(list)
 
         for i, vm_index in enumerate(x):
             vm_index = int(vm_index)
-            cloudlet = cloudlets[i]
-            vm = vms[vm_index]
-            ext = cloudlet["length"] / vm["vm_mips"]
+            ext = lengths[i] / vm_mips[vm_index]
 
             # If VM has free CPUs, start immediately
-            if len(vm_cpu_queues[vm_index]) < vm["vm_pes"]:
+            if len(vm_cpu_queues[vm_index]) < vm_pes[vm_index]:
                 heapq.heappush(vm_cpu_queues[vm_index], ext)
             else:
                 # Wait for the earliest available CPU
@@ -62,7 +117,7 @@ class cost_LCA(LeagueChampionshipAlgorithm):
                 heapq.heappush(vm_cpu_queues[vm_index], finish_time)
 
         # Find the latest finish time across all CPUs in all VMs
-        vm_finish_times = [0] * len(vms)
+        vm_finish_times = [0] * self.problem.num_vms
         for vm_index, cpu_times in vm_cpu_queues.items():
             vm_finish_times[vm_index] = max(cpu_times) if cpu_times else 0.0
 
@@ -84,21 +139,19 @@ class cost_LCA(LeagueChampionshipAlgorithm):
         for i, vm_index in enumerate(x):
             vm_tasks[int(vm_index)].append(i)
 
-        vm_makespans = [0] * len(vms)
+        vm_makespans = [0] * self.problem.num_vms
+        lengths = self.lengths
         for vm_index, task_indices in vm_tasks.items():
-            vm = vms[vm_index]
-            vm_pes = vm["vm_pes"]
-            vm_mips = vm["vm_mips"]
+            vm_pes = self.vm_pes_list[vm_index]
+            vm_mips = self.vm_mips_list[vm_index]
 
             if len(task_indices) <= vm_pes:
-                vm_makespan = max(cloudlets[i]["length"]
-                                  for i in task_indices) / vm_mips
+                vm_makespan = max(lengths[i] for i in task_indices) / vm_mips
             else:
-                total_length = sum(cloudlets[i]["length"]
-                                   for i in task_indices)
+                total_length = sum(lengths[i] for i in task_indices)
                 total_exec = total_length / vm_mips
                 # adjust 0.99 to relate to the number of cloudlets
-                degree = vm_pes * (0.985 ** vm_pes)
+                degree = self.vm_degree_list[vm_index]
                 vm_makespan = (
                     total_exec/degree) + context_switch_overhead
             vm_makespans[vm_index] = vm_makespan
@@ -119,15 +172,11 @@ class cost_LCA(LeagueChampionshipAlgorithm):
 
         enecon_vm = []
         makespan, vm_makespans = self.makespan(x)
-        p_active = cost_config["p_active"]
-        p_idle = cost_config["p_idle"]
-        x = 1 + cost_config["x"]
-        p_u = cost_config["p_u"]
-        for j, vm_makespan in enumerate(vm_makespans):
+        p_active = self.problem.cost_config["p_active"]
+        p_idle = self.problem.cost_config["p_idle"]
+        for vm_makespan, cost_coef in zip(vm_makespans, self.vm_cost_coef_list):
             energy = p_active * vm_makespan + p_idle * (makespan - vm_makespan)
-            energy = energy * cost_config["CostPerSecond"] * (
-                vms[j]["vm_mips"] ** x) * vms[j]["vm_pes"] / (1000 * (p_u ** x))
-            enecon_vm.append(energy)
+            enecon_vm.append(energy * cost_coef)
 
         act = (max(enecon_vm) - min(enecon_vm)) * \
             re_ut + min(enecon_vm) if enecon_vm else 0.0
@@ -136,19 +185,43 @@ class cost_LCA(LeagueChampionshipAlgorithm):
         return total_cost
 
 
-def run():
-    global n, vms, cloudlets, cost_config
+LOG_FILE = "Cost_LCA.txt"
+
+
+def load():
+    """Loads the simulation config into the module level problem data."""
+    global n, vms, cloudlets, cost_config, mode, original_indices, hosts, problem
     n, vms, cloudlets, mode = get_config()
+    hosts = get_host_array()
     cost_config = get_cost_config()
     vms, original_indices = sort_vms(vms)
+    problem = ProblemInstance.load()
+
+
+def build(rng=None, path_w=LOG_FILE, **params):
+    """
+    Creates the cost_LCA league for the loaded problem data, params
+    (L, S, p_c, PSI1, PSI2, q0) override LCA_parameters.json. Part of the
+    league starts from the "warm_start" sources, see warm_start.py.
+    """
+    params.setdefault("seed_teams", warm_start_teams(
+        vms, cloudlets, original_indices, mode, hosts=hosts))
+    backend = read_lca_parameters().get("backend", "numpy")
+    return cost_LCA(n=n, max_xi=len(vms)-1, path_w=path_w, mode=mode,
+                    backend=backend, problem=problem, rng=rng, **params)
+
+
+def run():
+    load()
     start_time = time.time()
-    lca = cost_LCA(n=n, max_xi=len(vms)-1,
-                   path_w="Cost_LCA.txt", mode=mode)
+    lca = build(make_rng(get_seed()))
     best = lca.league()
-    running_tme = time.time() - start_time
-    print(f"Time taken: {running_tme:.4f} sec")
+    running_time = time.time() - start_time
+    print(f"Time taken: {running_time:.4f} sec")
     export_results("cost_LCA", best, lca.calc_fitness,
-                   original_indices, running_tme)
+                   original_indices, running_time,
+                   extra={"stop_reason": lca.stop_reason,
+                          "weeks": len(lca.f_bList)})
 
 
 if __name__ == "__main__":
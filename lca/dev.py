@@ -1,25 +1,26 @@
 import os
+import time
 import numpy as np
-import random
 import math
-from util import read_lca_parameters
-params = read_lca_parameters()
-
-L = params['L']
-L_half = L // 2
-S = params['S']
-n = 0
-p_c = params['p_c']
-PSI1 = params['PSI1']
-PSI2 = params['PSI2']
-q0 = params['q0']
+from util import read_lca_parameters, make_rng, get_output_dir
+from stopping import StoppingRules
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
 
 
 class LeagueChampionshipAlgorithm(object):
-    def __init__(self, L=L, S=S, n=n, p_c=p_c, PSI1=PSI1, PSI2=PSI2, min_xi=0, max_xi=0,q0=q0, path_w="LCA.txt", mode="time"):
+    def __init__(self, L=None, S=None, n=0, p_c=None, PSI1=None, PSI2=None, min_xi=0, max_xi=0, q0=None, path_w="LCA.txt", mode="time", rng=None, stopping=None, seed_teams=None):
+        # unset parameters are read from LCA_parameters.json on construction,
+        # not on import, so long-lived processes pick up a changed file
+        if None in (L, S, p_c, PSI1, PSI2, q0):
+            params = read_lca_parameters()
+            L = params['L'] if L is None else L
+            S = params['S'] if S is None else S
+            p_c = params['p_c'] if p_c is None else p_c
+            PSI1 = params['PSI1'] if PSI1 is None else PSI1
+            PSI2 = params['PSI2'] if PSI2 is None else PSI2
+            q0 = params['q0'] if q0 is None else q0
         self.L = L
         self.L_half = L // 2
         self.S = S
@@ -30,8 +31,17 @@ class LeagueChampionshipAlgorithm(object):
         self.min_xi = min_xi
         self.max_xi = max_xi
         self.q0 = q0
-        self.path_w = os.path.join(BASE_DIR, f"lca/{path_w}")
+        # path_w=None discards the progress log, e.g. in multi-start workers
+        self.path_w = os.path.join(get_output_dir(), f"lca/{path_w}") \
+            if path_w is not None else os.devnull
         self.mode = mode
+        self.rng = rng if rng is not None else make_rng()
+        # early stopping rules, see stopping.StoppingRules
+        self.stopping = stopping if stopping is not None \
+            else StoppingRules.from_parameters(read_lca_parameters())
+        self.stop_reason = None
+        # warm start teams, see seedTeams
+        self.seed_teams = seed_teams if seed_teams is not None else []
         self.configure()
         self.fitness_scale = 1
         self.fitness_scale = self.calc_fitness(self.round_robin())
@@ -45,16 +55,64 @@ class LeagueChampionshipAlgorithm(object):
         """Returns a round robin team"""
         return [i % (self.max_xi+1) for i in range(self.n)]
 
-    def league(self):
+    def league(self, deadline_ms=None, callback=None):
         """
         Executes the main League Championship Algorithm optimization process.
 
+        Args:
+            deadline_ms (float): wall-clock budget in milliseconds, checked
+                between weeks, so the last week may end a little after it
+            callback: called with (t, best team, f_best) after the initial
+                draw and after every week
+
         Returns:
-            list: The best found solutions (teams) after all seasons
+            list: The best found solutions (teams) after all seasons, or the
+            best so far when a stopping rule or the deadline ended the league
+        """
+        for t, team, f_best in self.iter_league(deadline_ms):
+            if callback is not None:
+                callback(t, team, f_best)
+        return self.B
+
+    def iter_league(self, deadline_ms=None):
+        """
+        Plays the league like league() and yields (t, best team, f_best)
+        after the initial draw and after every week. Closing the generator
+        early ends the league, self.B then holds the best teams so far.
         """
-        wfile = open(self.path_w, mode='w')
+        self.start_league(deadline_ms)
+        try:
+            while True:
+                yield (self.t, *self.best_team())
+                if self.finished():
+                    break
+                self.step()
+        except GeneratorExit:
+            self.stop_reason = self.stop_reason or "closed"
+            raise
+        finally:
+            self.finish_league()
+
+    def best_team(self):
+        """Returns a copy of the best team found so far and its fitness."""
+        best = self.fB.index(min(self.fB))
+        return list(self.B[best]), self.fB[best]
+
+    def start_league(self, deadline_ms=None):
+        """
+        Draws the initial teams and the first league schedule, the league
+        state lives on self so it can be advanced one week at a time with
+        step().
 
-        X = self.getRandomTeams(self.min_xi, self.max_xi)
+        Args:
+            deadline_ms (float): the league stops with stop_reason
+                "deadline" once this many milliseconds have passed
+        """
+        self.deadline = time.time() + deadline_ms / 1000 \
+            if deadline_ms is not None else None
+        self.wfile = open(self.path_w, mode='w')
+
+        X = self.seedTeams(self.getRandomTeams(self.min_xi, self.max_xi))
 
         DUMMY_TEAM = self.getRandomTeam(self.min_xi, self.max_xi)
 
@@ -63,46 +121,75 @@ class LeagueChampionshipAlgorithm(object):
             self.L += 1
             self.L_half += 1
 
-        fX = list(0 for _ in range(self.L))
-        fX = self.fitness(X)
-        nextX = list(X)
+        self.X = X
+        self.fX = self.fitness(X)
+        self.evaluations = self.L
+        self.nextX = list(X)
 
-        B = list(X)
-        fB = list(fX)
+        self.B = list(X)
+        self.fB = list(self.fX)
 
-        f_best = min(fB)
-        f_bList = list()
-        f_bList.append(f_best)
+        self.f_best = min(self.fB)
+        self.f_bList = [self.f_best]
 
-        t = 1
+        self.t = 1
 
         self.genericSchedule = self.generateRoundRobinSchedule()
-        self.schedule = self.leagueSchedule(t)
-        wfile.write("t =%d, f_best=%f\n" % (t, f_best))
-        while t < self.S * (self.L - 1):
-            if t % 10 == 0:
-                wfile.write("t =%d, f_best=%f\n" % (t, f_best))
+        self.schedule = self.leagueSchedule(self.t)
+        self.wfile.write("t =%d, f_best=%f\n" % (self.t, self.f_best))
+        self.stop_reason = None
+        self.stopping.start()
 
-            Y = self.get_Y()
+    def finished(self):
+        """
+        True after the last season or once a stopping rule fired, the rule
+        is kept in self.stop_reason.
+        """
+        if self.stop_reason is not None:
+            return True
+        if self.t >= self.S * (self.L - 1):
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.stop_reason = "deadline"
+            return True
+        self.stop_reason = self.stopping.check(
+            self.f_bList, self.evaluations, self.L - 1)
+        return self.stop_reason is not None
 
-            nextX = self.calc_nextX(t, fX, f_best, X, B, Y, nextX)
+    def step(self):
+        """Plays one week of the league."""
+        t = self.t
+        if t % 10 == 0:
+            self.wfile.write("t =%d, f_best=%f\n" % (t, self.f_best))
 
-            X = nextX.copy()
+        Y = self.get_Y()
 
-            fX = self.fitness(X)
+        self.nextX = self.calc_nextX(
+            t, self.fX, self.f_best, self.X, self.B, Y, self.nextX)
 
-            for l in range(self.L):
-                if fX[l] < fB[l]:
-                    B[l] = X[l]
-                    fB[l] = fX[l]
-            f_best = min(fB)
-            f_bList.append(f_best)
+        self.X = self.nextX.copy()
 
-            if t % (self.L - 1) == 0:
-                self.schedule = self.leagueSchedule(t)
-            t += 1
+        self.fX = self.fitness(self.X)
+        self.evaluations += self.L
 
-        return B
+        for l in range(self.L):
+            if self.fX[l] < self.fB[l]:
+                self.B[l] = self.X[l]
+                self.fB[l] = self.fX[l]
+        self.f_best = min(self.fB)
+        self.f_bList.append(self.f_best)
+
+        if t % (self.L - 1) == 0:
+            self.schedule = self.leagueSchedule(t)
+        self.t += 1
+
+    def finish_league(self):
+        if self.stop_reason is None:
+            self.stop_reason = "seasons"
+        self.wfile.write("t =%d, f_best=%f, stop_reason=%s\n" %
+                         (self.t, self.f_best, self.stop_reason))
+        self.wfile.close()
+        return self.B
 
     def calc_nextX(self, t, fX, f_best, X, B, Y, nextX):
         """
@@ -143,7 +230,7 @@ class LeagueChampionshipAlgorithm(object):
         if min > max:
             min, max = max, min  # Swap if reversed
 
-        team = [random.randint(min, max) for _ in range(self.n)]
+        team = self.rng.integers(min, max + 1, size=self.n).tolist()
         return team
 
     def getRandomTeams(self, min, max):
@@ -160,6 +247,25 @@ class LeagueChampionshipAlgorithm(object):
         X = [self.getRandomTeam(min, max) for _ in range(self.L)]
         return X
 
+    def seedTeams(self, X):
+        """
+        Warm start: replaces up to half of the teams of X by self.seed_teams.
+        A seed shorter than n keeps the random values of the rest of its
+        team, and so do values outside [min_xi, max_xi], e.g. VMs that no
+        longer exist.
+
+        Args:
+            X (list): the random initial teams
+
+        Returns:
+            list: X with the seed teams
+        """
+        for l, seed in enumerate(self.seed_teams[:self.L_half]):
+            for i, value in enumerate(seed[:self.n]):
+                if self.min_xi <= value <= self.max_xi:
+                    X[l][i] = int(value)
+        return X
+
     def leagueSchedule(self, t):
         """
         Generates or updates the league schedule based on current round.
@@ -176,7 +282,7 @@ class LeagueChampionshipAlgorithm(object):
         else:
             teams = list(range(self.L))
             shuffledTeams = teams.copy()
-            random.shuffle(shuffledTeams)
+            self.rng.shuffle(shuffledTeams)
             reversedShuffledTeams = list(range(self.L))
             for i in range(self.L):
                 reversedShuffledTeams[shuffledTeams[i]] = i
@@ -250,7 +356,7 @@ class LeagueChampionshipAlgorithm(object):
             winPoint = (fX[team2] - f_best) / \
                 (fX[team2] + fX[team1] - 2.0 * f_best)
 
-        random_point = random.uniform(0.0, 1.0)
+        random_point = self.rng.random()
         if winPoint == 0.0:
             winner = team2
         elif winPoint == 1.0:
@@ -292,11 +398,11 @@ class LeagueChampionshipAlgorithm(object):
         y_sample = [i for i in range(self.n)]
         for i in range(self.L):
             y = [0] * self.n
-            a = random.uniform(0.0, 1.0)
-            flagNum = (math.log(1 - (1 - (1 - p_c)**(self.n - self.q0 + 1)) * a) //
-                       math.log(1 - p_c)) + self.q0 - 1
+            a = self.rng.random()
+            flagNum = (math.log(1 - (1 - (1 - self.p_c)**(self.n - self.q0 + 1)) * a) //
+                       math.log(1 - self.p_c)) + self.q0 - 1
             q = int(flagNum)
-            poInt = list(random.sample(range(self.n), q))
+            poInt = self.rng.choice(self.n, size=q, replace=False).tolist()
             poInt.sort()
             for pos in poInt:
                 y[pos] = 1
@@ -310,8 +416,7 @@ class LeagueChampionshipAlgorithm(object):
         Returns:
             tuple: (r1_id, r2_id) where each is a list of n random floats in [0,1]
         """
-        r1_id = [random.uniform(0.0, 1.0) for _ in range(self.n)]
-        r2_id = [random.uniform(0.0, 1.0) for _ in range(self.n)]
+        r1_id, r2_id = self.rng.random(size=(2, self.n)).tolist()
         return r1_id, r2_id
 
     def setTeamFormation(self, X, B, Y, teamA, teamB, teamC, teamD, winner1, winner2):
@@ -338,23 +443,23 @@ class LeagueChampionshipAlgorithm(object):
         if winner1 == teamA and winner2 == teamC:  # S/T
             for i in range(self.n):
                 nextA[i] = B[teamA][i] + Y[teamA][i] * (
-                    PSI1 * r1_id[i] * (X[teamA][i] - X[teamD][i]) +
-                    PSI1 * r2_id[i] * (X[teamA][i] - X[teamB][i]))
+                    self.PSI1 * r1_id[i] * (X[teamA][i] - X[teamD][i]) +
+                    self.PSI1 * r2_id[i] * (X[teamA][i] - X[teamB][i]))
         elif winner1 == teamA and winner2 == teamD:  # S/O
             for i in range(self.n):
                 nextA[i] = B[teamA][i] + Y[teamA][i] * (
-                    PSI2 * r1_id[i] * (X[teamD][i]-X[teamA][i]) +
-                    PSI1 * r2_id[i] * (X[teamA][i] - X[teamB][i]))
+                    self.PSI2 * r1_id[i] * (X[teamD][i]-X[teamA][i]) +
+                    self.PSI1 * r2_id[i] * (X[teamA][i] - X[teamB][i]))
         elif winner1 == teamB and winner2 == teamC:  # W/T
             for i in range(self.n):
                 nextA[i] = B[teamA][i] + Y[teamA][i] * (
-                    PSI1 * r1_id[i] * (X[teamA][i] - X[teamD][i]) +
-                    PSI2 * r2_id[i] * (X[teamB][i] - X[teamA][i]))
+                    self.PSI1 * r1_id[i] * (X[teamA][i] - X[teamD][i]) +
+                    self.PSI2 * r2_id[i] * (X[teamB][i] - X[teamA][i]))
         elif winner1 == teamB and winner2 == teamD:  # W/O
             for i in range(self.n):
                 nextA[i] = B[teamA][i] + Y[teamA][i] * (
-                    PSI2 * r1_id[i] * (X[teamD][i] - X[teamA][i]) +
-                    PSI2 * r2_id[i] * (X[teamB][i] - X[teamA][i]))
+                    self.PSI2 * r1_id[i] * (X[teamD][i] - X[teamA][i]) +
+                    self.PSI2 * r2_id[i] * (X[teamB][i] - X[teamA][i]))
 
         for i in range(self.n):
             if nextA[i] > self.max_xi:
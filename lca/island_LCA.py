@@ -0,0 +1,178 @@
+"""
+island model of the vectorized LCA.
+
+several leagues (islands) of a vectorized LCA module run in separate
+processes and every migration_interval weeks send copies of their best
+teams to their neighbour islands, where they replace the worst teams.
+this uses more cores without making a season longer, which a single league
+with a large L would.
+
+settings, read from LCA_parameters.json:
+    islands             number of leagues, default 4
+    migration_interval  weeks between two migrations, default 10
+    migrants            best teams sent to every neighbour, default 1
+    topology            "ring" (to the next island) or "all", default "ring"
+    island_algorithm    vectorized LCA module of the islands, default "MO_LCA"
+"""
+import importlib
+import queue
+import time
+import multiprocessing as mp
+
+import numpy as np
+
+from stopping import StoppingRules
+from util import (export_results, get_seed, read_lca_parameters,
+                  shared_config_arrays, spawn_rngs, write_fitness_log)
+
+LOG_FILE = "island_LCA.txt"
+TOPOLOGIES = ("ring", "all")
+
+
+def neighbours(index, islands, topology):
+    """Islands that island index sends its migrants to."""
+    if topology not in TOPOLOGIES:
+        raise ValueError(
+            f"topology must be one of {TOPOLOGIES}, got {topology!r}")
+    if topology == "ring":
+        return [(index + 1) % islands] if islands > 1 else []
+    return [j for j in range(islands) if j != index]
+
+
+def _island(index, algorithm_name, rng, inboxes, results, settings):
+    """Runs one island league, migrating every migration_interval weeks."""
+    islands = settings["islands"]
+    topology = settings["topology"]
+    targets = neighbours(index, islands, topology)
+    senders = [j for j in range(islands)
+               if index in neighbours(j, islands, topology)]
+
+    module = importlib.import_module(algorithm_name)
+    module.load()
+    # an island that stopped early would leave its neighbours waiting for
+    # its migrants, so every island plays all seasons
+    lca = module.build(rng=rng, path_w=None, stopping=StoppingRules())
+
+    start_time = time.time()
+    lca.start_league()
+    times = [time.time() - start_time]
+    migration_weeks = []
+    while not lca.finished():
+        lca.step()
+        times.append(time.time() - start_time)
+        if lca.t % settings["migration_interval"] == 0 and not lca.finished():
+            teams, f_teams = lca.emigrants(settings["migrants"])
+            for target in targets:
+                inboxes[target].put((index, teams, f_teams))
+            # every island migrates at the same weeks, so waiting for all
+            # senders keeps the islands in step and the runs reproducible
+            incoming = sorted((inboxes[index].get() for _ in senders),
+                              key=lambda message: message[0])
+            if incoming:
+                lca.immigrate(
+                    np.concatenate([message[1] for message in incoming]),
+                    np.concatenate([message[2] for message in incoming]))
+            migration_weeks.append(lca.t)
+    B = lca.finish_league()
+
+    fitness = [lca.calc_fitness(team) for team in B]
+    best = int(np.argmin(fitness))
+    results.put({
+        "island": index,
+        "team": B[best],
+        "fitness": float(fitness[best]),
+        "run_time": times[-1],
+        "migrations": len(migration_weeks),
+        "migration_weeks": migration_weeks,
+        "f_bList": [float(f) for f in lca.f_bList],
+        "times": times,
+    })
+
+
+def island_settings():
+    """Reads the island model settings from LCA_parameters.json."""
+    params = read_lca_parameters()
+    return {
+        "islands": params.get("islands", 4),
+        "migration_interval": params.get("migration_interval", 10),
+        "migrants": params.get("migrants", 1),
+        "topology": params.get("topology", "ring"),
+        "algorithm": params.get("island_algorithm", "MO_LCA"),
+    }
+
+
+def run_islands(algorithm_name, islands=4, migration_interval=10, migrants=1,
+                topology="ring", seed=None):
+    """
+    Runs the islands of a vectorized LCA module, one process each.
+
+    Args:
+        algorithm_name (str): vectorized LCA module, e.g. "MO_LCA"
+        islands (int): number of leagues
+        migration_interval (int): weeks between two migrations
+        migrants (int): best teams sent to every neighbour
+        topology (str): "ring" or "all"
+        seed (int): base seed, every island gets its own spawned stream
+
+    Returns:
+        list: the result of every island, ordered by island
+    """
+    neighbours(0, islands, topology)
+    settings = {"islands": islands, "migration_interval": migration_interval,
+                "migrants": migrants, "topology": topology}
+
+    inboxes = [mp.Queue() for _ in range(islands)]
+    results_queue = mp.Queue()
+    processes = [
+        mp.Process(target=_island,
+                   args=(index, algorithm_name, rng, inboxes, results_queue,
+                         settings))
+        for index, rng in enumerate(spawn_rngs(seed, islands))
+    ]
+    for process in processes:
+        process.start()
+
+    results = []
+    while len(results) < islands:
+        try:
+            results.append(results_queue.get(timeout=1))
+        except queue.Empty:
+            if any(process.exitcode not in (None, 0) for process in processes):
+                for process in processes:
+                    process.terminate()
+                raise RuntimeError("an island process failed")
+    for process in processes:
+        process.join()
+
+    return sorted(results, key=lambda result: result["island"])
+
+
+def run():
+    settings = island_settings()
+    algorithm_name = settings.pop("algorithm")
+    module = importlib.import_module(algorithm_name)
+    module.load()
+
+    start_time = time.time()
+    # the islands attach to one copy of the config arrays
+    with shared_config_arrays():
+        results = run_islands(algorithm_name, seed=get_seed(), **settings)
+    running_time = time.time() - start_time
+    print(f"Time taken: {running_time:.4f} sec")
+
+    # best fitness over all islands, week by week
+    write_fitness_log(LOG_FILE, np.min(
+        [result["f_bList"] for result in results], axis=0).tolist())
+
+    winner = min(results, key=lambda result: result["fitness"])
+    lca = module.build(path_w=None)
+    stats = [{key: value for key, value in result.items()
+              if key not in ("team", "f_bList", "times", "migration_weeks")}
+             for result in results]
+    export_results("island_LCA", [winner["team"]], lca.calc_fitness,
+                   module.original_indices, running_time,
+                   extra={"islands": stats, "best_island": winner["island"]})
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,163 @@
+"""
+compiled fitness kernels for the LCA variants.
+
+the kernels are plain loops over teams and cloudlets, compiled with numba
+when it is installed. without numba they still run as regular python,
+but the LCA classes fall back to their numpy implementations instead,
+see resolve_backend.
+"""
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+BACKENDS = ("numpy", "jit")
+
+
+def resolve_backend(backend):
+    """
+    Validates a backend name and falls back to "numpy" when "jit" is
+    requested but numba is not installed.
+
+    Args:
+        backend (str): "numpy" or "jit"
+
+    Returns:
+        str: the backend that will actually be used
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"backend must be one of {BACKENDS}, got {backend!r}")
+    if backend == "jit" and not NUMBA_AVAILABLE:
+        print("numba is not installed, falling back to the numpy backend")
+        return "numpy"
+    return backend
+
+
+def _jit(func):
+    if NUMBA_AVAILABLE:
+        return numba.njit(cache=True)(func)
+    return func
+
+
+@_jit
+def time_shared_vm_makespans(X, cloudlet_lengths, vm_mips, vm_pes, vm_degree,
+                             context_switch_overhead=0.0):
+    """
+    Time-shared per-VM makespans of a population.
+
+    Args:
+        X (ndarray): int population of shape (L, n)
+        cloudlet_lengths (ndarray): float lengths, shape (n,)
+        vm_mips, vm_pes, vm_degree (ndarray): per-VM arrays, shape (V,)
+
+    Returns:
+        ndarray: per-VM makespans of shape (L, V)
+    """
+    num_teams, n = X.shape
+    num_vms = vm_mips.shape[0]
+    vm_makespans = np.zeros((num_teams, num_vms))
+    sums = np.zeros(num_vms)
+    counts = np.zeros(num_vms, dtype=np.int64)
+    max_lengths = np.zeros(num_vms)
+
+    for l in range(num_teams):
+        sums[:] = 0.0
+        counts[:] = 0
+        max_lengths[:] = 0.0
+        for i in range(n):
+            vm = X[l, i]
+            length = cloudlet_lengths[i]
+            sums[vm] += length
+            counts[vm] += 1
+            if length > max_lengths[vm]:
+                max_lengths[vm] = length
+        for vm in range(num_vms):
+            if counts[vm] <= vm_pes[vm]:
+                vm_makespans[l, vm] = max_lengths[vm] / vm_mips[vm]
+            else:
+                vm_makespans[l, vm] = sums[vm] / (vm_mips[vm] * vm_degree[vm]) \
+                    + context_switch_overhead
+    return vm_makespans
+
+
+@_jit
+def space_shared_vm_makespans(X, cloudlet_lengths, vm_mips, vm_pes):
+    """
+    Space-shared per-VM makespans of a population: every cloudlet, in
+    cloudlet order, runs on the PE of its VM that becomes free first.
+
+    Args:
+        X (ndarray): int population of shape (L, n)
+        cloudlet_lengths (ndarray): float lengths, shape (n,)
+        vm_mips, vm_pes (ndarray): per-VM arrays, shape (V,)
+
+    Returns:
+        ndarray: per-VM makespans of shape (L, V)
+    """
+    num_teams, n = X.shape
+    num_vms = vm_mips.shape[0]
+    vm_makespans = np.zeros((num_teams, num_vms))
+
+    # PE finish times of all VMs laid out back to back
+    pe_offsets = np.zeros(num_vms + 1, dtype=np.int64)
+    for vm in range(num_vms):
+        pe_offsets[vm + 1] = pe_offsets[vm] + vm_pes[vm]
+    pe_times = np.zeros(pe_offsets[num_vms])
+
+    for l in range(num_teams):
+        pe_times[:] = 0.0
+        for i in range(n):
+            vm = X[l, i]
+            best = pe_offsets[vm]
+            for pe in range(pe_offsets[vm] + 1, pe_offsets[vm + 1]):
+                if pe_times[pe] < pe_times[best]:
+                    best = pe
+            pe_times[best] += cloudlet_lengths[i] / vm_mips[vm]
+        for vm in range(num_vms):
+            finish = 0.0
+            for pe in range(pe_offsets[vm], pe_offsets[vm + 1]):
+                if pe_times[pe] > finish:
+                    finish = pe_times[pe]
+            vm_makespans[l, vm] = finish
+    return vm_makespans
+
+
+@_jit
+def vm_cost(vm_makespans, vm_cost_coef, p_active, p_idle, re_ut=0.8):
+    """
+    Running cost of every team from its per-VM makespans.
+
+    Args:
+        vm_makespans (ndarray): per-VM makespans of shape (L, V)
+        vm_cost_coef (ndarray): per-VM cost coefficients, shape (V,)
+
+    Returns:
+        ndarray: total cost of every team, shape (L,)
+    """
+    num_teams, num_vms = vm_makespans.shape
+    total_cost = np.zeros(num_teams)
+
+    for l in range(num_teams):
+        makespan = 0.0
+        for vm in range(num_vms):
+            if vm_makespans[l, vm] > makespan:
+                makespan = vm_makespans[l, vm]
+
+        energy_sum = 0.0
+        energy_max = -np.inf
+        energy_min = np.inf
+        for vm in range(num_vms):
+            energy = (p_active * vm_makespans[l, vm] +
+                      p_idle * (makespan - vm_makespans[l, vm])) * vm_cost_coef[vm]
+            energy_sum += energy
+            energy_max = max(energy_max, energy)
+            energy_min = min(energy_min, energy)
+
+        act = (energy_max - energy_min) * re_ut + energy_min
+        total_cost[l] = energy_sum + act
+    return total_cost
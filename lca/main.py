@@ -1,14 +1,24 @@
 import importlib
 import sys
 
+from util import get_seed, read_run_config
+
 
 def run_algorithm(algorithm_name):
     """Run the selected algorithm"""
 
+    run_config = read_run_config()
+    restarts = run_config.get("restarts", 1)
+
     try:
         # Dynamically import and run the module
         module = importlib.import_module(f"{algorithm_name}")
-        module.run()
+        if restarts > 1 and hasattr(module, "build"):
+            from multistart import run_multistart
+            run_multistart(algorithm_name, restarts,
+                           workers=run_config.get("workers"), seed=get_seed())
+        else:
+            module.run()
     except ImportError:
         print(
             f"Error: Algorithm '{algorithm_name}' not found in this directory")
@@ -3,17 +3,23 @@ import time
 from collections import defaultdict
 import os
 import sys
+
+import numpy as np
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
 sys.path.append(parent_dir)
 
-from lca.util import get_config, get_cost_config, sort_vms, get_solution, export_results  # nopep8
+from lca.util import get_config, get_cost_config, get_host_array, get_seed, make_rng, read_lca_parameters, sort_vms, get_solution, export_results  # nopep8
 from lca.dev import LeagueChampionshipAlgorithm  # nopep8
+from lca.problem import ProblemInstance  # nopep8
+from lca.warm_start import warm_start_teams  # nopep8
+from lca import jit_kernels  # nopep8
 
 
 vms = list()
 cloudlets = list()
 cost_config = {}
+problem = None
 
 
 class makespan_LCA(LeagueChampionshipAlgorithm):
@@ -22,15 +28,62 @@ class makespan_LCA(LeagueChampionshipAlgorithm):
 
     Extends the base LCA to optimize cloudlet-to-VM assignments for minimal makespan
     (total completion time).
+
+    Args:
+        problem (ProblemInstance): the problem data, see problem.py
+        backend (str): "numpy" (default) for the reference implementation or
+            "jit" for the numba compiled kernels, falls back to "numpy" when
+            numba is missing
     """
 
+    def __init__(self, *args, problem, backend="numpy", **kwargs):
+        self.problem = problem
+        self.backend = jit_kernels.resolve_backend(backend)
+        super().__init__(*args, **kwargs)
+
     def configure(self):
+        problem = self.problem
+        # plain lists of the problem arrays, indexed per cloudlet in the loops
+        self.lengths = problem.cloudlet_lengths.tolist()
+        self.vm_mips_list = problem.vm_mips.tolist()
+        self.vm_pes_list = problem.vm_pes.tolist()
+        self.vm_degree_list = problem.vm_degree.tolist()
+
         self.makespan = self.makespan_time_shared
         if self.mode == "space":
             self.makespan = self.makespan_space_shared
+        if self.backend == "jit":
+            self.configure_jit()
 
         self.calc_fitness = self.makespan
 
+    def configure_jit(self):
+        """Builds the arrays used by the compiled kernels."""
+        problem = self.problem
+        self.vm_mips = problem.vm_mips
+        self.vm_pes = problem.vm_pes
+        self.vm_degree = problem.vm_degree
+        self.cloudlet_lengths = problem.cloudlet_lengths
+
+        self.makespan = self.makespan_time_shared_jit
+        if self.mode == "space":
+            self.makespan = self.makespan_space_shared_jit
+
+    def makespan_space_shared_jit(self, x):
+        """Compiled equivalent of makespan_space_shared."""
+        vm_makespans = jit_kernels.space_shared_vm_makespans(
+            np.asarray(x, dtype=np.int64)[np.newaxis, :],
+            self.cloudlet_lengths, self.vm_mips, self.vm_pes)
+        return float(np.max(vm_makespans))
+
+    def makespan_time_shared_jit(self, x, context_switch_overhead=0.0):
+        """Compiled equivalent of makespan_time_shared."""
+        vm_makespans = jit_kernels.time_shared_vm_makespans(
+            np.asarray(x, dtype=np.int64)[np.newaxis, :],
+            self.cloudlet_lengths, self.vm_mips, self.vm_pes,
+            self.vm_degree, context_switch_overhead)
+        return float(np.max(vm_makespans))
+
     def makespan_space_shared(self, x):
         """
         Calculate makespan (total completion time) for cloudlet-to-VM scheduling using space shared method.
@@ -43,17 +96,17 @@ class makespan_LCA(LeagueChampionshipAlgorithm):
             int : Makespan value for the solution x
         """
 
+        lengths, vm_mips, vm_pes = self.lengths, self.vm_mips_list, self.vm_pes_list
+
         # vm_index -> min-heap of CPU end times
         vm_cpu_queues = defaultdict(list)
 
         for i, vm_index in enumerate(x):
             vm_index = int(vm_index)
-            cloudlet = cloudlets[i]
-            vm = vms[vm_index]
-            ext = cloudlet["length"] / vm["vm_mips"]
+            ext = lengths[i] / vm_mips[vm_index]
 
             # If VM has free CPUs, start immediately
-            if len(vm_cpu_queues[vm_index]) < vm["vm_pes"]:
+            if len(vm_cpu_queues[vm_index]) < vm_pes[vm_index]:
                 heapq.heappush(vm_cpu_queues[vm_index], ext)
             else:
                 # Wait for the earliest available CPU
@@ -82,21 +135,19 @@ class makespan_LCA(LeagueChampionshipAlgorithm):
         for i, vm_index in enumerate(x):
             vm_tasks[int(vm_index)].append(i)
 
-        vm_makespans = [0] * len(vms)
+        vm_makespans = [0] * self.problem.num_vms
+        lengths = self.lengths
         for vm_index, task_indices in vm_tasks.items():
-            vm = vms[vm_index]
-            vm_pes = vm["vm_pes"]
-            vm_mips = vm["vm_mips"]
+            vm_pes = self.vm_pes_list[vm_index]
+            vm_mips = self.vm_mips_list[vm_index]
 
             if len(task_indices) <= vm_pes:
-                vm_makespan = max(cloudlets[i]["length"]
-                                  for i in task_indices) / vm_mips
+                vm_makespan = max(lengths[i] for i in task_indices) / vm_mips
             else:
-                total_length = sum(cloudlets[i]["length"]
-                                   for i in task_indices)
+                total_length = sum(lengths[i] for i in task_indices)
                 total_exec = total_length / vm_mips
                 # adjust 0.99 to relate to the number of cloudlets
-                degree = vm_pes * (0.985 ** vm_pes)
+                degree = self.vm_degree_list[vm_index]
                 vm_makespan = (
                     total_exec/degree) + context_switch_overhead
             vm_makespans[vm_index] = vm_makespan
@@ -104,19 +155,43 @@ class makespan_LCA(LeagueChampionshipAlgorithm):
         return max(vm_makespans)
 
 
-def run():
-    global n, vms, cloudlets
+LOG_FILE = "Makespan_LCA.txt"
+
+
+def load():
+    """Loads the simulation config into the module level problem data."""
+    global n, vms, cloudlets, cost_config, mode, original_indices, hosts, problem
     n, vms, cloudlets, mode = get_config()
+    hosts = get_host_array()
     cost_config = get_cost_config()
     vms, original_indices = sort_vms(vms)
+    problem = ProblemInstance.load()
+
+
+def build(rng=None, path_w=LOG_FILE, **params):
+    """
+    Creates the makespan_LCA league for the loaded problem data, params
+    (L, S, p_c, PSI1, PSI2, q0) override LCA_parameters.json. Part of the
+    league starts from the "warm_start" sources, see warm_start.py.
+    """
+    params.setdefault("seed_teams", warm_start_teams(
+        vms, cloudlets, original_indices, mode, hosts=hosts))
+    backend = read_lca_parameters().get("backend", "numpy")
+    return makespan_LCA(n=n, max_xi=len(vms)-1, path_w=path_w, mode=mode,
+                        backend=backend, problem=problem, rng=rng, **params)
+
+
+def run():
+    load()
     start_time = time.time()
-    lca = makespan_LCA(n=n, max_xi=len(
-        vms)-1, path_w="Makespan_LCA.txt", mode=mode)
+    lca = build(make_rng(get_seed()))
     best = lca.league()
-    running_tme = time.time() - start_time
-    print(f"Time taken: {running_tme:.4f} sec")
+    running_time = time.time() - start_time
+    print(f"Time taken: {running_time:.4f} sec")
     export_results("makespan_LCA", best, lca.calc_fitness,
-                   original_indices, running_tme)
+                   original_indices, running_time,
+                   extra={"stop_reason": lca.stop_reason,
+                          "weeks": len(lca.f_bList)})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+"""
+multi-start runner for the LCA algorithms.
+
+runs several independent leagues of one LCA module on a process pool and
+keeps the best schedule. every worker process attaches to the config arrays
+published once by util.shared_config_arrays and reuses them for all the
+restarts it is given.
+"""
+import importlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from util import export_results, shared_config_arrays, spawn_rngs, write_fitness_log
+
+_module = None
+
+
+def _init_worker(algorithm_name):
+    """Imports the LCA module and loads its problem data once per worker."""
+    global _module
+    _module = importlib.import_module(algorithm_name)
+    _module.load()
+
+
+def _run_restart(index, rng):
+    """Runs one league and returns its best team with its statistics."""
+    start_time = time.time()
+    lca = _module.build(rng=rng, path_w=None)
+    B = lca.league()
+    fitness = [lca.calc_fitness(team) for team in B]
+    best = int(np.argmin(fitness))
+    return {
+        "restart": index,
+        "team": B[best],
+        "fitness": float(fitness[best]),
+        "run_time": time.time() - start_time,
+        "weeks": len(lca.f_bList),
+        "stop_reason": lca.stop_reason,
+        "f_bList": [float(f) for f in lca.f_bList],
+    }
+
+
+def run_multistart(algorithm_name, restarts, workers=None, seed=None):
+    """
+    Runs restarts independent leagues of an LCA module and exports the best
+    schedule together with per-restart statistics.
+
+    Args:
+        algorithm_name (str): LCA module name, e.g. "MO_LCA"
+        restarts (int): number of independent leagues
+        workers (int): worker processes, defaults to os.cpu_count()
+        seed (int): base seed, every restart gets its own spawned stream
+    """
+    module = importlib.import_module(algorithm_name)
+    module.load()
+
+    start_time = time.time()
+    with shared_config_arrays(), \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(algorithm_name,)) as executor:
+        results = list(executor.map(_run_restart, range(restarts),
+                                    spawn_rngs(seed, restarts)))
+    running_time = time.time() - start_time
+    print(f"Time taken: {running_time:.4f} sec")
+
+    winner = min(results, key=lambda result: result["fitness"])
+    write_fitness_log(module.LOG_FILE, winner["f_bList"])
+
+    # fitness of the exported schedule is recomputed on a fresh instance
+    lca = module.build(path_w=None)
+    stats = [{key: value for key, value in result.items()
+              if key not in ("team", "f_bList")} for result in results]
+    export_results(algorithm_name, [winner["team"]], lca.calc_fitness,
+                   module.original_indices, running_time,
+                   extra={"restarts": stats,
+                          "best_restart": winner["restart"]})
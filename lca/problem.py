@@ -0,0 +1,166 @@
+"""
+precomputed problem data of the scheduling objectives.
+
+ProblemInstance derives once, from sim_config.json and sim_cost_config.json,
+what the objectives would otherwise recompute on every call:
+    original_indices    original index of every VM in sorted order (sort_vms)
+    vm_mips, vm_pes     of the sorted VMs, vm_mips is already slowed down by
+                        host contention, see util.host_mips_share
+    vm_degree           time-shared degree vm_pes * 0.985 ** vm_pes
+    vm_cost_coef        CostPerSecond * mips ** (1 + x) * pes / (1000 * p_u ** (1 + x))
+                        with the nominal mips, the price of a VM second
+    cloudlet_lengths    float64 lengths of the cloudlets
+    parallel_exec_times (cloudlets, VMs) length / (vm_mips * vm_pes), for PSO
+ProblemInstance.load() keeps them under configs/cache/<key>/, where key is a
+hash of both config files and FORMAT_VERSION, so later runs on the same
+configs memory map them instead of deriving them again. the matrix is only
+built, and saved, the first time it is used.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from lca import util
+
+ARRAYS = ("original_indices", "vm_mips", "vm_pes", "vm_degree",
+          "vm_cost_coef", "cloudlet_lengths")
+# cached instances kept on disk, the least recently used ones are removed
+KEEP_INSTANCES = 8
+# part of the cache key, bump it whenever the derived arrays change, e.g.
+# util.host_mips_share or the vm_cost_coef formula, so no stale cache is read
+FORMAT_VERSION = 1
+
+_keys = {}
+
+
+def config_key():
+    """
+    sha256 of FORMAT_VERSION, sim_config.json and sim_cost_config.json,
+    reused while the mtimes and sizes of both files are unchanged.
+    """
+    paths = [os.path.join(util.CONFIGS_DIR, name)
+             for name in ("sim_config.json", "sim_cost_config.json")]
+    stats = tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size)
+                  for path in paths)
+    if _keys.get(tuple(paths), (None,))[0] != stats:
+        digest = hashlib.sha256(f"problem-v{FORMAT_VERSION}\n".encode())
+        for path in paths:
+            with open(path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+        _keys[tuple(paths)] = (stats, digest.hexdigest()[:32])
+    return _keys[tuple(paths)][1]
+
+
+class ProblemInstance(object):
+    """
+    Per-VM and per-cloudlet arrays of one scheduling problem, see the module
+    docstring. Build it with from_config for problem data in memory or
+    load() for the config files.
+
+    Attributes:
+        mode (str): "time" or "space" shared VMs
+        cost_config (dict): as in sim_cost_config.json
+        directory (str): cache directory, None when not cached
+    """
+
+    def __init__(self, arrays, mode, cost_config, directory=None):
+        self.mode = mode
+        self.cost_config = cost_config
+        self.directory = directory
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.num_vms = len(self.vm_mips)
+        self.n = len(self.cloudlet_lengths)
+        self._matrices = {}
+
+    @classmethod
+    def from_config(cls, vms, cloudlets, cost_config, mode="time", hosts=None,
+                    original_indices=None):
+        """
+        Args:
+            vms: VM dicts or structured array, in sorted order
+            cloudlets: cloudlet dicts or structured array
+            cost_config (dict): as in sim_cost_config.json
+            hosts: the hosts of the VMs, or None
+            original_indices (list): of the sorted VMs, defaults to their order
+        """
+        vm_mips = np.array(util.get_column(vms, "vm_mips"), dtype=float)
+        vm_pes = np.array(util.get_column(vms, "vm_pes"))
+        power_x = 1 + cost_config["x"]
+        if original_indices is None:
+            original_indices = range(len(vm_mips))
+        return cls({
+            "original_indices": np.array(original_indices, dtype=np.int64),
+            "vm_mips": vm_mips * util.host_mips_share(vms, hosts),
+            "vm_pes": vm_pes,
+            "vm_degree": vm_pes * (0.985 ** vm_pes),
+            "vm_cost_coef": cost_config["CostPerSecond"] * (vm_mips ** power_x) *
+            vm_pes / (1000 * (cost_config["p_u"] ** power_x)),
+            "cloudlet_lengths": np.asarray(
+                util.get_column(cloudlets, "length"), dtype=float),
+        }, mode, cost_config)
+
+    @classmethod
+    def load(cls):
+        """
+        The instance of the current config files, from configs/cache/ when
+        it was derived before, else derived and saved there.
+        """
+        cache_dir = os.path.join(util.CONFIGS_DIR, "cache")
+        directory = os.path.join(cache_dir, config_key())
+        meta_path = os.path.join(directory, "problem.json")
+        if os.path.exists(meta_path):
+            os.utime(meta_path)
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"),
+                                    mmap_mode="r") for name in ARRAYS}
+            meta = util.read_json(meta_path)
+            return cls(arrays, meta["mode"], meta["cost_config"], directory)
+
+        _, vms, cloudlets, mode = util.get_config_arrays()
+        vms, original_indices = util.sort_vms(vms)
+        cost_config = util.get_cost_config()
+        problem = cls.from_config(vms, cloudlets, cost_config, mode,
+                                  util.get_host_array(), original_indices)
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAYS:
+            array = getattr(problem, name)
+            util.save_atomic(os.path.join(directory, f"{name}.npy"),
+                             lambda file: np.save(file, array))
+        # written last, the arrays are only read from complete directories
+        util.save_atomic(meta_path, lambda file: file.write(
+            json.dumps({"mode": mode, "cost_config": cost_config}).encode()))
+        problem.directory = directory
+        _prune(cache_dir)
+        return problem
+
+    @property
+    def parallel_exec_times(self):
+        return self._matrix("parallel_exec_times", lambda: self.cloudlet_lengths[:, np.newaxis] /
+                            (self.vm_mips * self.vm_pes))
+
+    def _matrix(self, name, build):
+        if name not in self._matrices:
+            path = self.directory and os.path.join(self.directory, f"{name}.npy")
+            if path and os.path.exists(path):
+                matrix = np.load(path, mmap_mode="r")
+            else:
+                matrix = build()
+                if path:
+                    util.save_atomic(path, lambda file: np.save(file, matrix))
+            self._matrices[name] = matrix
+        return self._matrices[name]
+
+
+def _prune(cache_dir):
+    """Keeps the KEEP_INSTANCES most recently used instances."""
+    entries = []
+    for key in os.listdir(cache_dir):
+        meta_path = os.path.join(cache_dir, key, "problem.json")
+        if os.path.exists(meta_path):
+            entries.append((os.stat(meta_path).st_mtime_ns, key))
+    for _, key in sorted(entries, reverse=True)[KEEP_INSTANCES:]:
+        shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
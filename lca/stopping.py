@@ -0,0 +1,70 @@
+"""early stopping rules of the LCA leagues, shared by both engines."""
+import time
+
+
+class StoppingRules(object):
+    """
+    Rules that end a league before its last season. Every rule is off when
+    its setting is None, a league without rules plays all S * (L - 1) weeks.
+
+    Args:
+        stall_weeks (int): stop when f_best has not improved for this many weeks
+        min_improvement (float): stop when f_best improved by less than this
+            fraction over the last improvement_window weeks
+        improvement_window (int): weeks min_improvement is measured over,
+            defaults to one season (L - 1 weeks)
+        time_budget (float): stop after this many seconds
+        max_evaluations (int): stop once this many teams have been evaluated
+    """
+
+    KEYS = ("stall_weeks", "min_improvement", "improvement_window",
+            "time_budget", "max_evaluations")
+
+    def __init__(self, stall_weeks=None, min_improvement=None,
+                 improvement_window=None, time_budget=None,
+                 max_evaluations=None):
+        self.stall_weeks = stall_weeks
+        self.min_improvement = min_improvement
+        self.improvement_window = improvement_window
+        self.time_budget = time_budget
+        self.max_evaluations = max_evaluations
+        self.start_time = None
+
+    @classmethod
+    def from_parameters(cls, params):
+        """Reads the rules from LCA parameters, e.g. LCA_parameters.json."""
+        return cls(**{key: params.get(key) for key in cls.KEYS})
+
+    def start(self):
+        self.start_time = time.time()
+
+    def check(self, f_bList, evaluations, season_weeks):
+        """
+        Checks the rules after a week.
+
+        Args:
+            f_bList (list): best fitness of every week played so far
+            evaluations (int): teams evaluated so far
+            season_weeks (int): weeks in one season, L - 1
+
+        Returns:
+            str: the reason to stop, "stall", "min_improvement",
+            "time_budget" or "evaluation_budget", or None to go on
+        """
+        weeks = len(f_bList)
+        if self.stall_weeks is not None and weeks > self.stall_weeks \
+                and f_bList[-1] >= f_bList[-1 - self.stall_weeks]:
+            return "stall"
+        if self.min_improvement is not None:
+            window = self.improvement_window or season_weeks
+            if weeks > window:
+                previous = f_bList[-1 - window]
+                if previous - f_bList[-1] < self.min_improvement * abs(previous):
+                    return "min_improvement"
+        if self.time_budget is not None \
+                and time.time() - self.start_time >= self.time_budget:
+            return "time_budget"
+        if self.max_evaluations is not None \
+                and evaluations >= self.max_evaluations:
+            return "evaluation_budget"
+        return None
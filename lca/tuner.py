@@ -0,0 +1,223 @@
+"""
+successive halving search over the LCA parameters.
+
+instead of running every (L, p_c, PSI1, PSI2, q0) combination of a grouped
+run configuration for the full number of seasons, every candidate league
+plays a few seasons, only the best 1/eta of them keep playing eta times as
+many seasons, and so on until one candidate is left or the largest S is
+reached. a promoted league resumes where it stopped, so the f_best
+trajectory of the earlier rungs is reused instead of being computed again.
+
+the budget of a rung is counted in evaluated teams, not weeks: a season of
+the largest candidate league, times the seasons of the rung. a league of
+fewer teams plays more weeks for the same budget, so candidates of
+different L are compared after the same amount of work.
+
+settings, read from run_config.json:
+    L, p_c, PSI1, PSI2, q0  with their *_type ("range" or "single"), the
+                            same grid the backend sweeps
+    S                       the largest S of the grid is the season budget
+    eta                     promotion factor, default 3
+    min_seasons             seasons of the first rung, by default chosen so
+                            the last candidate plays the full budget
+    tune_algorithm          vectorized LCA module to tune, default "MO_LCA"
+
+the ranking is written to results/tuning_result.json.
+"""
+import importlib
+import itertools
+import json
+import math
+import os
+import time
+
+from stopping import StoppingRules
+from util import get_output_dir, get_seed, read_run_config, spawn_rngs
+
+PARAMETERS = ("L", "p_c", "PSI1", "PSI2", "q0")
+RESULT_FILE = "tuning_result.json"
+
+
+def parse_range_or_single(value_type, value):
+    """Values of one parameter, same as parseRangeOrSingle in the backend."""
+    if value_type == "single":
+        return [value]
+    if value_type != "range":
+        raise ValueError(
+            f"type must be 'range' or 'single', got {value_type!r}")
+    start, stop, step = value["from"], value["to"], value["step"]
+    if any(not float(v).is_integer() for v in (start, stop, step)):
+        step, stop = round(step, 6), round(stop, 6)
+    values = []
+    current = start
+    while current <= stop:
+        values.append(round(current, 6))
+        current += step
+    return values
+
+
+def grid_from_run_config(run_config):
+    """
+    Candidates and season budget of a grouped run configuration.
+
+    Returns:
+        tuple: (candidates, seasons), every candidate is a dict of the
+        PARAMETERS, seasons are the S values of the grid
+    """
+    values = [parse_range_or_single(run_config[f"{name}_type"], run_config[name])
+              for name in PARAMETERS]
+    candidates = [dict(zip(PARAMETERS, combination))
+                  for combination in itertools.product(*values)]
+    seasons = parse_range_or_single(run_config["S_type"], run_config["S"])
+    return candidates, seasons
+
+
+def league_weeks(L, seasons):
+    """Weeks a league of L teams plays in the given number of seasons."""
+    return seasons * (L + L % 2 - 1)
+
+
+def league_evaluations(L, seasons):
+    """Teams a league of L teams evaluates in the given number of seasons."""
+    return league_weeks(L, seasons) * (L + L % 2)
+
+
+def season_evaluations(candidates):
+    """Teams evaluated in one season of the largest candidate league."""
+    return max(league_evaluations(params["L"], 1) for params in candidates)
+
+
+def full_run_parameters(params, evaluations):
+    """
+    LCA parameters of a full league of params that plays the evaluation
+    budget it was ranked at: enough seasons and max_evaluations.
+    """
+    return {**params,
+            "S": math.ceil(evaluations / league_evaluations(params["L"], 1)),
+            "max_evaluations": evaluations}
+
+
+def default_min_seasons(candidates, max_seasons, eta):
+    """Seasons of the first rung so that the last candidate plays max_seasons."""
+    rungs = 0
+    remaining = candidates
+    while remaining > 1:
+        remaining = max(1, remaining // eta)
+        rungs += 1
+    return max(1, max_seasons // eta ** rungs)
+
+
+def successive_halving(algorithm_name, candidates, max_seasons, eta=3,
+                       min_seasons=None, seed=None):
+    """
+    Runs successive halving over the candidates of a vectorized LCA module.
+
+    Args:
+        algorithm_name (str): vectorized LCA module, e.g. "MO_LCA"
+        candidates (list): dicts of LCA parameters passed to build()
+        max_seasons (int): seasons of the last rung
+        eta (int): only the best len(candidates) // eta are promoted, and
+            they play eta times as many seasons
+        min_seasons (int): seasons of the first rung, a rung evaluates
+            its seasons times season_evaluations teams per league
+        seed (int): base seed, every candidate gets its own spawned stream
+
+    Returns:
+        dict: "ranking" of the candidates, best first, with the seasons and
+        evaluations they played and their last f_best, the "rungs" and the
+        teams evaluated by all leagues
+    """
+    if eta < 2:
+        raise ValueError(f"eta must be at least 2, got {eta}")
+    module = importlib.import_module(algorithm_name)
+    module.load()
+
+    leagues = []
+    for params, rng in zip(candidates, spawn_rngs(seed, len(candidates))):
+        # candidates are compared after the same number of seasons
+        lca = module.build(rng=rng, path_w=None, S=0,
+                           stopping=StoppingRules(), **params)
+        if not hasattr(lca, "start_league"):
+            raise ValueError(
+                f"{algorithm_name} can not be resumed, use a vectorized LCA")
+        lca.start_league()
+        leagues.append({"params": params, "lca": lca})
+
+    if min_seasons is None:
+        min_seasons = default_min_seasons(len(candidates), max_seasons, eta)
+    seasons = min(min_seasons, max_seasons)
+    per_season = season_evaluations(candidates)
+    alive = leagues
+    rungs = []
+    while True:
+        budget = seasons * per_season
+        for league in alive:
+            lca = league["lca"]
+            # only the evaluation budget ends the rung, the league resumes
+            # from its state in the next one
+            lca.S = float("inf")
+            lca.stopping.max_evaluations = budget
+            lca.stop_reason = None
+            while not lca.finished():
+                lca.step()
+            league["seasons"] = seasons
+            league["evaluations"] = lca.evaluations
+            league["f_best"] = float(lca.f_best)
+        alive = sorted(alive, key=lambda league: league["f_best"])
+        rungs.append({"seasons": seasons, "evaluations": budget,
+                      "candidates": len(alive),
+                      "best_f_best": alive[0]["f_best"]})
+        if len(alive) == 1 or seasons >= max_seasons:
+            break
+        alive = alive[:max(1, len(alive) // eta)]
+        seasons = min(max_seasons, seasons * eta)
+
+    promoted = {id(league) for league in alive}
+    ranking = alive + sorted(
+        (league for league in leagues if id(league) not in promoted),
+        key=lambda league: (-league["seasons"], league["f_best"]))
+    for league in leagues:
+        league["lca"].finish_league()
+
+    return {
+        "ranking": [{"params": league["params"], "seasons": league["seasons"],
+                     "evaluations": league["evaluations"],
+                     "f_best": league["f_best"]} for league in ranking],
+        "rungs": rungs,
+        "evaluations": sum(league["lca"].evaluations for league in leagues),
+    }
+
+
+def run():
+    run_config = read_run_config()
+    candidates, seasons = grid_from_run_config(run_config)
+    max_seasons = max(seasons)
+    algorithm_name = run_config.get("tune_algorithm", "MO_LCA")
+
+    start_time = time.time()
+    result = successive_halving(
+        algorithm_name, candidates, max_seasons,
+        eta=run_config.get("eta", 3),
+        min_seasons=run_config.get("min_seasons"), seed=get_seed())
+    running_time = time.time() - start_time
+    print(f"Time taken: {running_time:.4f} sec")
+
+    # teams the exhaustive sweep of the same grid would evaluate
+    grid_evaluations = sum(league_evaluations(params["L"], S)
+                           for params in candidates for S in seasons)
+    # the winner as it was ranked, at the budget of the last rung
+    best = full_run_parameters(result["ranking"][0]["params"],
+                               result["rungs"][-1]["evaluations"])
+    print(f"Evaluated {result['evaluations']} of {grid_evaluations} grid teams, "
+          f"best: {best}")
+
+    result.update({"algorithm": algorithm_name,
+                   "grid_evaluations": grid_evaluations, "best": best,
+                   "running_time": running_time})
+    file_path = os.path.join(get_output_dir(), "results", RESULT_FILE)
+    with open(file_path, "w") as f:
+        json.dump(result, f, indent=4)
+
+
+if __name__ == "__main__":
+    run()
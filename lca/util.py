@@ -1,27 +1,100 @@
+import contextlib
 import json
 import os
+import shutil
+import tempfile
+import weakref
 import numpy as np
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
 CONFIGS_DIR = os.path.abspath(os.path.join(BASE_DIR, "configs"))
 
+_json_cache = {}
+
+# names the directory of shared_config_arrays for the processes it starts
+SHARED_CONFIG_ENV = "LCA_SHARED_CONFIG"
+# (id(records), field) -> (weakref to records, shared contiguous column)
+_shared_columns = {}
+
+
+def read_json(path):
+    """
+    Reads a JSON file, reusing the parsed content while the file's mtime and
+    size are unchanged. Long-lived processes (run.py --job 4) read the same
+    configs for every job. The returned data is shared, do not modify it.
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != key:
+        with open(path, 'r') as file:
+            cached = (key, json.load(file))
+        _json_cache[path] = cached
+    return cached[1]
+
 
 def read_lca_parameters():
     """
     Reads LCA parameters from the given JSON file and returns them as a dictionary.
+    The LCA_PARAMETERS environment variable, a JSON object, takes precedence so
+    parallel sweep runs can each pass their own parameters.
     """
+    if os.environ.get("LCA_PARAMETERS"):
+        return json.loads(os.environ["LCA_PARAMETERS"])
     LCA_parameters_path = os.path.join(CONFIGS_DIR, "LCA_parameters.json")
-    with open(LCA_parameters_path, 'r') as file:
-        params = json.load(file)
+    return read_json(LCA_parameters_path)
+
+
+def read_run_config():
+    """
+    Reads the run configuration written by the backend for the current experiment,
+    returns an empty dictionary when there is none.
+    """
+    run_config_path = os.path.join(CONFIGS_DIR, "run_config.json")
+    if not os.path.exists(run_config_path):
+        return {}
+    return read_json(run_config_path)
+
+
+def get_seed():
+    """Returns the run-level "seed" from run_config.json, None when unset."""
+    return read_run_config().get("seed")
+
+
+def make_rng(seed=None):
+    """
+    Creates a PCG64 numpy Generator, seeded from entropy when seed is None.
+    """
+    return np.random.Generator(np.random.PCG64(seed))
+
+
+def spawn_rngs(seed, count):
+    """
+    Spawns count statistically independent PCG64 Generators from one seed,
+    one per parallel restart or worker.
+    """
+    return [np.random.Generator(np.random.PCG64(child))
+            for child in np.random.SeedSequence(seed).spawn(count)]
 
-    return params
+
+def get_output_dir():
+    """
+    Directory that schedules, results and fitness logs are written to: the
+    OUTPUT_DIR environment variable when set, e.g. one per sweep grid point,
+    the repository root otherwise.
+    """
+    output_dir = os.environ.get("OUTPUT_DIR")
+    if not output_dir:
+        return BASE_DIR
+    for sub_dir in ("results", "lca"):
+        os.makedirs(os.path.join(output_dir, sub_dir), exist_ok=True)
+    return os.path.abspath(output_dir)
 
 
 def get_config():
     sim_config_path = os.path.join(CONFIGS_DIR, "sim_config.json")
-    with open(sim_config_path, 'r') as file:
-        data = json.load(file)
+    data = read_json(sim_config_path)
     mode = data['mode']
     vms = data['vms']
     cloudlets = data['cloudlets']
@@ -31,12 +104,208 @@ def get_config():
     return n, vms, cloudlets, mode
 
 
+def records_to_array(records):
+    """
+    Converts a list of config dicts, e.g. the cloudlets, into a structured
+    array with one int64 or float64 field per key.
+    """
+    fields = list(records[0]) if records else []
+    dtype = [(field, np.float64 if any(isinstance(record[field], float)
+                                       for record in records) else np.int64)
+             for field in fields]
+    return np.array([tuple(record[field] for field in fields)
+                     for record in records], dtype=dtype)
+
+
+def save_atomic(path, write):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        write(file)
+    os.replace(temp_path, path)
+
+
+def write_config_arrays(config):
+    """
+    Writes the hosts, vms and cloudlets of a sim_config.json dict as
+    structured .npy files next to it, together with sim_config.arrays.json holding the
+    mode and the mtime and size of the JSON they were made from. Call it
+    after writing sim_config.json, the Java simulator keeps reading the JSON.
+    """
+    for name in ("hosts", "vms", "cloudlets"):
+        array = records_to_array(config[name])
+        save_atomic(os.path.join(CONFIGS_DIR, f"sim_config.{name}.npy"),
+                    lambda file: np.save(file, array))
+    stamp_config_arrays(config["mode"])
+
+
+def stamp_config_arrays(mode, configs_dir=None):
+    """
+    Marks the .npy files as made from the current sim_config.json, for
+    writers that produce both files themselves, e.g. the streaming generator.
+    """
+    configs_dir = configs_dir or CONFIGS_DIR
+    stat = os.stat(os.path.join(configs_dir, "sim_config.json"))
+    meta = {"mode": mode, "source": [stat.st_mtime_ns, stat.st_size]}
+    save_atomic(os.path.join(configs_dir, "sim_config.arrays.json"),
+                lambda file: file.write(json.dumps(meta).encode()))
+
+
+def get_config_arrays():
+    """
+    Columnar get_config: vms and cloudlets are structured arrays memory
+    mapped from the .npy files of write_config_arrays, so vms["vm_mips"] is
+    a typed column without parsing the JSON, while vms[i]["vm_mips"] still
+    reads like the dicts of get_config. The files are rebuilt from
+    sim_config.json when they are missing or older than it.
+    """
+    directory = _shared_config_dir()
+    if directory is None:
+        directory = CONFIGS_DIR
+        meta = _fresh_config_arrays()
+    else:
+        meta = read_json(os.path.join(directory, "sim_config.arrays.json"))
+    vms = np.load(os.path.join(directory, "sim_config.vms.npy"),
+                  mmap_mode="r")
+    cloudlets = np.load(os.path.join(directory, "sim_config.cloudlets.npy"),
+                        mmap_mode="r")
+    if directory != CONFIGS_DIR:
+        _share_column(cloudlets, "length", np.load(
+            os.path.join(directory, "sim_config.cloudlets.length.npy"),
+            mmap_mode="r"))
+    n = len(cloudlets)
+    print("number of vms:", len(vms))
+    print("number of cloudlets:", n)
+    return n, vms, cloudlets, meta["mode"]
+
+
+def _fresh_config_arrays():
+    """Rebuilds the .npy files when sim_config.json changed, returns their metadata."""
+    stat = os.stat(os.path.join(CONFIGS_DIR, "sim_config.json"))
+    meta_path = os.path.join(CONFIGS_DIR, "sim_config.arrays.json")
+    meta = read_json(meta_path) if os.path.exists(meta_path) else None
+    if meta is None or meta["source"] != [stat.st_mtime_ns, stat.st_size] or \
+            not os.path.exists(os.path.join(CONFIGS_DIR, "sim_config.hosts.npy")):
+        write_config_arrays(
+            read_json(os.path.join(CONFIGS_DIR, "sim_config.json")))
+        meta = read_json(meta_path)
+    return meta
+
+
+def get_host_array():
+    """The hosts of sim_config.json as a structured array, see get_config_arrays."""
+    directory = _shared_config_dir()
+    if directory is None:
+        directory = CONFIGS_DIR
+        _fresh_config_arrays()
+    return np.load(os.path.join(directory, "sim_config.hosts.npy"))
+
+
+@contextlib.contextmanager
+def shared_config_arrays():
+    """
+    Publishes the config arrays once for all processes started inside the
+    block, e.g. the --parallel algorithms, multi-start workers or islands.
+
+    The hosts, vms and cloudlets arrays and a contiguous float64 column of
+    the cloudlet lengths are written to a directory in /dev/shm (shared
+    memory on Linux, the temp directory elsewhere), which is exported as
+    LCA_SHARED_CONFIG. get_config_arrays of every process then memory maps
+    the same pages instead of checking and reading the config files, and
+    get_column(cloudlets, "length") returns the shared column, so MO_LCA
+    and the greedy schedulers do not copy the lengths. The directory is
+    removed at the end of the block, nested blocks reuse the outer one.
+
+    Yields:
+        str: the shared directory
+    """
+    if _shared_config_dir() is not None:
+        yield os.environ[SHARED_CONFIG_ENV]
+        return
+    meta = _fresh_config_arrays()
+    directory = tempfile.mkdtemp(
+        prefix="lca_config_", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    try:
+        for name in ("hosts", "vms", "cloudlets"):
+            shutil.copyfile(os.path.join(CONFIGS_DIR, f"sim_config.{name}.npy"),
+                            os.path.join(directory, f"sim_config.{name}.npy"))
+        lengths = np.load(os.path.join(directory, "sim_config.cloudlets.npy"),
+                          mmap_mode="r")["length"]
+        np.save(os.path.join(directory, "sim_config.cloudlets.length.npy"),
+                np.ascontiguousarray(lengths, dtype=np.float64))
+        # written last, a process only attaches to a complete directory
+        with open(os.path.join(directory, "sim_config.arrays.json"), "w") as file:
+            json.dump(meta, file)
+        os.environ[SHARED_CONFIG_ENV] = directory
+        yield directory
+    finally:
+        if os.environ.get(SHARED_CONFIG_ENV) == directory:
+            del os.environ[SHARED_CONFIG_ENV]
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _shared_config_dir():
+    """
+    The directory of shared_config_arrays, None when there is none or
+    sim_config.json changed since it was published.
+    """
+    directory = os.environ.get(SHARED_CONFIG_ENV)
+    if not directory:
+        return None
+    try:
+        source = read_json(os.path.join(directory, "sim_config.arrays.json"))["source"]
+        stat = os.stat(os.path.join(CONFIGS_DIR, "sim_config.json"))
+    except FileNotFoundError:
+        return None
+    if source != [stat.st_mtime_ns, stat.st_size]:
+        return None
+    return directory
+
+
+def _share_column(records, field, column):
+    key = (id(records), field)
+    _shared_columns[key] = (weakref.ref(records), column)
+    weakref.finalize(records, _shared_columns.pop, key, None)
+
+
+def host_mips_share(vms, hosts):
+    """
+    Fraction of its MIPS every VM gets from its host. A host time-shares its
+    PEs when the VMs packed on it ask for more MIPS than it has (see
+    pe_overcommit in config.py), slowing all of them down alike. VMs without
+    a "host" get their full MIPS.
+
+    Args:
+        vms: VM dicts or structured array, with "host" for multi-host configs
+        hosts: host dicts or structured array, or None
+
+    Returns:
+        ndarray: one factor in (0, 1] per VM
+    """
+    fields = vms.dtype.names if isinstance(vms, np.ndarray) and vms.dtype.names \
+        else (vms[0] if len(vms) else ())
+    if hosts is None or "host" not in fields:
+        return np.ones(len(vms))
+    vm_hosts = get_column(vms, "host")
+    demand = np.bincount(vm_hosts, minlength=len(hosts),
+                         weights=get_column(vms, "vm_pes") * get_column(vms, "vm_mips"))
+    capacity = get_column(hosts, "pes") * get_column(hosts, "mips").astype(float)
+    share = np.minimum(1.0, capacity / np.maximum(demand, 1))
+    return share[vm_hosts]
+
+
+def get_column(records, field):
+    """One field of every record, from config dicts or a structured array."""
+    if isinstance(records, np.ndarray) and records.dtype.names:
+        shared = _shared_columns.get((id(records), field))
+        if shared is not None and shared[0]() is records:
+            return shared[1]
+        return records[field]
+    return np.array([record[field] for record in records])
+
+
 def get_cost_config():
     sim_cost_config_path = os.path.join(CONFIGS_DIR, "sim_cost_config.json")
-    with open(sim_cost_config_path, 'r') as file:
-        data = json.load(file)
-
-    return data
+    return read_json(sim_cost_config_path)
 
 
 def get_custom_config():
@@ -47,6 +316,10 @@ def get_custom_config():
     return data
 
 def sort_vms(vms):
+    if isinstance(vms, np.ndarray) and vms.dtype.names:
+        # structured arrays of get_config_arrays, same order as below
+        order = np.argsort(-(vms["vm_mips"] * vms["vm_pes"]), kind="stable")
+        return vms[order], order.tolist()
     indexed_vms = list(enumerate(vms))
     # Sort the VMs by vm_mips * vm_pes in descending order (fastest first)
     sorted_indexed_vms = sorted(
@@ -59,7 +332,7 @@ def sort_vms(vms):
 
 
 def get_solution(name):
-    solution_file = os.path.join(BASE_DIR, f"{name}_schedule.json")
+    solution_file = os.path.join(get_output_dir(), f"{name}_schedule.json")
     with open(solution_file, 'r') as file:
         data = json.load(file)
     return data["schedule"]
@@ -72,14 +345,27 @@ def revert_vms_order(vms, original_indices):
     return reverted_vms
 
 
-def export_results(name, best, fitness, original_indices, running_tme):
+def write_fitness_log(path_w, f_bList):
+    """
+    Writes the best fitness trace of a league to lca/path_w, in the same
+    format league() writes it.
+    """
+    with open(os.path.join(get_output_dir(), f"lca/{path_w}"), "w") as file:
+        for t, f_best in enumerate(f_bList, start=1):
+            if t == 1 or t % 10 == 0:
+                file.write(f"t={t}, f_best={f_best}\n")
+
+
+def export_results(name, best, fitness, original_indices, running_tme,
+                   extra=None):
     best = min(best, key=fitness)
     fbest = fitness(best)
     best = np.floor(best).astype(int)
     selected_vms = [original_indices[i] for i in best]
 
-    schedule_file = os.path.join(BASE_DIR, f"{name}_schedule.json")
-    result_file = os.path.join(BASE_DIR, f"results/{name}_result.json")
+    output_dir = get_output_dir()
+    schedule_file = os.path.join(output_dir, f"{name}_schedule.json")
+    result_file = os.path.join(output_dir, f"results/{name}_result.json")
 
     with open(schedule_file, "w") as file:
         result = {"schedule": selected_vms}
@@ -90,6 +376,8 @@ def export_results(name, best, fitness, original_indices, running_tme):
             "fitness": fbest,
             "run_time": running_tme
         }
+        if extra:
+            result.update(extra)
         json.dump(result, file, indent=4)
 
 
@@ -103,4 +391,5 @@ def change_in_vm_scheduling_method(name):
 
     with open(config_file, 'w') as file:
         json.dump(data, file, indent=4)
+    write_config_arrays(data)
     print(f"method changed to {name} shared")
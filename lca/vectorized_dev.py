@@ -5,27 +5,28 @@ check dev.py for code documentation.
 it uses numpy for its calculations.
 """
 import os
+import time
 import numpy as np
 import math
-from util import read_lca_parameters
-
-params = read_lca_parameters()
-
-L = params['L']
-L_half = L // 2
-S = params['S']
-n = 0
-p_c = params['p_c']
-PSI1 = params['PSI1']
-PSI2 = params['PSI2']
-q0 = params['q0']
+from util import read_lca_parameters, make_rng, get_output_dir
+from stopping import StoppingRules
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
 
 
 class LeagueChampionshipAlgorithm:
-    def __init__(self, L=L, S=S, n=n, p_c=p_c, PSI1=PSI1, PSI2=PSI2, min_xi=0, max_xi=0,q0=q0 ,path_w="LCA.txt", mode="time"):
+    def __init__(self, L=None, S=None, n=0, p_c=None, PSI1=None, PSI2=None, min_xi=0, max_xi=0, q0=None, path_w="LCA.txt", mode="time", rng=None, stopping=None, seed_teams=None):
+        # unset parameters are read from LCA_parameters.json on construction,
+        # not on import, so long-lived processes pick up a changed file
+        if None in (L, S, p_c, PSI1, PSI2, q0):
+            params = read_lca_parameters()
+            L = params['L'] if L is None else L
+            S = params['S'] if S is None else S
+            p_c = params['p_c'] if p_c is None else p_c
+            PSI1 = params['PSI1'] if PSI1 is None else PSI1
+            PSI2 = params['PSI2'] if PSI2 is None else PSI2
+            q0 = params['q0'] if q0 is None else q0
         self.L = L
         self.L_half = L // 2
         self.S = S
@@ -36,8 +37,16 @@ class LeagueChampionshipAlgorithm:
         self.min_xi = min_xi
         self.max_xi = max_xi
         self.q0 = q0
-        self.path_w = os.path.join(BASE_DIR, f"lca/{path_w}")
+        # path_w=None discards the progress log, e.g. in multi-start workers
+        self.path_w = os.path.join(get_output_dir(), f"lca/{path_w}") \
+            if path_w is not None else os.devnull
         self.mode = mode
+        self.rng = rng if rng is not None else make_rng()
+        # early stopping rules, see stopping.StoppingRules
+        self.stopping = stopping if stopping is not None \
+            else StoppingRules.from_parameters(read_lca_parameters())
+        self.stop_reason = None
+        self.seed_teams = seed_teams if seed_teams is not None else []
         self.configure()
         self.fitness_scale = 1
         self.fitness_scale = self.calc_fitness(self.round_robin())
@@ -49,10 +58,41 @@ class LeagueChampionshipAlgorithm:
     def round_robin(self):
         return np.arange(self.n) % (self.max_xi + 1)
 
-    def league(self):
-        wfile = open(self.path_w, mode='w')
-
-        X = self.getRandomTeams(self.min_xi, self.max_xi)
+    def league(self, deadline_ms=None, callback=None):
+        for t, team, f_best in self.iter_league(deadline_ms):
+            if callback is not None:
+                callback(t, team, f_best)
+        return self.B
+
+    def iter_league(self, deadline_ms=None):
+        self.start_league(deadline_ms)
+        try:
+            while True:
+                yield (self.t, *self.best_team())
+                if self.finished():
+                    break
+                self.step()
+        except GeneratorExit:
+            self.stop_reason = self.stop_reason or "closed"
+            raise
+        finally:
+            self.finish_league()
+
+    def best_team(self):
+        best = np.argmin(self.fB)
+        return self.B[best].copy(), self.fB[best]
+
+    def start_league(self, deadline_ms=None):
+        """
+        Draws the initial teams and the first league schedule, the league
+        state lives on self so it can be advanced one week at a time with
+        step(), e.g. by the island model.
+        """
+        self.deadline = time.time() + deadline_ms / 1000 \
+            if deadline_ms is not None else None
+        self.wfile = open(self.path_w, mode='w')
+
+        X = self.seedTeams(self.getRandomTeams(self.min_xi, self.max_xi))
 
         DUMMY_TEAM = self.getRandomTeam(self.min_xi, self.max_xi)
 
@@ -61,49 +101,102 @@ class LeagueChampionshipAlgorithm:
             self.L += 1
             self.L_half += 1
 
-        fX = self.fitness(X)
-        nextX = np.copy(X)
-        B = np.copy(X)
-        fB = np.copy(fX)
+        self.X = X
+        self.fX = self.fitness(X)
+        self.evaluations = self.L
+        self.nextX = np.copy(X)
+        self.B = np.copy(X)
+        self.fB = np.copy(self.fX)
 
-        f_best = np.min(fB)
-        f_bList = [f_best]
+        self.f_best = np.min(self.fB)
+        self.f_bList = [self.f_best]
 
-        t = 1
+        self.t = 1
         self.genericSchedule = self.generateRoundRobinSchedule()
-        self.schedule = self.leagueSchedule(t)
-
-        wfile.write(f"t={t}, f_best={f_best}\n")
-
-        while t < self.S * (self.L - 1):
-            if t % 10 == 0:
-                wfile.write(f"t={t}, f_best={f_best}\n")
-
-            Y = self.get_Y()
-            nextX = self.calc_nextX(t, fX, f_best, X, B, Y, nextX)
-
-            X = np.copy(nextX)
-            fX = self.fitness(X)
-
-            improvement_mask = fX < fB
-            B[improvement_mask] = X[improvement_mask]
-            fB[improvement_mask] = fX[improvement_mask]
-
-            f_best = np.min(fB)
-            f_bList.append(f_best)
-
-            if t % (self.L - 1) == 0:
-                self.schedule = self.leagueSchedule(t)
-            t += 1
-
-        return B
+        self.schedule = self.leagueSchedule(self.t)
+
+        self.wfile.write(f"t={self.t}, f_best={self.f_best}\n")
+        self.stop_reason = None
+        self.stopping.start()
+
+    def finished(self):
+        """
+        True after the last season or once a stopping rule fired, the rule
+        is kept in self.stop_reason.
+        """
+        if self.stop_reason is not None:
+            return True
+        if self.t >= self.S * (self.L - 1):
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.stop_reason = "deadline"
+            return True
+        self.stop_reason = self.stopping.check(
+            self.f_bList, self.evaluations, self.L - 1)
+        return self.stop_reason is not None
+
+    def step(self):
+        """Plays one week of the league."""
+        t = self.t
+        if t % 10 == 0:
+            self.wfile.write(f"t={t}, f_best={self.f_best}\n")
+
+        Y = self.get_Y()
+        self.nextX = self.calc_nextX(
+            t, self.fX, self.f_best, self.X, self.B, Y, self.nextX)
+
+        self.X = np.copy(self.nextX)
+        self.fX = self.fitness(self.X)
+        self.evaluations += self.L
+
+        improvement_mask = self.fX < self.fB
+        self.B[improvement_mask] = self.X[improvement_mask]
+        self.fB[improvement_mask] = self.fX[improvement_mask]
+
+        self.f_best = np.min(self.fB)
+        self.f_bList.append(self.f_best)
+
+        if t % (self.L - 1) == 0:
+            self.schedule = self.leagueSchedule(t)
+        self.t += 1
+
+    def finish_league(self):
+        if self.stop_reason is None:
+            self.stop_reason = "seasons"
+        self.wfile.write(
+            f"t={self.t}, f_best={self.f_best}, stop_reason={self.stop_reason}\n")
+        self.wfile.close()
+        return self.B
+
+    def emigrants(self, count):
+        """Returns copies of the count best teams and their fitness."""
+        best = np.argsort(self.fB, kind="stable")[:count]
+        return self.B[best].copy(), self.fB[best].copy()
+
+    def immigrate(self, teams, f_teams):
+        """
+        Replaces the worst teams by incoming teams, the best incoming team
+        takes the place of the worst team. A team is only replaced when the
+        incoming one is better than its best formation.
+        """
+        order = np.argsort(f_teams, kind="stable")[:self.L]
+        teams, f_teams = teams[order], f_teams[order]
+        worst = np.argsort(self.fB, kind="stable")[::-1][:len(order)]
+
+        better = f_teams < self.fB[worst]
+        worst = worst[better]
+        self.X[worst] = teams[better]
+        self.fX[worst] = f_teams[better]
+        self.B[worst] = teams[better]
+        self.fB[worst] = f_teams[better]
+        self.f_best = np.min(self.fB)
 
     def calc_nextX(self, t, fX, f_best, X, B, Y, nextX):
         teamA = np.arange(self.L)
         tmp_t = t % (self.L - 1)
-        teamB = np.array([self.schedule[l][tmp_t - 2] for l in teamA])
-        teamC = np.array([self.schedule[l][tmp_t - 1] for l in teamA])
-        teamD = np.array([self.schedule[teamC[l]][tmp_t - 2] for l in teamA])
+        teamB = self.schedule[teamA, tmp_t - 2]
+        teamC = self.schedule[teamA, tmp_t - 1]
+        teamD = self.schedule[teamC, tmp_t - 2]
 
         winner1 = self.winORlose(teamA, teamB, fX, f_best)
         winner2 = self.winORlose(teamC, teamD, fX, f_best)
@@ -113,21 +206,25 @@ class LeagueChampionshipAlgorithm:
         return nextX
 
     def getRandomTeam(self, min_val, max_val):
-        return np.random.randint(min_val, max_val + 1, size=(self.n,))
+        return self.rng.integers(min_val, max_val + 1, size=(self.n,))
 
     def getRandomTeams(self, min_val, max_val):
-        return np.random.randint(min_val, max_val + 1, size=(self.L, self.n))
+        return self.rng.integers(min_val, max_val + 1, size=(self.L, self.n))
+
+    def seedTeams(self, X):
+        for l, seed in enumerate(self.seed_teams[:self.L_half]):
+            seed = np.asarray(seed)[:self.n]
+            valid = (seed >= self.min_xi) & (seed <= self.max_xi)
+            X[l, :len(seed)][valid] = seed[valid]
+        return X
 
     def leagueSchedule(self, t):
         if t == 1:
             return np.copy(self.genericSchedule)
         else:
-            shuffled = np.random.permutation(self.L)
+            shuffled = self.rng.permutation(self.L)
             reversed_shuffled = np.argsort(shuffled)
-            return np.array([
-                shuffled[self.genericSchedule[reversed_shuffled[i]]]
-                for i in range(self.L)
-            ])
+            return shuffled[self.genericSchedule[reversed_shuffled]]
 
     def generateRoundRobinSchedule(self):
         teams = np.arange(self.L)
@@ -144,36 +241,44 @@ class LeagueChampionshipAlgorithm:
 
     def winORlose(self, team1, team2, fX, f_best):
         denom = (fX[team2] + fX[team1] - 2.0 * f_best)
-        winPoint = np.where(
-            denom == 0,
-            0.5,
-            (fX[team2] - f_best) / denom
-        )
-        rand_vals = np.random.uniform(0.0, 1.0, size=team1.shape)
+        # two teams at f_best, e.g. warm started ones, win half of the time
+        winPoint = np.divide(fX[team2] - f_best, denom,
+                             out=np.full(denom.shape, 0.5), where=denom != 0)
+        rand_vals = self.rng.random(size=team1.shape)
         winner = np.where(rand_vals <= winPoint, team1, team2)
         return winner
 
+    def calc_fitness_batch(self, X):
+        # subclasses with population-level kernels override this
+        return np.array([self.calc_fitness(x) for x in X])
+
     def fitness(self, X):
-        return 100 * np.array([self.calc_fitness(x) for x in X]) / self.fitness_scale
+        return 100 * self.calc_fitness_batch(X) / self.fitness_scale
 
     def get_Y(self):
         self.q0 = 1
-        a = np.random.uniform(0.0, 1.0, size=(self.L,))
+        # one bulk draw: column 0 sizes the flag count, the rest are position keys
+        draws = self.rng.random(size=(self.L, self.n + 1))
+        a = draws[:, 0]
         flagNum = (
             np.log(1 - (1 - (1 - self.p_c) ** (self.n - self.q0 + 1)) * a)
             // np.log(1 - self.p_c)
             + self.q0 - 1
         ).astype(int)
 
-        Y = np.zeros((self.L, self.n), dtype=int)
-        for i, q in enumerate(flagNum):
-            positions = np.random.choice(self.n, size=q, replace=False)
-            Y[i, positions] = 1
-        return Y
+        # each team flags the positions of its flagNum smallest random keys,
+        # a uniformly random subset of size flagNum without replacement
+        keys = draws[:, 1:]
+        kth = np.unique(flagNum[flagNum > 0]) - 1
+        if kth.size == 0:
+            return np.zeros((self.L, self.n), dtype=int)
+        partitioned = np.partition(keys, kth, axis=1)
+        thresholds = partitioned[np.arange(self.L), np.maximum(flagNum - 1, 0)]
+        Y = (keys <= thresholds[:, np.newaxis]) & (flagNum > 0)[:, np.newaxis]
+        return Y.astype(int)
 
     def getRandom_rid(self):
-        r1 = np.random.uniform(0.0, 1.0, size=(self.L, self.n))
-        r2 = np.random.uniform(0.0, 1.0, size=(self.L, self.n))
+        r1, r2 = self.rng.random(size=(2, self.L, self.n))
         return r1, r2
 
     def setTeamFormation(self, X, B, Y, teamA, teamB, teamC, teamD, winner1, winner2):
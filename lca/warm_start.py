@@ -0,0 +1,71 @@
+"""
+warm start teams of the LCA leagues.
+
+instead of drawing the whole league at random, up to half of its teams can
+start from known schedules, listed under "warm_start" in
+LCA_parameters.json:
+    "round_robin"   cloudlet i on VM i % VMs
+    "MCT", "Min_Min", "Max_Min", "LPT"
+                    the greedy schedulers of algorithms/greedy.py
+    "greedy"        same as "Max_Min"
+    any other name  the last {name}_schedule.json, e.g. "MO_LCA"
+
+the rest of the league stays random. teams are returned in the sorted VM
+order the LCA modules use, a schedule with fewer cloudlets or VMs than the
+current problem is completed with random values by the league.
+"""
+import numpy as np
+
+from algorithms.greedy import SCHEDULERS
+from util import get_solution, read_lca_parameters
+
+SEEDERS = dict(SCHEDULERS, greedy=SCHEDULERS["Max_Min"])
+
+
+def round_robin_team(vms, cloudlets):
+    return np.arange(len(cloudlets)) % len(vms)
+
+
+def previous_team(name, original_indices):
+    """
+    The last schedule of an algorithm in sorted VM order, VMs that are not
+    in the current problem become -1, or None when there is no schedule.
+    """
+    try:
+        schedule = get_solution(name)
+    except FileNotFoundError:
+        print(f"No previous schedule of {name}, it is not used to warm start")
+        return None
+    sorted_position = {vm: position for position, vm in enumerate(original_indices)}
+    return np.array([sorted_position.get(vm, -1) for vm in schedule], dtype=int)
+
+
+def warm_start_teams(vms, cloudlets, original_indices, mode="time",
+                     sources=None, hosts=None):
+    """
+    Builds the warm start teams of the given sources.
+
+    Args:
+        vms (list): the VMs in sorted order
+        cloudlets (list): the cloudlets
+        original_indices (list): original index of every sorted VM
+        mode (str): "time" or "space" shared VMs, for the greedy seeders
+        sources (list): defaults to "warm_start" of LCA_parameters.json
+        hosts: the hosts of the VMs, for the greedy seeders
+
+    Returns:
+        list: one team per available source
+    """
+    if sources is None:
+        sources = read_lca_parameters().get("warm_start", [])
+    teams = []
+    for source in sources:
+        if source == "round_robin":
+            team = round_robin_team(vms, cloudlets)
+        elif source in SEEDERS:
+            team = SEEDERS[source](vms, cloudlets, mode, hosts)
+        else:
+            team = previous_team(source, original_indices)
+        if team is not None:
+            teams.append(team)
+    return teams
@@ -1,8 +1,17 @@
+import atexit
+import contextlib
+import glob
+import importlib
+import io
 import json
 import os
 import subprocess
+import sys
+import threading
+import traceback
 import argparse
-from lca.util import change_in_vm_scheduling_method
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from lca.util import change_in_vm_scheduling_method, shared_config_arrays
 import lca.config
 import lca.cost_config
 
@@ -53,10 +62,39 @@ def build_java_project():
     print(f"✅ Maven build succeeded! (log: {build_log_file})")
 
 
-def run_java_program(input, algorithm_name):
-    logs_dir = os.path.join(SCRIPT_DIR, "logs")
+def get_logs_dir():
+    """logs/ of the run's output directory (--output-dir), created on demand."""
+    logs_dir = os.path.join(os.environ.get("OUTPUT_DIR") or SCRIPT_DIR, "logs")
     if not os.path.exists(logs_dir):
         os.makedirs(logs_dir)
+    return logs_dir
+
+
+@contextlib.contextmanager
+def job_environment(args):
+    """
+    Exports --lca-parameters and --output-dir as LCA_PARAMETERS and OUTPUT_DIR
+    for the duration of a job, the algorithms and the simulator read them
+    instead of configs/LCA_parameters.json and the repository root.
+    """
+    overrides = {"LCA_PARAMETERS": args.lca_parameters,
+                 "OUTPUT_DIR": args.output_dir and os.path.abspath(args.output_dir)}
+    previous = {key: os.environ.get(key) for key in overrides}
+    for key, value in overrides.items():
+        if value is not None:
+            os.environ[key] = value
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_java_program(input, algorithm_name):
+    logs_dir = get_logs_dir()
 
     run_log_file = os.path.join(
         logs_dir, f"run_{algorithm_name}.log")
@@ -76,6 +114,110 @@ def run_java_program(input, algorithm_name):
     print(f"✅ Java program finished! (log: {run_log_file})")
 
 
+def simulation_server_command():
+    """
+    Command of the resident simulator, the shaded jar built by job 3 when it
+    exists, Maven otherwise.
+    """
+    jars = glob.glob(os.path.join(SCRIPT_DIR, "target", "*-with-dependencies.jar"))
+    if jars:
+        return ["java", "-cp", jars[0], "org.simulations.Simulation", "--server"]
+    return ["mvn", "-q", "exec:java",
+            "-Dexec.mainClass=org.simulations.Simulation",
+            "-Dexec.args=--server"]
+
+
+class SimulationServer:
+    """
+    Client of the resident simulator (Simulation --server): a single JVM
+    simulates any number of schedules, instead of one mvn exec:java each.
+    """
+
+    def __init__(self, logs_dir=None):
+        self.log_file = os.path.join(
+            logs_dir or get_logs_dir(), f"simulation_server_{os.getpid()}.log")
+        with open(self.log_file, "w") as server_log:
+            self.process = subprocess.Popen(simulation_server_command(),
+                                            stdin=subprocess.PIPE,
+                                            stdout=subprocess.PIPE,
+                                            stderr=server_log,
+                                            text=True)
+
+    def simulate(self, name, schedule=None, output_dir=None):
+        """
+        Simulates the schedule of name, read from {name}_schedule.json when
+        schedule is None, and returns its *_sim_results.json payload.
+        Schedules are read from and results written to output_dir when set.
+        """
+        if schedule is None and output_dir is None:
+            request = name
+        else:
+            request = {"name": name}
+            if schedule is not None:
+                request["schedule"] = list(schedule)
+            if output_dir is not None:
+                request["output_dir"] = output_dir
+            request = json.dumps(request)
+        self.process.stdin.write(request + "\n")
+        self.process.stdin.flush()
+
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError(
+                    f"simulation server exited, check {self.log_file}")
+            # Maven may print its own lines before the first response
+            if line.startswith("{"):
+                break
+        response = json.loads(line)
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+# resident simulators by the logs directory they write to
+_simulation_servers = {}
+
+
+def get_simulation_server():
+    """
+    The resident simulator of the current logs directory (see get_logs_dir),
+    started on first use and kept running, so every run's server output
+    stays in that run's logs.
+    """
+    logs_dir = get_logs_dir()
+    server = _simulation_servers.get(logs_dir)
+    if server is None or server.process.poll() is not None:
+        print("\n🚀 Starting resident Java simulator...")
+        server = _simulation_servers[logs_dir] = SimulationServer(logs_dir)
+        atexit.register(server.close)
+    return server
+
+
+def run_java_batch(names):
+    """
+    Simulates the schedules of all names in the resident simulator and
+    returns their *_sim_results.json payloads by name.
+    """
+    server = get_simulation_server()
+    results = {}
+    for name in names:
+        print(f"\n🚀 Simulating {name}... (log: {get_logs_dir()}/run_{name}.log)")
+        try:
+            results[name] = server.simulate(
+                name, output_dir=os.environ.get("OUTPUT_DIR"))
+        except RuntimeError as error:
+            print(f"❌ Simulation of {name} failed! {error}")
+            exit(1)
+        print(f"✅ Simulation of {name} finished!")
+    return results
+
+
 def run_python_script(directory, name):
     python_file = os.path.join(SCRIPT_DIR, directory, "main.py")
     print(f"\n🐍 Running Python script {python_file} with algorithm: {name}")
@@ -89,6 +231,126 @@ def run_python_script(directory, name):
     print("✅ Python script finished successfully!")
 
 
+def run_python_module(directory, name):
+    """
+    Runs an algorithm inside this process through its directory's main.py,
+    used by the scheduler daemon (job 4) so NumPy, the algorithm modules and
+    the parsed configs stay loaded between jobs.
+    """
+    module_dir = os.path.abspath(os.path.join(SCRIPT_DIR, directory))
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    print(f"\n🐍 Running {directory}/{name} in the scheduler daemon")
+    importlib.import_module(f"{directory}.main").run_algorithm(name)
+    print("✅ Python script finished successfully!")
+
+
+def tune_lca_parameters(in_process=False):
+    """
+    Runs the successive halving search of lca/tuner.py over the grid of
+    run_config.json, the ranking is written to results/tuning_result.json.
+    """
+    print("\n🎯 Tuning the LCA parameters with successive halving")
+    if in_process:
+        lca_dir = os.path.join(SCRIPT_DIR, "lca")
+        if lca_dir not in sys.path:
+            sys.path.insert(0, lca_dir)
+        importlib.import_module("lca.tuner").run()
+    else:
+        result = subprocess.run(
+            ["python3", os.path.join(SCRIPT_DIR, "lca", "tuner.py")], text=True)
+        if result.returncode != 0:
+            print("❌ Tuning failed!")
+            exit(1)
+    print("✅ Tuning finished successfully!")
+
+
+_running_processes = set()
+_running_lock = threading.Lock()
+
+
+def run_logged_process(command, input, log_file):
+    """
+    Runs command with its output in log_file, raising RuntimeError when it
+    fails. Used by --parallel, which terminates the process on fail-fast.
+    """
+    with open(log_file, "w") as log:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=log,
+                                   stderr=subprocess.STDOUT, text=True)
+        with _running_lock:
+            _running_processes.add(process)
+        try:
+            process.communicate(input)
+        finally:
+            with _running_lock:
+                _running_processes.discard(process)
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} failed! Check {log_file}")
+
+
+def run_parallel(algorithms, workers, simulator):
+    """
+    --parallel N: optimizes up to N algorithms at once and simulates each
+    one as soon as its schedule is written, so simulating algorithm i
+    overlaps with optimizing the next ones. Every step logs to
+    logs/optimize_{name}.log or logs/run_{name}.log, the first failure
+    stops all running steps and exits.
+    """
+    logs_dir = get_logs_dir()
+
+    def optimize(algorithm):
+        python_file = os.path.join(SCRIPT_DIR, algorithm["directory"], "main.py")
+        run_logged_process(["python3", python_file], algorithm["name"],
+                           os.path.join(logs_dir, f"optimize_{algorithm['name']}.log"))
+
+    def simulate(algorithm):
+        if simulator == "resident":
+            get_simulation_server().simulate(
+                algorithm["name"], output_dir=os.environ.get("OUTPUT_DIR"))
+        else:
+            run_logged_process(["mvn", "exec:java",
+                                "-Dexec.mainClass=org.simulations.Simulation"],
+                               algorithm["name"] + "\n",
+                               os.path.join(logs_dir, f"run_{algorithm['name']}.log"))
+
+    # the resident simulator handles one schedule at a time
+    simulators = ThreadPoolExecutor(1 if simulator == "resident" else workers)
+    optimizers = ThreadPoolExecutor(workers)
+    steps = {optimizers.submit(optimize, algorithm): ("optimize", algorithm)
+             for algorithm in algorithms}
+    pending = set(steps)
+    print(f"\n⚡ Running {len(algorithms)} algorithms on {workers} workers")
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                step, algorithm = steps[future]
+                name = f"{algorithm['directory']}/{algorithm['name']}"
+                if future.exception() is not None:
+                    raise RuntimeError(
+                        f"{step} {name}: {future.exception()}")
+                if step == "optimize":
+                    print(f"✅ Optimized {name}")
+                    simulation = simulators.submit(simulate, algorithm)
+                    steps[simulation] = ("simulate", algorithm)
+                    pending.add(simulation)
+                else:
+                    print(f"✅ Simulated {name}")
+    except RuntimeError as error:
+        print(f"❌ Failed to {error}")
+        # fail fast: drop queued steps and stop the running ones
+        optimizers.shutdown(wait=False, cancel_futures=True)
+        simulators.shutdown(wait=False, cancel_futures=True)
+        with _running_lock:
+            for process in _running_processes:
+                process.terminate()
+        if logs_dir in _simulation_servers:
+            _simulation_servers[logs_dir].process.terminate()
+        exit(1)
+    optimizers.shutdown()
+    simulators.shutdown()
+
+
 def generate_config(inputs):
     print("\n🐍 Generating configuration files...")
 
@@ -99,7 +361,8 @@ def generate_config(inputs):
     if inputs.vm_scheduling_mode is not None:
         MODE = inputs.vm_scheduling_mode
 
-    lca.config.generate_config(CONFIGURATION_CHOICE, MODE)
+    lca.config.generate_config(CONFIGURATION_CHOICE, MODE, inputs.stream,
+                               inputs.cloudlet_count)
     lca.cost_config.generate_cost_config(COST_CONFIGURATION_CHOICE)
 
     print("✅ Configuration files generated successfully")
@@ -118,25 +381,35 @@ def edit_config(inputs):
     print("✅ Configuration files edited successfully")
 
 
-def main():
-
+def build_parser():
     parser = argparse.ArgumentParser(
         description="Run the LCA algorithm and simulations, or configure parameters."
     )
 
     parser.add_argument(
-        '--job', type=int, choices=[0, 1, 2, 3], default=0,
+        '--job', type=int, choices=[0, 1, 2, 3, 4, 5], default=0,
         help=(
             "Job type: "
             "0 = run algorithm and simulations (default), "
             "1 = generate config, "
             "2 = edit config, "
             "3 = build java, "
+            "4 = serve jobs from stdin (scheduler daemon), "
+            "5 = tune the LCA parameters of run_config.json (successive halving), "
         )
     )
     parser.add_argument(
-        '--config-type', type=int, choices=range(0, 7),
-        help="(Job 1 only) Configuration type: integer between 0 and 6."
+        '--config-type', type=int, choices=range(0, 9),
+        help="(Job 1 only) Configuration type: integer between 0 and 8, 7 and 8 are multi-host."
+    )
+    parser.add_argument(
+        '--cloudlet-count', type=int, metavar="N",
+        help="(Job 1 only) generate N cloudlets instead of the configuration type's count."
+    )
+    parser.add_argument(
+        '--stream', action='store_true',
+        help=("(Job 1 only) draw the workload as NumPy arrays and write it in "
+              "chunks, for 100k+ cloudlets.")
     )
     parser.add_argument(
         '--cost-config-type', type=int, choices=[1, 2],
@@ -150,10 +423,30 @@ def main():
         '--run', type=str, choices=["lca", "algorithms"],
         help="(Job 0) run only lca algorithms or only other algorithms."
     )
+    parser.add_argument(
+        '--lca-parameters', type=str,
+        help=("(Job 0 and 5) LCA parameters as a JSON object, used instead of "
+              "configs/LCA_parameters.json.")
+    )
+    parser.add_argument(
+        '--output-dir', type=str,
+        help=("(Job 0 and 5) directory for the schedules, results and logs of this "
+              "run, e.g. one per sweep grid point.")
+    )
+    parser.add_argument(
+        '--parallel', type=int, default=1, metavar="N",
+        help=("(Job 0) optimize up to N algorithms at once, overlapping their "
+              "simulations with the next optimizations.")
+    )
+    parser.add_argument(
+        '--simulator', type=str, choices=["resident", "mvn"], default="resident",
+        help=("(Job 0) 'resident' validates all schedules in one JVM (default), "
+              "'mvn' starts mvn exec:java for every algorithm.")
+    )
+    return parser
 
-    args = parser.parse_args()
-    print(args)
 
+def validate_args(parser, args):
     # ✅ Validate arguments for specific jobs
     if args.job == 1:
         if args.config_type is None or args.cost_config_type is None or args.vm_scheduling_mode is None:
@@ -165,23 +458,22 @@ def main():
             parser.error(
                 "Job 2 requires --cost-config-type or --vm-scheduling-mode."
             )
+    if args.lca_parameters is not None:
+        try:
+            json.loads(args.lca_parameters)
+        except json.JSONDecodeError as error:
+            parser.error(f"--lca-parameters is not valid JSON: {error}")
     if args.run is None:
         args.run = "algorithms"
 
-    if args.job == 0:
-        algorithms_to_run = load_algorithms().get('algorithms', [])
-        for algorithm in algorithms_to_run:
-            if(args.run == "lca" and algorithm["directory"]=="lca"):
-                run_python_script(algorithm["directory"], algorithm["name"])
-                run_java_program((algorithm["name"] + "\n"), algorithm["name"])
-                print(
-                    f"\n=== Running algorithm: {algorithm['directory']}/{algorithm['name']} ===")
-            elif(args.run == "algorithms" and algorithm["directory"]=="algorithms"):
-                run_python_script(algorithm["directory"], algorithm["name"])
-                run_java_program((algorithm["name"] + "\n"), algorithm["name"])
-                print(
-                    f"\n=== Running algorithm: {algorithm['directory']}/{algorithm['name']} ===")
 
+def run_job(args, in_process=False):
+    run_python = run_python_module if in_process else run_python_script
+
+    if args.job == 0:
+        # the algorithm processes attach to one copy of the config arrays
+        with job_environment(args), shared_config_arrays():
+            run_algorithms(args, run_python)
 
     if args.job == 1:
         generate_config(args)
@@ -192,6 +484,85 @@ def main():
     if args.job == 3:
         build_java_project()
 
+    if args.job == 5:
+        with job_environment(args):
+            tune_lca_parameters(in_process)
+
+
+def run_algorithms(args, run_python):
+    algorithms_to_run = [
+        algorithm for algorithm in load_algorithms().get('algorithms', [])
+        if algorithm["directory"] == args.run]
+    if args.parallel > 1:
+        run_parallel(algorithms_to_run, args.parallel, args.simulator)
+        return
+
+    for algorithm in algorithms_to_run:
+        run_python(algorithm["directory"], algorithm["name"])
+        if args.simulator == "mvn":
+            run_java_program((algorithm["name"] + "\n"), algorithm["name"])
+        print(
+            f"\n=== Running algorithm: {algorithm['directory']}/{algorithm['name']} ===")
+    if args.simulator == "resident":
+        run_java_batch([algorithm["name"] for algorithm in algorithms_to_run])
+
+
+def serve(parser):
+    """
+    Job 4: runs jobs read from stdin, one JSON object per line, in this
+    process until stdin is closed. A job uses the command line options as
+    keys, e.g. {"id": 1, "job": 1, "config-type": 3, "cost-config-type": 1,
+    "vm-scheduling-mode": "time"}. For every job one JSON line
+    {"id", "ok", "output"} (plus "error" when it failed) is written to stdout,
+    everything the job prints is returned in "output".
+    """
+    protocol = sys.stdout
+    print("✅ Scheduler daemon ready", file=sys.stderr)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        output = io.StringIO()
+        response = {"id": None, "ok": True}
+        try:
+            request = json.loads(line)
+            response["id"] = request.pop("id", None)
+            # true is a flag without value, e.g. {"stream": true}, objects
+            # are passed as JSON, e.g. {"lca_parameters": {"L": 10}}
+            argv = [f"--{key.replace('_', '-')}" if value is True
+                    else f"--{key.replace('_', '-')}="
+                    f"{value if isinstance(value, str) else json.dumps(value)}"
+                    for key, value in request.items()
+                    if value is not None and value is not False]
+            with contextlib.redirect_stdout(output), \
+                    contextlib.redirect_stderr(output):
+                args = parser.parse_args(argv)
+                validate_args(parser, args)
+                if args.job == 4:
+                    parser.error("Job 4 can not be submitted to the daemon.")
+                run_job(args, in_process=True)
+        except SystemExit as error:
+            response["ok"] = False
+            response["error"] = f"job exited with status {error.code}"
+        except Exception:
+            response["ok"] = False
+            response["error"] = traceback.format_exc()
+        response["output"] = output.getvalue()
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.job == 4:
+        # stdout carries the daemon protocol, see serve
+        serve(parser)
+        return
+
+    print(args)
+    validate_args(parser, args)
+    run_job(args)
+
 
 if __name__ == "__main__":
     main()
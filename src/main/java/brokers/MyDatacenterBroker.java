@@ -3,6 +3,8 @@ package brokers;
 import org.cloudsimplus.brokers.DatacenterBrokerSimple;
 import org.cloudsimplus.cloudlets.Cloudlet;
 import org.cloudsimplus.core.CloudSimPlus;
+import org.cloudsimplus.datacenters.Datacenter;
+import org.cloudsimplus.hosts.Host;
 import org.cloudsimplus.listeners.DatacenterBrokerEventInfo;
 import org.cloudsimplus.listeners.EventListener;
 import org.cloudsimplus.vms.Vm;
@@ -32,6 +34,15 @@ public class MyDatacenterBroker extends DatacenterBrokerSimple {
         schedule = config.getJSONArray("schedule");
     }
 
+    /**
+     * Sets the schedule directly, e.g. one sent inline to the resident simulation.
+     *
+     * @param schedule VM index of every cloudlet
+     */
+    public void setSchedule(JSONArray schedule){
+        MyDatacenterBroker.schedule = schedule;
+    }
+
     /**
      * Custom VM mapper that assigns cloudlets to VMs based on a predefined schedule.
      *
@@ -47,4 +58,17 @@ public class MyDatacenterBroker extends DatacenterBrokerSimple {
         }
     }
 
+    /**
+     * Sends every VM to the datacenter of the host it was packed onto in
+     * sim_config.json, VMs without a "host" use the default mapping.
+     */
+    @Override
+    protected Datacenter defaultDatacenterMapper(Datacenter lastDatacenter, Vm vm) {
+        Host host = commons.configuredHost(vm);
+        if (host == null) {
+            return super.defaultDatacenterMapper(lastDatacenter, vm);
+        }
+        return host.getDatacenter();
+    }
+
 }
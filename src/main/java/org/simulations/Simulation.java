@@ -8,10 +8,16 @@ import org.cloudsimplus.core.CloudSimPlus;
 import org.cloudsimplus.datacenters.Datacenter;
 import org.cloudsimplus.vms.Vm;
 
+import org.json.JSONArray;
+import org.json.JSONObject;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
 
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.PrintStream;
+import java.nio.file.Paths;
 import java.util.List;
 import java.util.Scanner;
 
@@ -23,17 +29,85 @@ public class Simulation {
     private final MyDatacenterBroker broker;
     private final List<Vm> vmList;
     private final List<Cloudlet> cloudletList;
-    private final Datacenter datacenter;
+    private final List<Datacenter> datacenters;
+    private final JSONObject result;
 
     public static void main(String[] args) {
+        if (args.length > 0 && args[0].equals("--server")) {
+            serve();
+            return;
+        }
+        outputDir = System.getenv().getOrDefault("OUTPUT_DIR", "");
         Scanner scanner = new Scanner(System.in);
         String algorithm = scanner.nextLine();
-        new Simulation(algorithm);
+        new Simulation(algorithm, null);
+    }
+
+    /**
+     * Resident mode: simulates one schedule per stdin line until EOF, so a
+     * batch of schedules shares one JVM. A line is either an algorithm name,
+     * whose schedule is read from {name}_schedule.json, or a JSON object
+     * {"name": ..., "schedule": [...], "output_dir": ...} with an inline
+     * schedule and/or the directory schedules and results are read from and
+     * written to. For every line one JSON line {"name", "ok", "result" or
+     * "error"} is written to stdout, the simulation output goes to
+     * logs/run_{name}.log of the output directory.
+     */
+    private static void serve() {
+        final PrintStream protocol = System.out;
+        Scanner scanner = new Scanner(System.in);
+        while (scanner.hasNextLine()) {
+            String line = scanner.nextLine().trim();
+            if (line.isEmpty()) {
+                continue;
+            }
+
+            JSONObject response = new JSONObject();
+            try {
+                String algorithm = line;
+                JSONArray schedule = null;
+                outputDir = "";
+                if (line.startsWith("{")) {
+                    JSONObject request = new JSONObject(line);
+                    algorithm = request.getString("name");
+                    schedule = request.optJSONArray("schedule");
+                    outputDir = request.optString("output_dir", "");
+                }
+                response.put("name", algorithm);
+
+                new File(outputPath("logs")).mkdirs();
+                try (PrintStream runLog = new PrintStream(
+                        new FileOutputStream(outputPath("logs/run_" + algorithm + ".log")), true)) {
+                    System.setOut(runLog);
+                    response.put("result", new Simulation(algorithm, schedule).result);
+                } finally {
+                    System.setOut(protocol);
+                }
+                response.put("ok", true);
+            } catch (Exception e) {
+                log.error("Simulation failed", e);
+                response.put("ok", false);
+                response.put("error", e.toString());
+            }
+            protocol.println(response);
+            protocol.flush();
+        }
     }
 
     public static String name;
 
-    private Simulation(String algorithm) {
+    /** Directory schedules are read from and results written to, "" is the working directory. */
+    public static String outputDir = "";
+
+    public static String outputPath(String file) {
+        return Paths.get(outputDir, file).toString();
+    }
+
+    /**
+     * @param schedule the cloudlet to VM schedule, or null to read it from
+     *                 {algorithm}_schedule.json
+     */
+    private Simulation(String algorithm, JSONArray schedule) {
         /*Enables just some level of log messages.
           Make sure to import org.cloudsimplus.util.Log;*/
 //        Log.setLevel(Level.TRACE)
@@ -44,9 +118,13 @@ public class Simulation {
         simulation = new CloudSimPlus();
         commons.initConfig();
 
-        datacenter = commons.createDatacenter(simulation);
+        datacenters = commons.createDatacenters(simulation);
         broker = new MyDatacenterBroker(simulation,name);
-        broker.loadSchedule(name + "_schedule.json");
+        if (schedule == null) {
+            broker.loadSchedule(outputPath(name + "_schedule.json"));
+        } else {
+            broker.setSchedule(schedule);
+        }
 
         vmList = commons.createVms();
         cloudletList = commons.createCloudlets();
@@ -58,8 +136,8 @@ public class Simulation {
 
         final var cloudletFinishedList = broker.getCloudletFinishedList();
         new CloudletsTableBuilder(cloudletFinishedList).build();
-        commons.printTotalVmsCost(datacenter,broker);
-        commons.exportResult(datacenter, broker);
+        commons.printTotalVmsCost(datacenters, broker);
+        result = new JSONObject(commons.exportResult(datacenters, broker));
     }
 
 
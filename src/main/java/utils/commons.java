@@ -2,6 +2,8 @@ package utils;
 
 import com.google.gson.Gson;
 import com.google.gson.GsonBuilder;
+import org.cloudsimplus.allocationpolicies.VmAllocationPolicy;
+import org.cloudsimplus.allocationpolicies.VmAllocationPolicySimple;
 import org.cloudsimplus.brokers.DatacenterBroker;
 import org.cloudsimplus.cloudlets.Cloudlet;
 import org.cloudsimplus.cloudlets.CloudletSimple;
@@ -17,6 +19,7 @@ import org.cloudsimplus.schedulers.cloudlet.CloudletScheduler;
 import org.cloudsimplus.schedulers.cloudlet.CloudletSchedulerCompletelyFair;
 import org.cloudsimplus.schedulers.cloudlet.CloudletSchedulerSpaceShared;
 import org.cloudsimplus.schedulers.cloudlet.CloudletSchedulerTimeShared;
+import org.cloudsimplus.schedulers.vm.VmSchedulerTimeShared;
 import org.cloudsimplus.utilizationmodels.UtilizationModelFull;
 import org.cloudsimplus.vms.Vm;
 import org.cloudsimplus.vms.VmCost;
@@ -35,6 +38,8 @@ import java.util.ArrayList;
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
+import java.util.Optional;
+import java.util.TreeMap;
 
 public class commons {
     /**
@@ -48,18 +53,63 @@ public class commons {
         costConfig = commons.loadConfig("sim_cost_config.json", "configs/");
     }
 
-    public static Datacenter createDatacenter(CloudSimPlus simulation) {
+    /** Hosts in the order of the "hosts" config, the "host" of a VM indexes it. */
+    public static List<Host> hostList;
+
+    /**
+     * Creates one Datacenter per "datacenter" index of the hosts (0 when
+     * missing) and their Hosts. When the VMs have a "host" index, each is
+     * placed on that host.
+     */
+    public static List<Datacenter> createDatacenters(CloudSimPlus simulation) {
         JSONArray hostsConfig = config.getJSONArray("hosts");
 
-        List<Host> hostList = new ArrayList<>();
+        hostList = new ArrayList<>();
+        Map<Integer, List<Host>> datacenterHosts = new TreeMap<>();
 
         for (int i = 0; i < hostsConfig.length(); i++) {
             JSONObject hostConf = hostsConfig.getJSONObject(i);
             Host host = createHost(hostConf);
             hostList.add(host);
+            datacenterHosts.computeIfAbsent(hostConf.optInt("datacenter", 0), k -> new ArrayList<>()).add(host);
+        }
+
+        boolean placed = hasVmHosts();
+        List<Datacenter> datacenters = new ArrayList<>();
+        for (List<Host> hosts : datacenterHosts.values()) {
+            DatacenterCharacteristicsSimple dcs =  new DatacenterCharacteristicsSimple(costConfig.getInt("CostPerSecond"), costConfig.getInt("CostPerMem"), costConfig.getInt("CostPerStorage"), costConfig.getInt("CostPerBw"));
+            VmAllocationPolicy policy = placed
+                    ? new VmAllocationPolicySimple(commons::findConfiguredHost)
+                    : new VmAllocationPolicySimple();
+            datacenters.add(new DatacenterSimple(simulation, hosts, policy).setCharacteristics(dcs));
+        }
+        return datacenters;
+    }
+
+    private static boolean hasVmHosts() {
+        JSONArray vmArray = config.getJSONArray("vms");
+        for (int i = 0; i < vmArray.length(); i++) {
+            if (!vmArray.getJSONObject(i).has("host")) {
+                return false;
+            }
         }
-        DatacenterCharacteristicsSimple dcs =  new DatacenterCharacteristicsSimple(costConfig.getInt("CostPerSecond"), costConfig.getInt("CostPerMem"), costConfig.getInt("CostPerStorage"), costConfig.getInt("CostPerBw"));
-        return new DatacenterSimple(simulation, hostList).setCharacteristics(dcs);
+        return vmArray.length() > 0;
+    }
+
+    /**
+     * The host the generator packed a VM onto, VM ids follow the "vms" config.
+     */
+    private static Optional<Host> findConfiguredHost(VmAllocationPolicy policy, Vm vm) {
+        Host host = configuredHost(vm);
+        return host != null && host.isSuitableForVm(vm) ? Optional.of(host) : Optional.empty();
+    }
+
+    public static Host configuredHost(Vm vm) {
+        JSONObject vmConf = config.getJSONArray("vms").optJSONObject((int) vm.getId());
+        if (vmConf == null || !vmConf.has("host")) {
+            return null;
+        }
+        return hostList.get(vmConf.getInt("host"));
     }
 
     public static Host createHost(JSONObject hostConf) {
@@ -76,6 +126,10 @@ public class commons {
                 hostConf.getLong("storage"),
                 peList
         );
+        // an overcommitted host shares its PEs between more VM PEs than it has
+        if (hostConf.optDouble("pe_overcommit", 1) > 1) {
+            host.setVmScheduler(new VmSchedulerTimeShared());
+        }
 
         return host;
     }
@@ -136,69 +190,100 @@ public class commons {
 
     /**
      * Computes and print the cost ($) of resources (processing, bw, memory, storage)
-     * for each VM inside the datacenter.
+     * for each VM, and their totals in every datacenter.
      */
-    public static void printTotalVmsCost(Datacenter datacenter0, DatacenterBroker broker0) {
+    public static void printTotalVmsCost(List<Datacenter> datacenters, DatacenterBroker broker0) {
         System.out.println();
-        double totalCost = 0.0;
-        int totalNonIdleVms = 0;
-        double processingTotalCost = 0, memoryTotaCost = 0, storageTotalCost = 0, bwTotalCost = 0;
         for (final Vm vm : broker0.getVmCreatedList()) {
-            final var cost = new MyVmCost(vm);
-            processingTotalCost += cost.getProcessingCost();
-            memoryTotaCost += cost.getMemoryCost();
-            storageTotalCost += cost.getStorageCost();
-            bwTotalCost += cost.getBwCost();
+            System.out.println(new MyVmCost(vm));
+        }
+        for (final Datacenter datacenter : datacenters) {
+            printVmsCost(vmsIn(datacenter, broker0), "DC " + datacenter.getId());
+        }
+        if (datacenters.size() > 1) {
+            printVmsCost(new ArrayList<>(broker0.getVmCreatedList()), "all DCs");
+        }
+    }
 
-            totalCost += cost.getTotalCost();
+    private static void printVmsCost(List<Vm> vms, String where) {
+        int totalNonIdleVms = 0;
+        for (final Vm vm : vms) {
             totalNonIdleVms += vm.getTotalExecutionTime() > 0 ? 1 : 0;
-            System.out.println(cost);
         }
-
+        double[] cost = vmsCost(vms);
         System.out.printf(
-                "Total cost ($) for %3d created VMs from %3d in DC %d: %8.2f$ %13.2f$ %17.2f$ %12.2f$ %15.2f$%n",
-                totalNonIdleVms, broker0.getVmsNumber(), datacenter0.getId(),
-                processingTotalCost, memoryTotaCost, storageTotalCost, bwTotalCost, totalCost);
+                "Total cost ($) for %3d created VMs from %3d in %s: %8.2f$ %13.2f$ %17.2f$ %12.2f$ %15.2f$%n",
+                totalNonIdleVms, vms.size(), where, cost[0], cost[1], cost[2], cost[3], cost[4]);
     }
 
-    /**
-     * Computes and print the cost ($) of resources (processing, bw, memory, storage)
-     * for each VM inside the datacenter.
-     */
-    public static void exportResult(Datacenter datacenter0, DatacenterBroker broker0) {
-        double totalCost = 0.0;
-        double processingTotalCost = 0, memoryTotaCost = 0, storageTotalCost = 0, bwTotalCost = 0;
+    /** The created VMs of the broker that run on a host of the datacenter. */
+    private static List<Vm> vmsIn(Datacenter datacenter, DatacenterBroker broker0) {
+        List<Vm> vms = new ArrayList<>();
         for (final Vm vm : broker0.getVmCreatedList()) {
-            final var cost = new MyVmCost(vm);
-            processingTotalCost += cost.getProcessingCost();
-            memoryTotaCost += cost.getMemoryCost();
-            storageTotalCost += cost.getStorageCost();
-            bwTotalCost += cost.getBwCost();
+            if (vm.getHost().getDatacenter() == datacenter) {
+                vms.add(vm);
+            }
+        }
+        return vms;
+    }
 
-            totalCost += cost.getTotalCost();
+    /** Processing, memory, storage, bandwidth and total cost ($) of the VMs. */
+    private static double[] vmsCost(List<Vm> vms) {
+        double[] cost = new double[5];
+        for (final Vm vm : vms) {
+            final var vmCost = new MyVmCost(vm);
+            cost[0] += vmCost.getProcessingCost();
+            cost[1] += vmCost.getMemoryCost();
+            cost[2] += vmCost.getStorageCost();
+            cost[3] += vmCost.getBwCost();
+            cost[4] += vmCost.getTotalCost();
         }
-        System.out.println();
+        return cost;
+    }
 
+    private static Map<String, Object> costMap(double[] cost) {
         Map<String, Object> jsonMap = new HashMap<>();
+        jsonMap.put("processingCost", BigDecimal.valueOf(cost[0]));
+        jsonMap.put("memoryCost", BigDecimal.valueOf(cost[1]));
+        jsonMap.put("storageCost", BigDecimal.valueOf(cost[2]));
+        jsonMap.put("bandwidthCost", BigDecimal.valueOf(cost[3]));
+        jsonMap.put("totalCost", BigDecimal.valueOf(cost[4]));
+        return jsonMap;
+    }
+
+    /**
+     * Computes the cost ($) of resources (processing, bw, memory, storage)
+     * of all datacenters, and of each one under "datacenters", and the makespan,
+     * writes them to results/{name}_sim_results.json of the output directory
+     * and returns the same JSON.
+     */
+    public static String exportResult(List<Datacenter> datacenters, DatacenterBroker broker0) {
+        System.out.println();
+
+        Map<String, Object> jsonMap = costMap(vmsCost(new ArrayList<>(broker0.getVmCreatedList())));
         jsonMap.put("vmCount", broker0.getVmsNumber());
-        jsonMap.put("datacenterId", datacenter0.getId());
-        jsonMap.put("processingCost", BigDecimal.valueOf(processingTotalCost));
-        jsonMap.put("memoryCost", BigDecimal.valueOf(memoryTotaCost));
-        jsonMap.put("storageCost", BigDecimal.valueOf(storageTotalCost));
-        jsonMap.put("bandwidthCost", BigDecimal.valueOf(bwTotalCost));
-        jsonMap.put("totalCost", BigDecimal.valueOf(totalCost));
+        List<Map<String, Object>> datacenterCosts = new ArrayList<>();
+        for (final Datacenter datacenter : datacenters) {
+            List<Vm> vms = vmsIn(datacenter, broker0);
+            Map<String, Object> datacenterCost = costMap(vmsCost(vms));
+            datacenterCost.put("datacenterId", datacenter.getId());
+            datacenterCost.put("vmCount", vms.size());
+            datacenterCosts.add(datacenterCost);
+        }
+        jsonMap.put("datacenters", datacenterCosts);
         jsonMap.put("makespan", broker0.getShutdownTime());
 
         Gson gson = new GsonBuilder().setPrettyPrinting().create();
         String jsonOutput = gson.toJson(jsonMap);
 
-        String filePath = "results/" + Simulation.name + "_sim_results.json";
+        String filePath = Simulation.outputPath("results/" + Simulation.name + "_sim_results.json");
         try (FileWriter fileWriter = new FileWriter(filePath)) {
             fileWriter.write(jsonOutput);
             System.out.println("JSON data successfully written to " + filePath);
         } catch (IOException e) {
             e.printStackTrace();
         }
+        return jsonOutput;
     }
 
 }
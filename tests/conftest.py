@@ -0,0 +1,75 @@
+import json
+import os
+import random
+import sys
+
+import pytest
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(THIS_DIR, ".."))
+
+sys.path[:0] = [ROOT_DIR, os.path.join(ROOT_DIR, "lca")]
+
+import util as top_level_util  # nopep8
+from lca import util  # nopep8
+from lca.MO_LCA import MO_LCA  # nopep8
+from lca.config import CloudSimConfigGenerator  # nopep8
+from lca.cost_config import configs as cost_configs  # nopep8
+from lca.stopping import StoppingRules  # nopep8
+
+# a small league that plays one season, without parameter files or logs
+LCA_PARAMS = {"L": 4, "S": 1, "p_c": 0.3, "PSI1": 0.2, "PSI2": 1, "q0": 1,
+              "path_w": None}
+
+
+@pytest.fixture
+def generate_config():
+    """Generates the config of a type, seeded by the type."""
+    def generate(config_type=1, mode="time"):
+        random.seed(config_type)
+        return CloudSimConfigGenerator(config_type, mode).generate_config()
+    return generate
+
+
+@pytest.fixture
+def make_lca():
+    """
+    Builds an MO_LCA for the given problem data, with LCA_PARAMS and
+    cost_configs[2] unless overridden by keyword.
+    """
+    def make(vms, cloudlets, mode="time", cls=MO_LCA, **kwargs):
+        params = dict(LCA_PARAMS, n=len(cloudlets), max_xi=len(vms) - 1,
+                      mode=mode, vms=vms, cloudlets=cloudlets,
+                      cost_config=cost_configs[2], stopping=StoppingRules())
+        params.update(kwargs)
+        return cls(**params)
+    return make
+
+
+@pytest.fixture
+def configs_dir(tmp_path, monkeypatch, generate_config):
+    """
+    A configs directory in tmp_path with a multi-host config of type 7,
+    cost_configs[2] and the config arrays.
+    """
+    # the engines import util from lca/ as a top level module too
+    for module in (util, top_level_util):
+        monkeypatch.setattr(module, "CONFIGS_DIR", str(tmp_path))
+    monkeypatch.delenv(util.SHARED_CONFIG_ENV, raising=False)
+    config = generate_config(7)
+    with open(tmp_path / "sim_config.json", "w") as f:
+        json.dump(config, f)
+    with open(tmp_path / "sim_cost_config.json", "w") as f:
+        json.dump(cost_configs[2], f)
+    util.write_config_arrays(config)
+    return tmp_path
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    """OUTPUT_DIR in tmp_path, with the results/ and lca/ log directories."""
+    directory = tmp_path / "output"
+    for name in ("results", "lca"):
+        (directory / name).mkdir(parents=True)
+    monkeypatch.setenv("OUTPUT_DIR", str(directory))
+    return directory
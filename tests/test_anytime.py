@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from lca.anytime import schedule
+from lca.cost_config import configs as cost_configs
+from lca.stopping import StoppingRules
+
+PARAMS = {"L": 8, "S": 3, "p_c": 0.3, "PSI1": 0.2, "PSI2": 1, "q0": 1,
+          "stopping": StoppingRules()}
+
+
+@pytest.fixture
+def make_problem(generate_config):
+    def make(config_type=1):
+        config = generate_config(config_type)
+        return config["vms"], config["cloudlets"], cost_configs[2]
+    return make
+
+
+def test_plays_all_seasons_without_deadline(make_problem):
+    vms, cloudlets, cost_config = make_problem()
+    weeks = []
+    vm_indices, f_best, stop_reason = schedule(
+        vms, cloudlets, cost_config, rng=np.random.default_rng(0),
+        callback=lambda t, team, f: weeks.append((t, team, f)), **PARAMS)
+
+    assert stop_reason == "seasons"
+    assert [t for t, _, _ in weeks] == list(range(1, 3 * 7 + 1))
+    fitness = [f for _, _, f in weeks]
+    assert fitness == sorted(fitness, reverse=True)
+    assert weeks[-1][1] == vm_indices and weeks[-1][2] == f_best
+    assert len(vm_indices) == len(cloudlets)
+    assert all(0 <= vm < len(vms) for vm in vm_indices)
+
+
+def test_returns_best_so_far_at_the_deadline(make_problem):
+    vms, cloudlets, cost_config = make_problem()
+    params = dict(PARAMS, S=10**6)
+    vm_indices, f_best, stop_reason = schedule(
+        vms, cloudlets, cost_config, deadline_ms=100,
+        rng=np.random.default_rng(0), **params)
+
+    assert stop_reason == "deadline"
+    assert len(vm_indices) == len(cloudlets)
+    assert f_best > 0
+
+
+def test_warm_start_from_the_previous_round(make_problem):
+    vms, cloudlets, cost_config = make_problem()
+    previous, f_previous, _ = schedule(
+        vms, cloudlets, cost_config, rng=np.random.default_rng(0), **PARAMS)
+
+    weeks = []
+    schedule(vms, cloudlets, cost_config, rng=np.random.default_rng(1),
+             warm_start=[previous], callback=lambda t, team, f: weeks.append(f),
+             **PARAMS)
+
+    assert weeks[0] == f_previous
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from lca.config import StreamingConfigGenerator, param_ranges
+from lca.util import read_json, records_to_array, sort_vms
+
+CONFIG_TYPES = [config_type for config_type in param_ranges if config_type != 0]
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+def test_arrays_match_the_json_dicts(config_type, mode, generate_config,
+                                     make_lca):
+    config = generate_config(config_type, mode)
+    vm_array = records_to_array(config["vms"])
+    cloudlet_array = records_to_array(config["cloudlets"])
+
+    assert cloudlet_array.dtype.names == tuple(config["cloudlets"][0])
+    assert vm_array[0]["vm_mips"] == config["vms"][0]["vm_mips"]
+
+    vms, original_indices = sort_vms(config["vms"])
+    sorted_array, array_indices = sort_vms(vm_array)
+    assert array_indices == original_indices
+
+    X = np.random.default_rng(abs(config_type)).integers(
+        0, len(vms), size=(4, len(config["cloudlets"])))
+    np.testing.assert_allclose(
+        make_lca(sorted_array, cloudlet_array, mode).fitness(X),
+        make_lca(vms, config["cloudlets"], mode).fitness(X))
+
+
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+def test_streamed_json_matches_its_arrays(config_type, tmp_path):
+    generator = StreamingConfigGenerator(
+        config_type, "space", cloudlet_count=2500, chunk_size=1000,
+        rng=np.random.default_rng(abs(config_type)))
+    assert generator.write(str(tmp_path)) == 2500
+
+    config = read_json(str(tmp_path / "sim_config.json"))
+    vms = np.load(tmp_path / "sim_config.vms.npy")
+    cloudlets = np.load(tmp_path / "sim_config.cloudlets.npy")
+    assert config["mode"] == "space"
+    assert records_to_array(config["vms"]).tolist() == vms.tolist()
+    assert records_to_array(config["cloudlets"]).tolist() == cloudlets.tolist()
+    assert records_to_array(config["hosts"]).tolist() == \
+        np.load(tmp_path / "sim_config.hosts.npy").tolist()
+    assert 0 <= vms["host"].min() and vms["host"].max() < len(config["hosts"])
+
+    lengths = param_ranges[config_type]["cloudlet"]["length"]
+    assert lengths[0] <= cloudlets["length"].min()
+    assert cloudlets["length"].max() <= lengths[1]
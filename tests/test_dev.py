@@ -0,0 +1,33 @@
+import numpy as np
+
+from lca.dev import LeagueChampionshipAlgorithm
+from lca.stopping import StoppingRules
+
+TARGET = np.random.default_rng(0).integers(0, 5, size=40).tolist()
+
+
+class DistanceLCA(LeagueChampionshipAlgorithm):
+    """Pure python league minimizing the distance to a fixed team."""
+
+    def configure(self):
+        self.calc_fitness = self.distance
+
+    def distance(self, x):
+        return 1 + sum(abs(xi - ti) for xi, ti in zip(x, TARGET))
+
+
+def play(seed):
+    lca = DistanceLCA(L=6, S=3, n=len(TARGET), p_c=0.3, PSI1=0.2, PSI2=1,
+                      q0=1, max_xi=4, path_w=None,
+                      rng=np.random.default_rng(seed), stopping=StoppingRules())
+    lca.league()
+    return lca
+
+
+def test_seed_reproduces_the_league():
+    first, again, other = play(3), play(3), play(4)
+    assert len(first.f_bList) == 3 * 5
+    assert first.f_bList == again.f_bList
+    assert first.B == again.B
+    assert first.f_bList != other.f_bList
+    assert first.f_bList[-1] <= first.f_bList[0]
@@ -0,0 +1,197 @@
+import random
+
+import numpy as np
+import pytest
+
+from lca import jit_kernels
+from lca.MO_LCA import MO_LCA
+from lca.Vectorized_cost_LCA import Vectorized_cost_LCA
+from lca.Vectorized_makespan_LCA import Vectorized_makespan_LCA
+from lca.config import CloudSimConfigGenerator, param_ranges
+from lca.cost_LCA import cost_LCA
+from lca.cost_config import configs as cost_configs
+from lca.makespan_LCA import makespan_LCA
+from lca.problem import ProblemInstance
+from lca.stopping import StoppingRules
+from lca.util import sort_vms
+
+CONFIG_TYPES = [config_type for config_type in param_ranges if config_type != 0]
+L = 8
+LEAGUES = {cls.__name__: cls for cls in (
+    MO_LCA, makespan_LCA, cost_LCA, Vectorized_makespan_LCA, Vectorized_cost_LCA)}
+
+
+def load_config(config_type, mode):
+    random.seed(config_type)
+    config = CloudSimConfigGenerator(config_type, mode).generate_config()
+    vms, _ = sort_vms(config["vms"])
+    problem = ProblemInstance.from_config(
+        vms, config["cloudlets"], cost_configs[2], mode)
+    X = np.random.default_rng(config_type + 1).integers(
+        0, problem.num_vms, size=(L, problem.n)).astype(float)
+    return problem, X
+
+
+def make_league(name, problem, **kwargs):
+    """
+    A league of LEAGUES for the problem of load_config, all parameters are
+    passed in, so LCA_parameters.json is not read.
+    """
+    return LEAGUES[name](
+        L=L, S=2, p_c=0.3, PSI1=0.2, PSI2=1, q0=1, path_w=None,
+        stopping=StoppingRules(), n=problem.n, max_xi=problem.num_vms - 1,
+        mode=problem.mode, problem=problem, **kwargs)
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+def test_batched_matches_single_team(config_type, mode):
+    problem, X = load_config(config_type, mode)
+    lca = make_league("MO_LCA", problem)
+
+    makespans, vm_makespans = lca.makespan(X)
+    costs = lca.cost(X)
+    for l, x in enumerate(X):
+        makespan, vms_makespan = lca.makespan(x)
+        assert makespan == pytest.approx(makespans[l])
+        assert np.allclose(vms_makespan, vm_makespans[l])
+        assert lca.cost(x) == pytest.approx(costs[l])
+    assert np.allclose(lca.Z_incremental(X), lca.Z(X))
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+def test_objectives_run_the_makespan_kernel_once(mode):
+    problem, X = load_config(1, mode)
+    lca = make_league("MO_LCA", problem)
+    expected_makespans, expected_vm_makespans = lca.makespan(X)
+    expected_z = lca.scalarize(lca.cost(X), expected_makespans)
+
+    calls = []
+    makespan = lca.makespan
+    lca.makespan = lambda x: calls.append(x) or makespan(x)
+    makespans, vm_makespans, costs = lca.objectives(X)
+    assert len(calls) == 1
+    np.testing.assert_allclose(makespans, expected_makespans)
+    np.testing.assert_allclose(vm_makespans, expected_vm_makespans)
+    np.testing.assert_allclose(costs, lca.cost_from_makespans(
+        expected_makespans, expected_vm_makespans))
+
+    calls.clear()
+    np.testing.assert_allclose(lca.Z(X), expected_z)
+    makespan, _, cost = lca.objectives(X[0])
+    assert np.ndim(makespan) == 0 and cost == pytest.approx(costs[0])
+    assert len(calls) == 2
+
+
+def space_shared_loop(segments, ext_times, segment_pes, size):
+    """Every cloudlet in order on the first free PE of its segment."""
+    pe_times = [[0.0] * pes for pes in segment_pes]
+    for segment, ext_time in zip(segments, ext_times):
+        times = pe_times[segment]
+        times[times.index(min(times))] += ext_time
+    return np.array([max(times) for times in pe_times])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_space_shared_segments_match_the_loop(seed):
+    problem, _ = load_config(-1, "space")
+    lca = make_league("MO_LCA", problem)
+    rng = np.random.default_rng(seed)
+    size = 12
+    segment_pes = rng.choice([1, 2, 4, 8, 16], size=size)
+    # up to 3 times as many cloudlets as PEs, the last segment has none
+    counts = rng.integers(0, 3 * segment_pes + 1)
+    counts[-1] = 0
+    segments = rng.permutation(np.repeat(np.arange(size), counts))
+    ext_times = rng.uniform(1.0, 10.0, size=segments.size)
+
+    np.testing.assert_allclose(
+        lca._space_shared_segments(segments, ext_times, segment_pes, size),
+        space_shared_loop(segments, ext_times, segment_pes, size))
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+def test_incremental_state_follows_random_walk(mode):
+    problem, X = load_config(1, mode)
+    lca = make_league("MO_LCA", problem)
+    rng = np.random.default_rng(7)
+    rebuilds = []
+    init_team_state = lca.init_team_state
+    lca.init_team_state = lambda x: rebuilds.append(x) or init_team_state(x)
+
+    # team 0 keeps three cloudlets on VM 0, fewer than its PEs
+    X[0] = rng.integers(1, problem.num_vms, size=problem.n)
+    on_vm0 = rng.choice(problem.n, size=3, replace=False)
+    X[0, on_vm0] = 0
+    lca.Z_incremental(X)
+    assert len(rebuilds) == 1
+
+    def check(X):
+        np.testing.assert_allclose(lca.Z_incremental(X), lca.Z(X))
+        np.testing.assert_allclose(
+            lca.state_vm_makespans.reshape(L, problem.num_vms), lca.makespan(X)[1])
+
+    # VM 0 of team 0 loses its longest cloudlet
+    X = X.copy()
+    X[0, on_vm0[np.argmax(problem.cloudlet_lengths[on_vm0])]] = 1
+    check(X)
+    for _ in range(20):
+        X = X.copy()
+        moved = rng.random(X.shape) < 0.05
+        X[moved] = rng.integers(0, problem.num_vms, size=moved.sum())
+        check(X)
+    assert len(rebuilds) == 1
+
+    # more genes than incremental_threshold moved, the state is rebuilt
+    X = X.copy()
+    moved = rng.random(X.shape) < 2 * lca.incremental_threshold
+    X[moved] = (X[moved] + 1) % problem.num_vms
+    check(X)
+    assert len(rebuilds) == 2
+    X = X.copy()
+    X[:, 0] = (X[:, 0] + 1) % problem.num_vms
+    check(X)
+    assert len(rebuilds) == 2
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+def test_jit_matches_numpy(config_type, mode):
+    pytest.importorskip("numba")
+    problem, X = load_config(config_type, mode)
+
+    numpy_lca = make_league("MO_LCA", problem)
+    jit_lca = make_league("MO_LCA", problem, backend="jit")
+    assert np.allclose(jit_lca.makespan(X)[1], numpy_lca.makespan(X)[1])
+    assert np.allclose(jit_lca.cost(X), numpy_lca.cost(X))
+    assert np.allclose(jit_lca.Z(X), numpy_lca.Z(X))
+
+    for name in ("makespan_LCA", "cost_LCA"):
+        numpy_lca = make_league(name, problem)
+        jit_lca = make_league(name, problem, backend="jit")
+        for x in X:
+            assert jit_lca.calc_fitness(x) == pytest.approx(
+                numpy_lca.calc_fitness(x))
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+def test_vectorized_variants_match_reference(config_type, mode):
+    problem, X = load_config(config_type, mode)
+
+    for name in ("makespan_LCA", "cost_LCA"):
+        reference = make_league(name, problem)
+        vectorized = make_league(f"Vectorized_{name}", problem)
+        expected = [reference.calc_fitness(x) for x in X]
+        assert np.allclose(vectorized.calc_fitness_batch(X), expected)
+        assert np.allclose(vectorized.fitness(X), reference.fitness(X))
+
+
+def test_jit_falls_back_without_numba(monkeypatch):
+    problem, _ = load_config(-1, "time")
+    monkeypatch.setattr(jit_kernels, "NUMBA_AVAILABLE", False)
+
+    lca = make_league("MO_LCA", problem, backend="jit")
+    assert lca.backend == "numpy"
+    with pytest.raises(ValueError):
+        jit_kernels.resolve_backend("cuda")
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from algorithms.greedy import SCHEDULERS, GreedyScheduler
+from lca.config import param_ranges
+from lca.util import sort_vms
+
+CONFIG_TYPES = [config_type for config_type in param_ranges if config_type != 0]
+
+
+@pytest.fixture
+def problem(generate_config, make_lca):
+    """MO_LCA, sorted VMs and cloudlets of a config type."""
+    def build(config_type, mode):
+        config = generate_config(config_type, mode)
+        vms, _ = sort_vms(config["vms"])
+        return make_lca(vms, config["cloudlets"], mode), vms, config["cloudlets"]
+    return build
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+def test_makespan_model_matches_mo_lca(config_type, mode, problem):
+    lca, vms, cloudlets = problem(config_type, mode)
+    scheduler = GreedyScheduler(vms, cloudlets, mode)
+    # in cloudlet order the space shared PEs are taken in the same order too
+    team = scheduler.minimum_completion_time(range(len(cloudlets)))
+
+    makespan, vm_makespans = lca.makespan(team)
+    np.testing.assert_allclose(scheduler.makespans, vm_makespans)
+    assert np.max(scheduler.makespans) == pytest.approx(makespan)
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+@pytest.mark.parametrize("name", sorted(SCHEDULERS))
+def test_schedulers_beat_round_robin(name, mode, problem):
+    lca, vms, cloudlets = problem(1, mode)
+    team = SCHEDULERS[name](vms, cloudlets, mode)
+
+    assert len(team) == len(cloudlets)
+    assert team.min() >= 0 and team.max() < len(vms)
+    assert lca.makespan(team)[0] < lca.makespan(lca.round_robin())[0]
+
+
+class CheckedScheduler(GreedyScheduler):
+    """GreedyScheduler that checks every VM it picks against all VMs."""
+
+    def assign(self, cloudlet, vm):
+        completion_times = self.completion_times(self.lengths[cloudlet])
+        assert completion_times[vm] == completion_times.min()
+        super().assign(cloudlet, vm)
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+# all but the 10000 cloudlets of type 8, every one checked against all VMs
+@pytest.mark.parametrize("config_type", CONFIG_TYPES[:-1])
+def test_heaps_pick_the_minimum_completion_time(config_type, mode, generate_config):
+    config = generate_config(config_type, mode)
+    vms, _ = sort_vms(config["vms"])
+    cloudlets = config["cloudlets"]
+    lengths = np.array([cloudlet["length"] for cloudlet in cloudlets])
+    for order in (range(len(cloudlets)), np.argsort(lengths, kind="stable"),
+                  np.argsort(-lengths, kind="stable")):
+        CheckedScheduler(vms, cloudlets, mode).minimum_completion_time(order)
+
+
+def test_space_shared_runs_cloudlets_in_placement_order(generate_config, make_lca):
+    config = generate_config(-1, "space")
+    vms = [dict(config["vms"][0], vm_pes=2)]
+    cloudlets = [dict(cloudlet, length=length)
+                 for cloudlet, length in zip(config["cloudlets"], (1000, 1000, 2000))]
+    lca = make_lca(vms, cloudlets, "space")
+    mips = vms[0]["vm_mips"]
+
+    # Max-Min runs the longest cloudlet first, next to the two short ones
+    scheduler = GreedyScheduler(vms, cloudlets, "space")
+    team = scheduler.minimum_completion_time([2, 0, 1])
+    assert scheduler.makespans[0] == pytest.approx(2000 / mips)
+    # MO_LCA runs the two short ones first, then the long one after them
+    assert lca.makespan(team)[0] == pytest.approx(3000 / mips)
+
+    scheduler = GreedyScheduler(vms, cloudlets, "space")
+    team = scheduler.minimum_completion_time(range(3))
+    assert scheduler.makespans[0] == pytest.approx(lca.makespan(team)[0])
@@ -0,0 +1,82 @@
+import importlib
+import json
+
+import numpy as np
+import pytest
+
+from algorithms.greedy import GreedyScheduler
+from lca.config import param_ranges
+from lca.util import host_mips_share, sort_vms
+
+CONFIG_TYPES = [config_type for config_type in param_ranges if config_type != 0]
+
+
+@pytest.mark.parametrize("config_type", CONFIG_TYPES)
+def test_vms_fit_on_their_hosts(config_type, generate_config):
+    config = generate_config(config_type)
+    params = param_ranges[config_type]
+    hosts = config["hosts"]
+
+    assert len(hosts) == params["num_hosts"][0]
+    assert {host["datacenter"] for host in hosts} == \
+        set(range(params.get("num_datacenters", 1)))
+    used = np.zeros((len(hosts), 4))
+    for vm in config["vms"]:
+        # overcommit only shares PEs between VMs, CloudSim rejects a VM
+        # with more PEs than its host
+        assert vm["vm_pes"] <= hosts[vm["host"]]["pes"]
+        used[vm["host"]] += [vm["vm_pes"], vm["vm_ram"], vm["vm_bw"], vm["vm_size"]]
+    capacity = np.array([[host["pes"] * host.get("pe_overcommit", 1), host["ram"],
+                          host["bw"], host["storage"]] for host in hosts])
+    assert np.all(used <= capacity)
+
+
+def test_only_overcommitted_hosts_slow_their_vms_down(generate_config):
+    for config_type in (1, 7):
+        config = generate_config(config_type)
+        assert np.all(host_mips_share(config["vms"], config["hosts"]) == 1)
+
+    config = generate_config(8)
+    share = host_mips_share(config["vms"], config["hosts"])
+    assert 0 < share.min() < 1 and np.all(share <= 1)
+
+
+@pytest.mark.parametrize("mode", ["time", "space"])
+def test_contention_raises_the_makespan_not_the_price(mode, generate_config,
+                                                     make_lca):
+    config = generate_config(8, mode)
+    vms, _ = sort_vms(config["vms"])
+    cloudlets = config["cloudlets"]
+
+    free = make_lca(vms, cloudlets, mode)
+    contended = make_lca(vms, cloudlets, mode, hosts=config["hosts"])
+    share = host_mips_share(vms, config["hosts"])
+    np.testing.assert_allclose(contended.vm_mips, free.vm_mips * share)
+    np.testing.assert_allclose(contended.vm_cost_coef, free.vm_cost_coef)
+
+    team = free.round_robin()
+    _, free_makespans = free.makespan(team)
+    _, contended_makespans = contended.makespan(team)
+    assert np.all(contended_makespans >= free_makespans - 1e-9)
+    assert np.any(contended_makespans > free_makespans)
+
+    # the greedy seeders see the same slowed down VMs
+    scheduler = GreedyScheduler(vms, cloudlets, mode, config["hosts"])
+    np.testing.assert_allclose(scheduler.vm_mips, contended.vm_mips)
+
+
+@pytest.mark.parametrize("name", ["MO_LCA", "makespan_LCA", "cost_LCA",
+                                  "Vectorized_makespan_LCA", "Vectorized_cost_LCA"])
+def test_warm_start_seeds_see_the_hosts(name, configs_dir, monkeypatch):
+    monkeypatch.setenv("LCA_PARAMETERS", json.dumps(
+        {"L": 4, "S": 1, "p_c": 0.3, "PSI1": 0.2, "PSI2": 1, "q0": 1}))
+    module = importlib.import_module(name)
+    seeded = []
+    monkeypatch.setattr(module, "warm_start_teams",
+                        lambda *args, hosts=None: seeded.append(hosts) or [])
+    module.load()
+    module.build(path_w=None)
+
+    hosts, = seeded
+    with open(configs_dir / "sim_config.json") as f:
+        assert len(hosts) == len(json.load(f)["hosts"]) > 1
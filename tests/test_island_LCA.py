@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from lca import island_LCA
+
+
+@pytest.fixture
+def run(configs_dir, monkeypatch):
+    # 4 teams play 3 weeks a season, 12 weeks in all
+    monkeypatch.setenv("LCA_PARAMETERS", json.dumps(
+        {"L": 4, "S": 4, "p_c": 0.3, "PSI1": 0.2, "PSI2": 1, "q0": 1}))
+
+    def run_islands(topology, islands=2, seed=3):
+        return island_LCA.run_islands("MO_LCA", islands=islands,
+                                      migration_interval=5, topology=topology,
+                                      seed=seed)
+    return run_islands
+
+
+@pytest.mark.parametrize("topology", ["ring", "all"])
+def test_islands_migrate_every_interval(run, topology):
+    results = run(topology)
+    assert [result["island"] for result in results] == [0, 1]
+    for result in results:
+        # not in the last week, the league has finished then
+        assert result["migration_weeks"] == [5, 10]
+        assert result["migrations"] == 2
+
+    # with two islands both topologies send to the other island
+    for result, sender in zip(results, reversed(results)):
+        for week in result["migration_weeks"]:
+            # f_bList[week - 1] is the f_best the sender had after week,
+            # a week later the receiver is at least as good
+            assert result["f_bList"][week] <= sender["f_bList"][week - 1]
+
+
+def test_seeded_islands_reproduce(run):
+    def trajectories(results):
+        return [(result["fitness"], result["f_bList"], result["team"].tolist())
+                for result in results]
+
+    first = trajectories(run("ring"))
+    assert trajectories(run("ring")) == first
+    assert trajectories(run("ring", seed=4)) != first
+    assert first[0][1] != first[1][1]
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from lca import multistart
+from lca.util import spawn_rngs
+
+RESTARTS = 3
+
+
+@pytest.fixture
+def run(configs_dir, output_dir, monkeypatch):
+    monkeypatch.setenv("LCA_PARAMETERS", json.dumps(
+        {"L": 4, "S": 2, "p_c": 0.3, "PSI1": 0.2, "PSI2": 1, "q0": 1}))
+
+    def run_multistart(seed=11):
+        multistart.run_multistart("MO_LCA", RESTARTS, workers=2, seed=seed)
+        with open(output_dir / "results" / "MO_LCA_result.json") as f:
+            result = json.load(f)
+        with open(output_dir / "MO_LCA_schedule.json") as f:
+            schedule = json.load(f)["schedule"]
+        for restart in result["restarts"]:
+            del restart["run_time"]
+        return result, schedule
+    return run_multistart
+
+
+def test_the_best_restart_is_exported(run):
+    result, schedule = run()
+    restarts = result["restarts"]
+    assert [restart["restart"] for restart in restarts] == list(range(RESTARTS))
+    best = min(restarts, key=lambda restart: restart["fitness"])
+    assert result["best_restart"] == best["restart"]
+    assert result["fitness"] == pytest.approx(best["fitness"])
+    assert len(schedule) == 1000
+
+
+def test_seeded_runs_reproduce_on_distinct_streams(run):
+    result, schedule = run()
+    again, schedule_again = run()
+    assert [r["fitness"] for r in again["restarts"]] == \
+        [r["fitness"] for r in result["restarts"]]
+    assert schedule_again == schedule
+
+    # every restart plays its own spawned stream, the same one in process
+    fitness = [restart["fitness"] for restart in result["restarts"]]
+    assert len(set(fitness)) == RESTARTS
+    multistart._init_worker("MO_LCA")
+    for index, rng in enumerate(spawn_rngs(11, RESTARTS)):
+        assert multistart._run_restart(index, rng)["fitness"] == fitness[index]
+
+    other, _ = run(seed=12)
+    assert [r["fitness"] for r in other["restarts"]] != fitness
@@ -0,0 +1,67 @@
+import json
+import os
+
+import numpy as np
+
+from lca import problem as problem_module, util
+from lca.cost_config import configs as cost_configs
+from lca.problem import ProblemInstance
+
+
+def test_second_load_maps_the_cached_arrays(configs_dir):
+    problem = ProblemInstance.load()
+    assert os.path.dirname(problem.directory) == str(configs_dir / "cache")
+    matrix = problem.parallel_exec_times
+    assert os.path.exists(os.path.join(
+        problem.directory, "parallel_exec_times.npy"))
+
+    cached = ProblemInstance.load()
+    assert cached.directory == problem.directory
+    assert isinstance(cached.vm_mips, np.memmap)
+    assert isinstance(cached.parallel_exec_times, np.memmap)
+    np.testing.assert_array_equal(cached.parallel_exec_times, matrix)
+    assert cached.cost_config == problem.cost_config == cost_configs[2]
+    for name in ("original_indices", "vm_mips", "vm_pes", "vm_degree",
+                 "vm_cost_coef", "cloudlet_lengths"):
+        np.testing.assert_array_equal(getattr(cached, name),
+                                      getattr(problem, name))
+
+
+def test_config_edits_change_the_key(configs_dir):
+    directory = ProblemInstance.load().directory
+    with open(configs_dir / "sim_cost_config.json", "w") as f:
+        json.dump(cost_configs[1], f)
+    problem = ProblemInstance.load()
+    assert problem.directory != directory
+
+    cost_config = cost_configs[1]
+    _, vms, _, _ = util.get_config_arrays()
+    vms, _ = util.sort_vms(vms)
+    power_x = 1 + cost_config["x"]
+    np.testing.assert_allclose(
+        problem.vm_cost_coef,
+        cost_config["CostPerSecond"] * vms["vm_mips"] ** power_x *
+        vms["vm_pes"] / (1000 * cost_config["p_u"] ** power_x))
+
+
+def test_format_version_changes_the_key(configs_dir, monkeypatch):
+    directory = ProblemInstance.load().directory
+    monkeypatch.setattr(problem_module, "FORMAT_VERSION",
+                        problem_module.FORMAT_VERSION + 1)
+    monkeypatch.setattr(problem_module, "_keys", {})
+    assert ProblemInstance.load().directory != directory
+
+
+def test_arrays_match_the_config(configs_dir):
+    problem = ProblemInstance.load()
+    n, vms, cloudlets, mode = util.get_config_arrays()
+    vms, original_indices = util.sort_vms(vms)
+    share = util.host_mips_share(vms, util.get_host_array())
+
+    assert problem.mode == mode and problem.n == n
+    assert problem.original_indices.tolist() == original_indices
+    np.testing.assert_array_equal(problem.vm_mips, vms["vm_mips"] * share)
+    np.testing.assert_array_equal(problem.cloudlet_lengths, cloudlets["length"])
+    np.testing.assert_allclose(
+        problem.parallel_exec_times[3],
+        cloudlets["length"][3] / (problem.vm_mips * problem.vm_pes))
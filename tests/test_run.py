@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import signal
+
+import pytest
+
+import run
+
+
+def serve(monkeypatch, *lines):
+    """Runs the scheduler daemon on lines and returns its responses."""
+    monkeypatch.setattr("sys.stdin", io.StringIO("".join(
+        line + "\n" for line in lines)))
+    protocol = io.StringIO()
+    monkeypatch.setattr("sys.stdout", protocol)
+    run.serve(run.build_parser())
+    return [json.loads(line) for line in protocol.getvalue().splitlines()]
+
+
+def test_serve_answers_every_request(configs_dir, monkeypatch):
+    valid, malformed, unknown_job = serve(
+        monkeypatch,
+        json.dumps({"id": 1, "job": 2, "vm_scheduling_mode": "space"}),
+        "",
+        '{"id": 2, "job": ',
+        json.dumps({"id": 3, "job": 9}))
+
+    assert valid == {"id": 1, "ok": True,
+                     "output": "\n🐍 Editing configuration files...\n"
+                               "method changed to space shared\n"
+                               "✅ Configuration files edited successfully\n"}
+    with open(configs_dir / "sim_config.json") as f:
+        assert json.load(f)["mode"] == "space"
+
+    assert malformed["id"] is None and malformed["ok"] is False
+    assert "JSONDecodeError" in malformed["error"]
+    assert malformed["output"] == ""
+
+    assert unknown_job["id"] == 3 and unknown_job["ok"] is False
+    assert unknown_job["error"] == "job exited with status 2"
+    assert "--job: invalid choice: 9" in unknown_job["output"]
+
+
+def test_serve_passes_objects_as_json(monkeypatch):
+    parameters = {"L": 10, "S": 2, "warm_start": ["MCT"], "time_budget": None}
+    jobs = []
+    monkeypatch.setattr(run, "run_job", lambda args, in_process: jobs.append(args))
+    response, = serve(monkeypatch, json.dumps(
+        {"id": 5, "job": 0, "lca_parameters": parameters, "parallel": 2}))
+
+    assert response == {"id": 5, "ok": True, "output": ""}
+    args, = jobs
+    assert json.loads(args.lca_parameters) == parameters
+    assert args.parallel == 2
+
+
+def test_serve_rejects_the_daemon_job(monkeypatch):
+    response, = serve(monkeypatch, json.dumps({"id": 4, "job": 4}))
+    assert response["ok"] is False
+    assert "Job 4 can not be submitted to the daemon." in response["output"]
+
+
+STUB_ALGORITHM = """
+import os, sys, time
+name = sys.stdin.read()
+started = os.path.join(os.path.dirname(__file__), "started")
+if name == "slow":
+    open(started, "w").close()
+    time.sleep(60)
+else:
+    # fails once the slow algorithm is running
+    while not os.path.exists(started):
+        time.sleep(0.01)
+    sys.exit(1)
+"""
+
+
+def test_run_parallel_fails_fast(tmp_path, output_dir, monkeypatch, capsys):
+    directory = tmp_path / "stub"
+    directory.mkdir()
+    (directory / "main.py").write_text(STUB_ALGORITHM)
+    processes = []
+    popen = run.subprocess.Popen
+    monkeypatch.setattr(run.subprocess, "Popen", lambda *args, **kwargs:
+                        processes.append(popen(*args, **kwargs)) or processes[-1])
+
+    algorithms = [{"directory": str(directory), "name": name}
+                  for name in ("slow", "failing")]
+    with pytest.raises(SystemExit) as error:
+        run.run_parallel(algorithms, 2, "mvn")
+    assert error.value.code == 1
+    assert f"❌ Failed to optimize {directory}/failing" in capsys.readouterr().out
+
+    # the failing algorithm exited, the slow one was terminated
+    assert sorted(process.wait(timeout=10) for process in processes) == \
+        [-signal.SIGTERM, 1]
+
+
+class StubProcess:
+    """A resident simulator that keeps running until closed."""
+
+    def __init__(self, *args, **kwargs):
+        self.stdin = io.StringIO()
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        self.returncode = 0
+
+
+def test_simulation_server_per_logs_dir(tmp_path, output_dir, monkeypatch):
+    monkeypatch.setattr(run.subprocess, "Popen", StubProcess)
+    monkeypatch.setattr(run, "_simulation_servers", {})
+    monkeypatch.setattr(run.atexit, "register", lambda close: None)
+
+    server = run.get_simulation_server()
+    assert os.path.dirname(server.log_file) == str(output_dir / "logs")
+    assert os.path.exists(server.log_file)
+    assert run.get_simulation_server() is server
+
+    # a later run with its own output directory gets its own server and log
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path / "second"))
+    second = run.get_simulation_server()
+    assert second is not server
+    assert os.path.dirname(second.log_file) == str(tmp_path / "second" / "logs")
+
+    monkeypatch.setenv("OUTPUT_DIR", str(output_dir))
+    assert run.get_simulation_server() is server
+    server.close()
+    assert run.get_simulation_server() is not server
@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from lca import util
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def test_processes_attach_to_one_published_copy(configs_dir, make_lca):
+    with util.shared_config_arrays() as directory:
+        assert os.environ[util.SHARED_CONFIG_ENV] == directory
+        n, vms, cloudlets, mode = util.get_config_arrays()
+        assert cloudlets.filename.startswith(directory)
+        lengths = util.get_column(cloudlets, "length")
+        assert lengths.dtype == np.float64 and lengths.flags.c_contiguous
+        np.testing.assert_array_equal(lengths, cloudlets["length"])
+
+        vms, _ = util.sort_vms(vms)
+        lca = make_lca(vms, cloudlets, mode)
+        assert np.shares_memory(lca.cloudlet_lengths, lengths)
+
+        child = subprocess.run(
+            [sys.executable, "-c",
+             "import sys; sys.path[:0] = sys.argv[1:3]\n"
+             "from lca import util\n"
+             "util.CONFIGS_DIR = sys.argv[3]\n"
+             "n, vms, cloudlets, mode = util.get_config_arrays()\n"
+             "print(cloudlets.filename, n)",
+             ROOT_DIR, os.path.join(ROOT_DIR, "lca"), str(configs_dir)],
+            capture_output=True, text=True, check=True)
+        assert child.stdout.split()[-2:] == [cloudlets.filename, str(n)]
+
+    assert not os.path.exists(directory)
+    assert util.SHARED_CONFIG_ENV not in os.environ
+
+
+def test_a_changed_config_is_not_read_from_the_shared_copy(configs_dir,
+                                                          generate_config):
+    with util.shared_config_arrays() as directory:
+        config = generate_config(2, "space")
+        with open(configs_dir / "sim_config.json", "w") as f:
+            json.dump(config, f)
+
+        n, _, cloudlets, mode = util.get_config_arrays()
+        assert not cloudlets.filename.startswith(directory)
+        assert (n, mode) == (len(config["cloudlets"]), "space")
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from lca.MO_LCA import MO_LCA
+from lca.stopping import StoppingRules
+
+
+class FlatLCA(MO_LCA):
+    """MO_LCA whose fitness never improves, so every week stalls."""
+
+    def scalarize(self, cost, makespan):
+        return np.ones_like(makespan)
+
+
+@pytest.fixture
+def play(generate_config, make_lca):
+    """Plays a league of L=4 teams (3 weeks a season) with the given rules."""
+    config = generate_config(1)
+
+    def league(cls=MO_LCA, S=5, **rules):
+        lca = make_lca(config["vms"], config["cloudlets"], cls=cls, S=S,
+                       stopping=StoppingRules(**rules),
+                       rng=np.random.default_rng(0))
+        lca.league()
+        return lca.stop_reason, len(lca.f_bList)
+    return league
+
+
+def test_without_rules_all_seasons_are_played(play):
+    # the initial draw and S * (L - 1) - 1 weeks
+    assert play(S=2) == ("seasons", 6)
+
+
+def test_stall(play):
+    assert play(FlatLCA, stall_weeks=4) == ("stall", 5)
+
+
+def test_min_improvement(play):
+    assert play(FlatLCA, min_improvement=0.01, improvement_window=2) == \
+        ("min_improvement", 3)
+    # measured over one season of 3 weeks by default
+    assert play(FlatLCA, min_improvement=0.01) == ("min_improvement", 4)
+
+
+def test_time_budget(play):
+    # checked before the first week
+    assert play(S=10**6, time_budget=0) == ("time_budget", 1)
+
+
+def test_evaluation_budget(play):
+    # the initial draw evaluates L teams, every week L more
+    assert play(S=10**6, max_evaluations=4 * 4) == ("evaluation_budget", 4)
+
+
+def test_rules_need_enough_weeks(play):
+    assert play(FlatLCA, S=3, stall_weeks=100) == ("seasons", 9)
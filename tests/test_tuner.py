@@ -0,0 +1,82 @@
+import importlib
+import json
+
+import pytest
+
+from lca import tuner
+from lca.stopping import StoppingRules
+from lca.util import spawn_rngs
+
+CANDIDATES = [{"L": L, "p_c": p_c, "PSI1": 0.2, "PSI2": 1, "q0": 1}
+              for L in (4, 6) for p_c in (0.3, 0.6)]
+
+
+@pytest.fixture
+def tune(configs_dir, monkeypatch):
+    monkeypatch.setenv("LCA_PARAMETERS", json.dumps({"backend": "numpy"}))
+
+    def successive_halving(seed=5):
+        return tuner.successive_halving("MO_LCA", CANDIDATES, max_seasons=4,
+                                        eta=2, min_seasons=1, seed=seed)
+    return successive_halving
+
+
+def test_rungs_halve_the_candidates_on_equal_evaluations(tune):
+    result = tune()
+    # a season of the L=6 league, 5 weeks of 6 teams
+    assert tuner.season_evaluations(CANDIDATES) == 30
+    assert [(rung["seasons"], rung["evaluations"], rung["candidates"])
+            for rung in result["rungs"]] == [(1, 30, 4), (2, 60, 2), (4, 120, 1)]
+
+    ranking = result["ranking"]
+    assert sorted(json.dumps(entry["params"]) for entry in ranking) == \
+        sorted(json.dumps(params) for params in CANDIDATES)
+    assert [entry["seasons"] for entry in ranking] == [4, 2, 1, 1]
+    assert ranking[0]["f_best"] == result["rungs"][-1]["best_f_best"]
+    assert ranking[1]["f_best"] >= result["rungs"][1]["best_f_best"]
+    assert ranking[2]["f_best"] <= ranking[3]["f_best"]
+    for entry in ranking:
+        # the budget is met within one week of the league
+        budget = entry["seasons"] * 30
+        assert budget <= entry["evaluations"] < budget + entry["params"]["L"]
+
+    assert tune() == result
+    assert tune(seed=6) != result
+
+
+def test_promoted_leagues_resume_where_they_stopped(tune):
+    winner = tune()["ranking"][0]
+    index = CANDIDATES.index(winner["params"])
+    rng = spawn_rngs(5, len(CANDIDATES))[index]
+
+    # the same league played straight to the budget of the last rung
+    module = importlib.import_module("MO_LCA")
+    lca = module.build(rng=rng, path_w=None, S=float("inf"),
+                       stopping=StoppingRules(max_evaluations=4 * 30),
+                       **winner["params"])
+    lca.league()
+    assert lca.evaluations == winner["evaluations"]
+    assert float(lca.f_best) == winner["f_best"]
+
+
+def test_full_run_parameters_replay_the_ranked_budget(tune, monkeypatch):
+    result = tune()
+    assert result["evaluations"] == sum(entry["evaluations"]
+                                        for entry in result["ranking"])
+    module = importlib.import_module("MO_LCA")
+    rngs = spawn_rngs(5, len(CANDIDATES))
+    # every candidate, the L=4 leagues play more seasons than the L=6 ones
+    for entry in result["ranking"]:
+        budget = entry["seasons"] * 30
+        params = tuner.full_run_parameters(entry["params"], budget)
+        assert params["S"] == -(-budget // tuner.league_evaluations(params["L"], 1))
+        assert params["max_evaluations"] == budget
+
+        # a full run of the parameters, as the backend starts it
+        monkeypatch.setenv("LCA_PARAMETERS",
+                           json.dumps(dict(params, backend="numpy")))
+        lca = module.build(rng=rngs[CANDIDATES.index(entry["params"])],
+                           path_w=None)
+        lca.league()
+        assert lca.evaluations == entry["evaluations"]
+        assert float(lca.f_best) == entry["f_best"]
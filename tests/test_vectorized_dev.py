@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+
+class FixedDraws:
+    """Generator stub whose random() returns the given draws."""
+
+    def __init__(self, draws):
+        self.draws = draws
+
+    def random(self, size):
+        assert size == self.draws.shape
+        return self.draws
+
+
+def loop_Y(lca, draws):
+    """
+    The per-team loop get_Y replaced, choosing the flagged positions by the
+    same random keys instead of np.random.choice.
+    """
+    Y = np.zeros((lca.L, lca.n), dtype=int)
+    for i, (a, *keys) in enumerate(draws):
+        q = int(np.log(1 - (1 - (1 - lca.p_c) ** lca.n) * a)
+                // np.log(1 - lca.p_c))
+        positions = np.argsort(keys)[:q]
+        Y[i, positions] = 1
+    return Y
+
+
+@pytest.fixture
+def lca(generate_config, make_lca):
+    # few cloudlets, so that every position can be flagged
+    config = generate_config(-1)
+    return make_lca(config["vms"], config["cloudlets"], L=6)
+
+
+def flag_fractions(lca, counts):
+    """Column 0 of the draws that gives each team its flag count in counts."""
+    c = 1 - (1 - lca.p_c) ** lca.n
+    low = (1 - (1 - lca.p_c) ** np.array(counts)) / c
+    high = (1 - (1 - lca.p_c) ** (np.array(counts) + 1)) / c
+    return np.minimum((low + high) / 2, 1.0)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_get_Y_matches_the_loop(lca, seed):
+    draws = np.random.default_rng(seed).random(size=(lca.L, lca.n + 1))
+    lca.rng = FixedDraws(draws)
+    Y = lca.get_Y()
+    expected = loop_Y(lca, draws)
+    np.testing.assert_array_equal(Y.sum(axis=1), expected.sum(axis=1))
+    np.testing.assert_array_equal(Y, expected)
+
+
+def test_get_Y_flag_count_edge_cases(lca):
+    # no flag, the q0 = 1 minimum of one flag, n - 1 flags and every position,
+    # reached by a = 1 where the logarithms of p_c = 0.5 are exact
+    lca.p_c = 0.5
+    counts = [0, 1, 1, lca.n - 1, 0, lca.n]
+    draws = np.random.default_rng(0).random(size=(lca.L, lca.n + 1))
+    draws[:, 0] = flag_fractions(lca, counts)
+    draws[-1, 0] = 1.0
+    lca.rng = FixedDraws(draws)
+
+    Y = lca.get_Y()
+    np.testing.assert_array_equal(Y.sum(axis=1), counts)
+    np.testing.assert_array_equal(Y, loop_Y(lca, draws))
+
+    draws[:, 0] = 0.0
+    np.testing.assert_array_equal(lca.get_Y(), np.zeros((lca.L, lca.n)))